@@ -0,0 +1,74 @@
+"""
+Measures the Swift type-checking cost of a very large string enum generated as a Swift `enum` versus as a
+`RawRepresentable` struct with `static let` constants.
+
+Usage:
+    python -m benchmarks.enum_compile_time [--values 2000] [--runs 3] [--swiftc swiftc]
+
+Requires a Swift toolchain on the PATH (or passed with --swiftc) for the compile-time measurement; without one,
+only generation time and output size are reported.
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from typing import Any, Optional
+
+from src.openapi.OpenAPISpec import OpenAPISpec
+from src.openapi.OpenAPISwiftModelGenerator import OpenAPISwiftModelGenerator
+
+
+def synthetic_enum_spec(value_count: int) -> dict[str, Any]:
+    """Builds an OpenAPI spec with a single string enum of `value_count` values."""
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Enum Benchmark", "version": "1.0.0"},
+        "paths": {},
+        "components": {"schemas": {"BigEnum": {"type": "string", "enum": [f"value_{i:05d}" for i in range(value_count)]}}},
+    }
+
+
+def typecheck_seconds(swiftc: str, file_path: str, runs: int) -> float:
+    """Returns the best wall-clock time of `swiftc -typecheck` over `runs` runs."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([swiftc, "-typecheck", file_path], check=True, capture_output=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(value_count: int, runs: int, swiftc: Optional[str]) -> None:
+    openapi = OpenAPISpec(spec_dict=synthetic_enum_spec(value_count))
+    variants = {"enum": None, "struct": 0}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for variant, threshold in variants.items():
+            start = time.perf_counter()
+            code = OpenAPISwiftModelGenerator(openapi, enum_struct_threshold=threshold).generate_model("BigEnum")
+            generate_ms = (time.perf_counter() - start) * 1000
+
+            file_path = os.path.join(temp_dir, f"BigEnum_{variant}.swift")
+            with open(file_path, "w") as f:
+                f.write(f"import Foundation\n\n{code}\n")
+
+            line = f"{variant:>6}: generated in {generate_ms:.1f} ms, {len(code) / 1024:.1f} KiB"
+            if swiftc is not None:
+                line += f", swiftc -typecheck {typecheck_seconds(swiftc, file_path, runs):.2f} s (best of {runs})"
+            print(line)
+
+    if swiftc is None:
+        print("swiftc not found; pass --swiftc to measure type-checking time")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Swift compile time of large generated enums")
+    parser.add_argument("--values", type=int, default=2000, help="Number of enum values")
+    parser.add_argument("--runs", type=int, default=3, help="Number of swiftc runs per variant")
+    parser.add_argument("--swiftc", default=shutil.which("swiftc"), help="Path to swiftc")
+    args = parser.parse_args()
+
+    main(args.values, args.runs, args.swiftc)
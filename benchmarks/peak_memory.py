@@ -0,0 +1,77 @@
+"""
+Measures the peak memory (max RSS) of generating a very large synthetic spec, normally and with --low-memory.
+
+Usage:
+    python -m benchmarks.peak_memory [--megabytes 50]
+
+Each mode runs the `parse_openapi_to_swift` command line in a child process; its peak RSS is read from the
+child's resource usage. Loading the spec alone is measured too, since the validated spec is needed until the last
+model is generated and so sets the floor for both modes. Linux and macOS only.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Any
+
+
+def synthetic_spec(megabytes: int) -> dict[str, Any]:
+    """Builds a spec of roughly `megabytes` MB of JSON: many small root groups of models referencing shared enums."""
+    enums = {f"Status{i}": {"type": "string", "enum": [f"status_{i}_{j}" for j in range(8)]} for i in range(50)}
+    schemas: dict[str, Any] = dict(enums)
+    schema_count = 5 * (megabytes * 1024 * 1024 // 2200 // 5)
+    for i in range(schema_count):
+        properties: dict[str, Any] = {
+            f"field_{j}": {"type": "string", "title": f"Field {j}", "description": f"Field {j} of model {i}"}
+            for j in range(20)
+        }
+        properties["status"] = {"$ref": f"#/components/schemas/Status{i % 50}"}
+        properties["created_at"] = {"type": "string", "format": "date-time"}
+        # Each model references the next one in its group of five
+        if i % 5 != 4:
+            properties["child"] = {"anyOf": [{"$ref": f"#/components/schemas/Model{i + 1}"}, {"type": "null"}]}
+        schemas[f"Model{i}"] = {"type": "object", "title": f"Model{i}", "properties": properties, "required": ["id"]}
+    return {
+        "openapi": "3.1.0",
+        "info": {"title": "Peak Memory Benchmark", "version": "1.0.0"},
+        "paths": {},
+        "components": {"schemas": schemas},
+    }
+
+
+def peak_rss_megabytes(args: list[str]) -> float:
+    """Runs a command and returns its peak RSS in MB."""
+    process = subprocess.Popen(args, stdout=subprocess.DEVNULL)
+    _, status, rusage = os.wait4(process.pid, 0)
+    if status != 0:
+        raise RuntimeError(f"{' '.join(args)} failed with status {status}")
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    return rusage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def main(megabytes: int) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        spec_path = os.path.join(temp_dir, "spec.json")
+        with open(spec_path, "w") as f:
+            json.dump(synthetic_spec(megabytes), f)
+        print(f"Spec: {os.path.getsize(spec_path) / (1024 * 1024):.1f} MB")
+
+        load_script = f"from src.openapi.OpenAPISpec import OpenAPISpec; OpenAPISpec({spec_path!r})"
+        print(f"{'load only':>10}: peak RSS {peak_rss_megabytes([sys.executable, '-c', load_script]):.0f} MB")
+
+        command = [sys.executable, "-m", "src.openapi.parse_openapi_to_swift", "--openapi", spec_path]
+        for label, extra_args in [("default", []), ("low memory", ["--low-memory"])]:
+            output_dir = os.path.join(temp_dir, label.replace(" ", "_"))
+            peak = peak_rss_megabytes(command + ["--output", output_dir] + extra_args)
+            print(f"{label:>10}: peak RSS {peak:.0f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark peak memory of generating a very large spec")
+    parser.add_argument("--megabytes", type=int, default=50, help="Approximate size of the synthetic spec")
+    args = parser.parse_args()
+
+    main(args.megabytes)
@@ -0,0 +1,44 @@
+"""
+Measures converting a few thousand pydantic models to Swift with `parse_pydantic_to_swift`.
+
+Usage:
+    python -m benchmarks.pydantic_models [--models 3000]
+"""
+
+import argparse
+import datetime
+import time
+from typing import Any, Optional
+
+from pydantic import BaseModel, create_model
+
+from src.pydantic_to_swift import parse_pydantic_to_swift
+
+
+def synthetic_models(model_count: int) -> list[type[BaseModel]]:
+    """Builds `model_count` models of 20 fields; each model references the previous one in its group of five."""
+    models: list[type[BaseModel]] = []
+    for i in range(model_count):
+        fields: dict[str, Any] = {f"field_{j}": (Optional[str], None) for j in range(16)}
+        fields["id"] = (int, ...)
+        fields["created_at"] = (datetime.datetime, ...)
+        fields["tags"] = (dict[str, list[str]], {})
+        if i % 5 != 0:
+            fields["child"] = (Optional[models[-1]], None)
+        models.append(create_model(f"Model{i}", **fields))
+    return models
+
+
+def main(model_count: int) -> None:
+    models = synthetic_models(model_count)
+    start = time.perf_counter()
+    swift_models = parse_pydantic_to_swift(models)
+    print(f"{model_count} models in {len(swift_models)} entries: {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark converting pydantic models to Swift")
+    parser.add_argument("--models", type=int, default=3000, help="Number of models")
+    args = parser.parse_args()
+
+    main(args.models)
@@ -0,0 +1,52 @@
+"""
+Measures writing many generated Swift files one after another versus with a pool of writer threads.
+
+Usage:
+    python -m benchmarks.write_files [--files 5000] [--workers 8] [--output DIR] [--fsync]
+
+Point --output at the volume to measure (e.g. a network or encrypted CI mount); the default is a temporary
+directory on the local disk, where the difference is much smaller.
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from typing import Optional
+
+from src.openapi.parse_openapi_to_swift import DEFAULT_WRITE_WORKERS, _swift_file_contents, prepare_output_dir, write_files
+
+
+def synthetic_files(file_count: int) -> dict[str, str]:
+    """Builds `file_count` generated-looking Swift files of a few KiB each, split over `Root` and `Shared`."""
+    files = {}
+    for i in range(file_count):
+        properties = "\n".join(f"    var property{j}: String" for j in range(40))
+        category = "Root" if i % 2 == 0 else "Shared"
+        model_code = f"struct Model{i:05d}DTO: Codable {{\n{properties}\n}}"
+        files[f"{category}/Model{i:05d}.swift"] = _swift_file_contents(model_code)
+    return files
+
+
+def main(file_count: int, workers: int, output: Optional[str], fsync: bool) -> None:
+    files = synthetic_files(file_count)
+    output_dir = output or tempfile.mkdtemp()
+    try:
+        for label, max_workers in [("sequential", 1), (f"{workers} threads", workers)]:
+            prepare_output_dir(output_dir)
+            start = time.perf_counter()
+            write_files(output_dir, files, max_workers, fsync)
+            print(f"{label:>12}: {file_count} files in {time.perf_counter() - start:.2f} s")
+    finally:
+        shutil.rmtree(output_dir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark writing many generated Swift files")
+    parser.add_argument("--files", type=int, default=5000, help="Number of files to write")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WRITE_WORKERS, help="Number of writer threads")
+    parser.add_argument("--output", help="Directory to write to (deleted afterwards)")
+    parser.add_argument("--fsync", action="store_true", help="Fsync every file")
+    args = parser.parse_args()
+
+    main(args.files, args.workers, args.output, args.fsync)
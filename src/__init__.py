@@ -1,3 +1,3 @@
-from .pydantic_to_swift import generate_swiftdata_model
+from .pydantic_to_swift import generate_swiftdata_model, parse_pydantic_to_swift
 
-__all__ = ["generate_swiftdata_model"]
+__all__ = ["generate_swiftdata_model", "parse_pydantic_to_swift"]
@@ -0,0 +1,72 @@
+from typing import Any, Dict, Iterator, Optional
+
+from src.openapi.OpenAPISpec import OpenAPISpec
+from src.openapi.parse_openapi_to_swift import iter_swift_models
+
+
+def iter_jsonschema_swift_models(
+    filepath: Optional[str] = None, schema_dict: Optional[Dict[str, Any]] = None, **options: Any
+) -> Iterator[tuple[str, Dict[str, Any]]]:
+    """
+    Generates Swift models from a standalone JSON Schema document, one entry at a time.
+
+    The document's `$defs` are generated like the `components.schemas` of an OpenAPI spec (see
+    `OpenAPISpec.from_json_schema`): grouped by dependency, with the same emitters, and each entry's code is only
+    generated when it is requested, so bundles with thousands of definitions can be written as they are generated.
+
+    Args:
+        filepath: Path to the JSON Schema file (JSON or YAML)
+        schema_dict: The JSON Schema document as a dictionary
+        options: Generation options, see `parse_openapi_to_swift`
+
+    Yields:
+        tuple[str, Dict[str, Any]]: The entry name and its Swift code and metadata, see `parse_openapi_to_swift`
+    """
+    openapi = OpenAPISpec.from_json_schema(filepath=filepath, schema_dict=schema_dict)
+    return iter_swift_models(openapi=openapi, **options)
+
+
+def parse_jsonschema_to_swift(
+    filepath: Optional[str] = None, schema_dict: Optional[Dict[str, Any]] = None, **options: Any
+) -> Dict[str, Any]:
+    """Generates Swift models from a standalone JSON Schema document, see `iter_jsonschema_swift_models`."""
+    return dict(iter_jsonschema_swift_models(filepath=filepath, schema_dict=schema_dict, **options))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from src.openapi.OpenAPISwiftModelGenerator import DEFAULT_ENUM_STRUCT_THRESHOLD
+    from src.openapi.parse_openapi_to_swift import write_swift_files_streaming
+
+    parser = argparse.ArgumentParser(description="Generate Swift models from the $defs of a JSON Schema document")
+    parser.add_argument("schema", help="Path to the JSON Schema file")
+    parser.add_argument("--output", required=True, help="Output directory for Swift files")
+    parser.add_argument(
+        "--identity-equality",
+        action="store_true",
+        help="Make DTOs with an id property hash and compare by that property only",
+    )
+    parser.add_argument(
+        "--enum-struct-threshold",
+        type=int,
+        default=DEFAULT_ENUM_STRUCT_THRESHOLD,
+        help="Generate string enums with more values than this as RawRepresentable structs",
+    )
+    parser.add_argument(
+        "--deduplicate", action="store_true", help="Generate structurally identical schemas once, aliasing the rest"
+    )
+    parser.add_argument("--fsync", action="store_true", help="Fsync every written file")
+    args = parser.parse_args()
+
+    # Write each group as soon as it's generated
+    write_swift_files_streaming(
+        iter_jsonschema_swift_models(
+            filepath=args.schema,
+            identity_equality=args.identity_equality,
+            enum_struct_threshold=args.enum_struct_threshold,
+            deduplicate=args.deduplicate,
+        ),
+        args.output,
+        args.fsync,
+    )
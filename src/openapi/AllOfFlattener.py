@@ -0,0 +1,140 @@
+from typing import Any, Optional, TypeVar
+
+from src.jsonschema.JSONSchema import JSONSchema
+from src.openapi.RefResolver import schema_name_from_ref
+from src.openapi.schemas.Schema import Schema
+
+SchemaT = TypeVar("SchemaT", bound=JSONSchema)
+
+# Keywords of `allOf` members that aren't copied as-is: the ones that are combined, the member's own identity and
+# annotations, and the union a discriminated base declares over the schemas extending it
+_UNMERGED_KEYWORDS = {
+    "allOf",
+    "properties",
+    "required",
+    "type",
+    "ref_",
+    "id_",
+    "schema_",
+    "defs_",
+    "anchor_",
+    "dynamic_anchor_",
+    "vocabulary_",
+    "comment_",
+    "title",
+    "description",
+    "anyOf",
+    "oneOf",
+    "discriminator",
+}
+
+
+class AllOfFlattener:
+    """
+    Merges `allOf` schemas into plain schemas.
+
+    The members of an `allOf` (following `$ref`s to named schemas, which are flattened first) are merged in order:
+    their properties are combined, later members overriding earlier ones and the schema's own properties overriding
+    all of them, and their required lists are joined. Their other keywords (`enum`, `format`, `items`,
+    `additionalProperties`, ...) are copied unless the schema sets them itself, a later member overriding an earlier
+    one, so extending an enum, array or formatted string keeps its type. The schema keeps its own title and
+    description, and a variant extending a discriminated base doesn't become the base's union. An inline `allOf` of a
+    single `$ref` that adds no properties (how pydantic attaches a description to a referenced property) becomes a
+    plain `$ref`, so the property keeps the referenced type.
+
+    Each named schema is flattened once, so a base shared by many schemas is only merged once. Schemas are never
+    modified: flattened schemas are copies.
+    """
+
+    def __init__(self, schemas: dict[str, Schema]) -> None:
+        self.schemas = schemas
+        self._flattened: dict[str, Schema] = {}
+        # Schemas being flattened, to detect cycles
+        self._in_progress: list[str] = []
+        # Flattened inline schemas by identity; the schema is kept so its id can't be reused
+        self._flattened_nodes: dict[int, tuple[JSONSchema, JSONSchema]] = {}
+
+    def flatten_all(self) -> dict[str, Schema]:
+        """Returns the named schemas with every `allOf` flattened, in the same order."""
+        return {schema_name: self.flatten(schema_name) for schema_name in self.schemas}
+
+    def flatten(self, schema_name: str) -> Schema:
+        """Returns the named schema with every `allOf` flattened."""
+        flattened = self._flattened.get(schema_name)
+        if flattened is not None:
+            return flattened
+        if schema_name in self._in_progress:
+            cycle = self._in_progress[self._in_progress.index(schema_name) :] + [schema_name]
+            raise ValueError(f"Circular allOf: {' -> '.join(cycle)}")
+        schema = self.schemas.get(schema_name)
+        if schema is None:
+            raise ValueError(f"Could not find schema: {schema_name}")
+
+        self._in_progress.append(schema_name)
+        try:
+            flattened = self._flatten_node(schema, named=True)
+        finally:
+            self._in_progress.pop()
+        self._flattened[schema_name] = flattened
+        return flattened
+
+    def _flatten_node(self, node: SchemaT, named: bool = False) -> SchemaT:
+        """Returns a schema with the `allOf`s in it and its subschemas flattened, or the schema itself if it has none."""
+        cached = self._flattened_nodes.get(id(node))
+        if cached is not None and cached[0] is node:
+            return cached[1]  # type: ignore[return-value]
+
+        update: dict[str, Any] = {}
+        if node.properties:
+            properties = {name: self._flatten_node(prop_schema) for name, prop_schema in node.properties.items()}
+            if any(properties[name] is not node.properties[name] for name in properties):
+                update["properties"] = properties
+        if isinstance(node.items, JSONSchema):
+            items = self._flatten_node(node.items)
+            if items is not node.items:
+                update["items"] = items
+        for keyword in ("anyOf", "oneOf"):
+            options: Optional[list[JSONSchema]] = getattr(node, keyword)
+            if options:
+                flattened_options = [self._flatten_node(option) for option in options]
+                if any(flattened is not option for flattened, option in zip(flattened_options, options)):
+                    update[keyword] = flattened_options
+        if node.allOf:
+            update.update(self._merge_all_of(node, update.get("properties", node.properties), named))
+
+        flattened = node.model_copy(update=update) if update else node
+        self._flattened_nodes[id(node)] = (node, flattened)
+        return flattened
+
+    def _merge_all_of(
+        self, node: JSONSchema, own_properties: Optional[dict[str, JSONSchema]], named: bool
+    ) -> dict[str, Any]:
+        """Returns the keywords that replace a schema's `allOf` with its merged members."""
+        members = node.allOf or []
+        if not named and not own_properties and len(members) == 1 and members[0].ref_ is not None:
+            return {"allOf": None, "ref_": members[0].ref_}
+
+        properties: dict[str, JSONSchema] = {}
+        required: list[str] = []
+        member_type = None
+        keywords: dict[str, Any] = {}
+        for member in members:
+            ref_name = schema_name_from_ref(member.ref_) if member.ref_ is not None else None
+            flattened_member: JSONSchema = self.flatten(ref_name) if ref_name is not None else self._flatten_node(member)
+            properties.update(flattened_member.properties or {})
+            required.extend(name for name in flattened_member.required or [] if name not in required)
+            member_type = member_type or flattened_member.type
+            for keyword in flattened_member.model_fields_set - _UNMERGED_KEYWORDS:
+                value = getattr(flattened_member, keyword, None)
+                if value is not None:
+                    keywords[keyword] = value
+        properties.update(own_properties or {})
+        required.extend(name for name in node.required or [] if name not in required)
+
+        return {
+            **{keyword: value for keyword, value in keywords.items() if keyword not in node.model_fields_set},
+            "allOf": None,
+            "properties": properties or None,
+            "required": required or None,
+            "type": node.type or member_type or ("object" if properties else None),
+        }
@@ -0,0 +1,62 @@
+import os
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable
+
+from src.openapi.OpenAPISpec import OpenAPISpec
+
+# Number of generated models kept before the least recently used ones are evicted
+DEFAULT_MAX_CACHED_MODELS = 10_000
+
+
+def _file_stamps(paths: Iterable[str]) -> tuple[tuple[str, int, int], ...]:
+    """Returns the path, modification time and size of each file, with -1s for files that no longer exist."""
+    stamps = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            stamps.append((path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            stamps.append((path, -1, -1))
+    return tuple(stamps)
+
+
+class GenerationCache:
+    """
+    Caches parsed specs and generated model code so they can be reused across generator runs in one process.
+
+    Specs are cached by path, and parsed again once the spec or any file its references point to changes, replacing
+    the outdated spec. Model code is cached by the schema's name, its contents and the generator options, so schemas
+    shared between specs (pagination, error envelopes, ...) are only generated once. Since a changed schema gets a new
+    key, outdated model code is never served; it's evicted once more than `max_models` models are cached.
+    """
+
+    def __init__(self, max_models: int = DEFAULT_MAX_CACHED_MODELS) -> None:
+        self._specs: dict[str, tuple[tuple[tuple[str, int, int], ...], OpenAPISpec]] = {}
+        self._models: OrderedDict[Hashable, str] = OrderedDict()
+        self.max_models = max_models
+        self.hits = 0
+        self.misses = 0
+
+    def load_spec(self, filepath: str) -> OpenAPISpec:
+        """Returns the parsed spec at a path, parsing it again only if one of the files it was loaded from changed."""
+        path = os.path.abspath(filepath)
+        cached = self._specs.get(path)
+        if cached is not None and cached[0] == _file_stamps(cached[1].documents):
+            return cached[1]
+
+        openapi = OpenAPISpec(filepath=filepath)
+        self._specs[path] = (_file_stamps(openapi.documents), openapi)
+        return openapi
+
+    def get_model(self, key: Hashable, generate: Callable[[], str]) -> str:
+        """Returns the cached model code for a key, generating and caching it on a miss."""
+        code = self._models.get(key)
+        if code is None:
+            self.misses += 1
+            code = self._models[key] = generate()
+            while len(self._models) > self.max_models:
+                self._models.popitem(last=False)
+        else:
+            self.hits += 1
+            self._models.move_to_end(key)
+        return code
@@ -1,15 +1,23 @@
-import json
-from typing import Any, Optional, cast
+from functools import cached_property
+from typing import Any, Collection, Optional, TypeVar, cast
 
-import yaml
 from pydantic import BaseModel
 
+from src.openapi.AllOfFlattener import AllOfFlattener
 from src.openapi.enums.HttpMethod import EnumHttpMethod
 from src.openapi.enums.HttpStatusCode import EnumHttpStatusCode
+from src.openapi.OpenAPISpecIndex import OpenAPISpecIndex
+from src.openapi.RefResolver import RefResolver, load_document
+from src.openapi.RemoteSpecCache import RemoteSpecCache, is_remote_spec
+from src.openapi.schemas.MediaType import MediaType
+from src.openapi.schemas.Parameter import Parameter, Parameter_Content
 from src.openapi.schemas.Reference import Reference
 from src.openapi.schemas.Response import Response
 from src.openapi.schemas.Schema import Schema
-from src.openapi.schemas.Spec import Components, Paths, Spec
+from src.openapi.schemas.Spec import Components, Operation, PathItem, Paths, RequestBody, Spec
+from src.openapi.SpecInterner import SpecInterner
+
+ComponentT = TypeVar("ComponentT")
 
 
 class ResponseNode(BaseModel):
@@ -23,10 +31,38 @@ class OpenAPISpec:
     """A class to parse and provide accessors for an OpenAPI v3 specification."""
 
     value: Spec
+    ref_resolver: RefResolver
+    # The files the spec was loaded from: the spec itself and every file its references point to
+    documents: list[str]
+
+    def __init__(
+        self,
+        filepath: Optional[str] = None,
+        spec_dict: Optional[dict[str, Any]] = None,
+        intern: bool = False,
+        flatten_all_of: bool = True,
+        remote_cache: Optional[RemoteSpecCache] = None,
+    ):
+        """
+        Initializes the OpenAPISpec instance by loading the OpenAPI spec.
+
+        References to other files (`common.yaml#/components/schemas/Error`) are resolved relative to `filepath` and
+        bundled into the spec, so multi-file specs don't need to be bundled beforehand.
+
+        `filepath` can also be an HTTP(S) URL, which is fetched through `remote_cache` (a `RemoteSpecCache` in the
+        default cache directory if not given) so an unchanged spec isn't downloaded again. Remote specs must be
+        self-contained.
 
-    def __init__(self, filepath: Optional[str] = None, spec_dict: Optional[dict[str, Any]] = None):
-        """Initializes the OpenAPISpec instance by loading the OpenAPI spec."""
+        With `intern`, identical strings and identical inline schemas share one instance (see `SpecInterner`), so the
+        schemas must not be modified. Interning hashes every inline schema, so it costs load time; it pays off for
+        large specs that repeat the same inline schemas many times.
+
+        With `flatten_all_of`, `allOf` schemas are merged into plain object schemas (see `AllOfFlattener`), so schemas
+        extending a base schema through `allOf` have the base's properties.
+        """
         raw_value = None
+        if filepath is not None and is_remote_spec(filepath):
+            filepath = (remote_cache or RemoteSpecCache()).fetch(filepath).path
         if filepath is not None:
             raw_value = self._load_spec_file(filepath)
         elif spec_dict is not None:
@@ -34,18 +70,77 @@ class OpenAPISpec:
         else:
             raise ValueError("Either filepath or spec_dict must be provided")
 
-        self.value = Spec.model_validate(raw_value)
+        self._load(raw_value, filepath or "", intern, flatten_all_of)
+
+    @classmethod
+    def from_json_schema(
+        cls,
+        filepath: Optional[str] = None,
+        schema_dict: Optional[dict[str, Any]] = None,
+        intern: bool = False,
+        flatten_all_of: bool = True,
+    ) -> "OpenAPISpec":
+        """
+        Loads a standalone JSON Schema document (e.g. a Draft 2020-12 bundle) whose `$defs` are the named schemas.
+
+        The `$defs` take the place of `components.schemas` without being copied, and `#/$defs/<name>` references are
+        followed like `#/components/schemas/<name>` ones. A root schema with a `title` and properties is a named
+        schema too. The spec has no paths, and is otherwise loaded like an OpenAPI document (see `__init__`).
+        """
+        openapi = cls.__new__(cls)
+        if filepath is not None:
+            document = openapi._load_spec_file(filepath)
+        elif schema_dict is not None:
+            document = schema_dict
+        else:
+            raise ValueError("Either filepath or schema_dict must be provided")
+
+        schemas = document.get("$defs") or {}
+        title = document.get("title")
+        if isinstance(title, str) and document.get("properties") and title not in schemas:
+            root_schema = {key: value for key, value in document.items() if key not in ("$defs", "$schema", "$id")}
+            schemas = {**schemas, title: root_schema}
+
+        openapi._load(
+            {
+                "openapi": "3.1.0",
+                "info": {"title": title if isinstance(title, str) else "JSON Schema", "version": "1.0.0"},
+                "paths": {},
+                "components": {"schemas": schemas},
+            },
+            filepath or "",
+            intern,
+            flatten_all_of,
+        )
+        return openapi
+
+    def _load(self, raw_value: dict[str, Any], base_uri: str, intern: bool, flatten_all_of: bool) -> None:
+        """Bundles, validates, interns and flattens a raw document."""
+        bundling_resolver = RefResolver(raw_value, base_uri)
+        bundled_value = bundling_resolver.bundle()
+        self.documents = bundling_resolver.document_paths
+        if intern:
+            interner = SpecInterner()
+            self.value = interner.intern_spec(Spec.model_validate(interner.intern_raw(bundled_value)))
+        else:
+            self.value = Spec.model_validate(bundled_value)
+        if flatten_all_of and self.value.components is not None and self.value.components.schemas:
+            self.value.components.schemas = AllOfFlattener(self.value.components.schemas).flatten_all()
+        self.ref_resolver = RefResolver(self.value, base_uri)
+
+    @classmethod
+    def from_value(cls, value: Spec) -> "OpenAPISpec":
+        """Wraps an already validated spec, e.g. one built in code, without copying, interning or flattening it."""
+        openapi = cls.__new__(cls)
+        openapi.value = value
+        openapi.ref_resolver = RefResolver(value)
+        openapi.documents = []
+        return openapi
 
     def _load_spec_file(self, filepath: str) -> dict[str, Any]:
-        """Loads the OpenAPI specification from a JSON or YAML file."""
+        """Loads the OpenAPI specification (or JSON Schema document) from a JSON or YAML file."""
         try:
-            with open(filepath, "r", encoding="utf-8") as file:
-                if filepath.endswith(".json"):
-                    return cast(dict[str, Any], json.load(file))
-                elif filepath.endswith((".yaml", ".yml")):
-                    return cast(dict[str, Any], yaml.safe_load(file))
-                else:
-                    raise ValueError("Unsupported file format. Use JSON or YAML.")
+            return load_document(filepath)
         except Exception as e:
             raise RuntimeError(f"Failed to load OpenAPI file: {e}")
 
@@ -67,21 +162,22 @@ class OpenAPISpec:
             return Paths(root={})
         return self.value.paths
 
-    @property
+    @cached_property
+    def index(self) -> OpenAPISpecIndex:
+        """Cached lookup tables for operations and responses (by operationId, tag, path, status code, schema)."""
+        return OpenAPISpecIndex(self)
+
+    @cached_property
     def responses(self) -> list[ResponseNode]:
-        responses = []
-        for path, path_item in self.paths.root.items():
-            for method, method_item in path_item.methods.items():
-                for status_code, response in method_item.responses.root.items():
-                    responses.append(
-                        ResponseNode(
-                            path=path,
-                            method=method,
-                            status_code=EnumHttpStatusCode.safe_init(status_code),
-                            response=response,
-                        )
-                    )
-        return responses
+        return [
+            ResponseNode(
+                path=record.path,
+                method=record.method,
+                status_code=EnumHttpStatusCode.safe_init(record.status_code),
+                response=record.response,
+            )
+            for record in self.index.responses
+        ]
 
     def get_schema(self, schema_name: str) -> Optional[Schema]:
         """Retrieves a specific schema definition."""
@@ -89,6 +185,95 @@ class OpenAPISpec:
             return None
         return self.schemas.get(schema_name)
 
+    def resolve(self, ref: str) -> Any:
+        """Resolves a `$ref` (any JSON pointer into the spec) to the parsed object it points to."""
+        return self.ref_resolver.resolve(ref)
+
+    def _resolve_component(self, item: ComponentT | Reference) -> Optional[ComponentT]:
+        """Follows a `Reference` to a component (response, parameter, request body) until a value is found."""
+        if not isinstance(item, Reference):
+            return item
+        if item.ref_ is None:
+            return None
+        return cast(ComponentT, self.resolve(item.ref_))
+
+    def get_operation_references(self, operation: Operation, path_item: Optional[PathItem] = None) -> set[str]:
+        """
+        Returns the names of the schemas directly referenced by an operation.
+
+        This covers the operation's request body, responses and parameters, plus the parameters shared by its path
+        item. Referenced request bodies, responses and parameters are resolved.
+        """
+        references: set[str] = set()
+
+        def _add_content(content: Optional[dict[str, MediaType]]) -> None:
+            for media_type in (content or {}).values():
+                if media_type.schema_ is not None:
+                    references.update(media_type.schema_.get_references())
+
+        parameters: list[Parameter | Reference] = list(operation.parameters or [])
+        if path_item is not None:
+            parameters.extend(path_item.parameters or [])
+        for parameter_or_ref in parameters:
+            parameter = self._resolve_component(parameter_or_ref)
+            if parameter is None:
+                continue
+            if isinstance(parameter.root, Parameter_Content):
+                _add_content(parameter.root.content)
+            elif parameter.root.schema_ is not None:
+                references.update(parameter.root.schema_.get_references())
+
+        if operation.requestBody is not None:
+            request_body: Optional[RequestBody] = self._resolve_component(operation.requestBody)
+            if request_body is not None:
+                _add_content(request_body.content)
+
+        for response_or_ref in operation.responses.root.values():
+            response = self._resolve_component(response_or_ref)
+            if response is not None:
+                _add_content(response.content)
+
+        return references
+
+    def get_operation_schemas(
+        self,
+        path_prefixes: Optional[Collection[str]] = None,
+        tags: Optional[Collection[str]] = None,
+        operation_ids: Optional[Collection[str]] = None,
+    ) -> set[str]:
+        """
+        Returns the names of the schemas directly referenced by the selected operations.
+
+        An operation is selected when it matches every filter that is given, and a filter matches when any of its
+        values does: its path starts with one of `path_prefixes`, it has one of `tags`, its `operationId` is one of
+        `operation_ids`. Without filters every operation is selected.
+        """
+        references: set[str] = set()
+        for record in self.index.operations:
+            if path_prefixes is not None and not any(record.path.startswith(prefix) for prefix in path_prefixes):
+                continue
+            if tags is not None and not set(record.operation.tags or []) & set(tags):
+                continue
+            if operation_ids is not None and record.operation.operationId not in operation_ids:
+                continue
+            references.update(self.index.references[(record.path, record.method)])
+        return references
+
+    def get_reachable_schemas(self, schema_names: Collection[str]) -> set[str]:
+        """Returns the given schemas plus every schema they transitively reference."""
+        reachable: set[str] = set()
+        to_visit = list(schema_names)
+        while to_visit:
+            schema_name = to_visit.pop()
+            if schema_name in reachable:
+                continue
+            schema = self.get_schema(schema_name)
+            if schema is None:
+                raise ValueError(f"Could not find schema: {schema_name}")
+            reachable.add(schema_name)
+            to_visit.extend(schema.get_references())
+        return reachable
+
     def __repr__(self) -> str:
         """Returns a string representation of the OpenAPI specification details."""
         return f"<OpenAPISpec title='{self.value.info.title}' version='{self.value.info.version}'>"
@@ -0,0 +1,123 @@
+from collections import defaultdict
+from functools import cached_property
+from typing import TYPE_CHECKING, NamedTuple, Optional
+
+from src.openapi.enums.HttpMethod import EnumHttpMethod
+from src.openapi.schemas.Reference import Reference
+from src.openapi.schemas.Response import Response
+from src.openapi.schemas.Spec import Operation, PathItem
+
+if TYPE_CHECKING:
+    from src.openapi.OpenAPISpec import OpenAPISpec
+
+
+class OperationRecord(NamedTuple):
+    path: str
+    method: EnumHttpMethod
+    operation: Operation
+    path_item: PathItem
+
+
+class ResponseRecord(NamedTuple):
+    path: str
+    method: EnumHttpMethod
+    status_code: str
+    response: Response | Reference
+    operation: Operation
+
+
+def status_code_class(status_code: str) -> str:
+    """Returns the class of a response status code (`"404"` and `"4XX"` are both `"4XX"`), or `"default"`."""
+    if status_code == "default" or not status_code[:1].isdigit():
+        return status_code
+    return f"{status_code[0]}XX"
+
+
+class OpenAPISpecIndex:
+    """
+    Lookup tables for the operations and responses of a spec.
+
+    Each table is built on first use with a single scan of the spec and cached, so the spec must not be modified
+    afterwards. Records are plain named tuples pointing at the parsed spec objects.
+    """
+
+    def __init__(self, spec: "OpenAPISpec"):
+        self.spec = spec
+
+    @cached_property
+    def operations(self) -> list[OperationRecord]:
+        """Every operation of the spec, in spec order."""
+        return [
+            OperationRecord(path, method, operation, path_item)
+            for path, path_item in self.spec.paths.root.items()
+            for method, operation in path_item.methods.items()
+        ]
+
+    @cached_property
+    def by_operation_id(self) -> dict[str, OperationRecord]:
+        """Operations by `operationId`."""
+        return {record.operation.operationId: record for record in self.operations if record.operation.operationId}
+
+    @cached_property
+    def by_tag(self) -> dict[str, list[OperationRecord]]:
+        """Operations by tag."""
+        by_tag: dict[str, list[OperationRecord]] = defaultdict(list)
+        for record in self.operations:
+            for tag in record.operation.tags or []:
+                by_tag[tag].append(record)
+        return dict(by_tag)
+
+    @cached_property
+    def by_path_method(self) -> dict[tuple[str, EnumHttpMethod], OperationRecord]:
+        """Operations by path and method."""
+        return {(record.path, record.method): record for record in self.operations}
+
+    @cached_property
+    def references(self) -> dict[tuple[str, EnumHttpMethod], set[str]]:
+        """The schemas directly referenced by each operation, by path and method."""
+        return {
+            (record.path, record.method): self.spec.get_operation_references(record.operation, record.path_item)
+            for record in self.operations
+        }
+
+    @cached_property
+    def by_schema(self) -> dict[str, list[OperationRecord]]:
+        """Operations by the schemas their parameters, request body and responses directly reference."""
+        by_schema: dict[str, list[OperationRecord]] = defaultdict(list)
+        for record in self.operations:
+            for schema_name in sorted(self.references[(record.path, record.method)]):
+                by_schema[schema_name].append(record)
+        return dict(by_schema)
+
+    @cached_property
+    def responses(self) -> list[ResponseRecord]:
+        """Every response of every operation, in spec order."""
+        return [
+            ResponseRecord(record.path, record.method, str(status_code), response, record.operation)
+            for record in self.operations
+            for status_code, response in record.operation.responses.root.items()
+        ]
+
+    @cached_property
+    def responses_by_status_class(self) -> dict[str, list[ResponseRecord]]:
+        """Responses by status code class (`"2XX"`, `"4XX"`, ..., `"default"`)."""
+        by_status_class: dict[str, list[ResponseRecord]] = defaultdict(list)
+        for record in self.responses:
+            by_status_class[status_code_class(record.status_code)].append(record)
+        return dict(by_status_class)
+
+    def get_operation(self, operation_id: str) -> Optional[OperationRecord]:
+        """Returns the operation with an `operationId`."""
+        return self.by_operation_id.get(operation_id)
+
+    def get_operations_by_tag(self, tag: str) -> list[OperationRecord]:
+        """Returns the operations with a tag."""
+        return self.by_tag.get(tag, [])
+
+    def get_operations_by_schema(self, schema_name: str) -> list[OperationRecord]:
+        """Returns the operations that directly reference a schema."""
+        return self.by_schema.get(schema_name, [])
+
+    def get_responses_by_status_class(self, status_code: str | int) -> list[ResponseRecord]:
+        """Returns the responses in the class of a status code, e.g. every `4XX` response for `404`."""
+        return self.responses_by_status_class.get(status_code_class(str(status_code)), [])
@@ -1,17 +1,153 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Union
 
 from src.jsonschema.JSONSchema import EnumSchemaType, JSONSchema
+from src.openapi.GenerationCache import GenerationCache
 from src.openapi.OpenAPISpec import OpenAPISpec
+from src.openapi.RefResolver import schema_name_from_ref
 from src.openapi.schemas.Schema import Schema
 from src.utils import to_camel_case
 
+# Swift reserved keywords that need to be renamed
+SWIFT_RESERVED_KEYWORDS = {
+    "description": "descriptionText",
+    "class": "classType",
+    "import": "importSource",
+    "public": "publicFlag",
+    "private": "privateFlag",
+    "internal": "internalFlag",
+    "protocol": "protocolType",
+    "struct": "structType",
+    "enum": "enumType",
+    "extension": "extensionType",
+    "func": "function",
+    "var": "variable",
+    "let": "constant",
+    "init": "initialize",
+    "self": "selfValue",
+    "super": "superValue",
+    "true": "trueValue",
+    "false": "falseValue",
+    "type": "typeValue",
+    "associatedtype": "associatedTypeValue",
+    "operator": "operatorValue",
+    "return": "returnValue",
+    "default": "defaultValue",
+}
+
+# Number of models upserted between saves in generated importers
+DEFAULT_IMPORT_BATCH_SIZE = 500
+
+# String enums with more values than this are generated as RawRepresentable structs instead of Swift enums
+DEFAULT_ENUM_STRUCT_THRESHOLD = 256
+
 
 class OpenAPISwiftModelGenerator:
     """Generates SwiftData models from OpenAPI schemas."""
 
-    def __init__(self, schema: OpenAPISpec) -> None:
-        """Initialize the Swift model generator."""
+    def __init__(
+        self,
+        schema: OpenAPISpec,
+        identity_equality: bool = False,
+        shared_coding: Optional[bool] = None,
+        enum_struct_threshold: Optional[int] = DEFAULT_ENUM_STRUCT_THRESHOLD,
+        access_modifier: Optional[str] = None,
+        schema_aliases: Optional[Dict[str, str]] = None,
+        cache: Optional[GenerationCache] = None,
+    ) -> None:
+        """
+        Initialize the Swift model generator.
+
+        Args:
+            schema: The OpenAPI spec to generate models from
+            identity_equality: Whether DTOs with an `id` (or `x_unique_key`) property hash and compare by that
+                property only, instead of the synthesized member-wise conformance
+            shared_coding: Whether DTOs conform to `GeneratedCodable` and decode through the shared, cached
+                `GeneratedCoding` configuration. Defaults to whether any schema uses a `date` or `date-time` format.
+            enum_struct_threshold: String enums with more values than this are generated as `RawRepresentable`
+                structs with `static let` constants, which type-check much faster than huge enums and tolerate
+                unknown values. None always generates Swift enums.
+            access_modifier: Access modifier for generated declarations, e.g. "public" when the models are compiled
+                into a module of their own. None keeps Swift's default internal access.
+            schema_aliases: Canonical schema name for schemas that duplicate another schema; these are generated as
+                typealiases of the canonical schema's types
+            cache: Cache of generated model code to share with other generators, e.g. across the specs of a batch
+        """
         self.schema = schema
+        self.identity_equality = identity_equality
+        self.shared_coding = self._spec_uses_dates() if shared_coding is None else shared_coding
+        self.uses_json_value = self._spec_uses_json_value()
+        self.enum_struct_threshold = enum_struct_threshold
+        self.access_modifier = access_modifier
+        self._access = f"{access_modifier} " if access_modifier else ""
+        self.schema_aliases = schema_aliases or {}
+        self.cache = cache
+        # Swift types by property schema identity, which interned specs share between identical properties
+        self._swift_types: Dict[tuple[int, bool], tuple[JSONSchema, str]] = {}
+
+    def _spec_uses_dates(self) -> bool:
+        """Returns whether any schema in the spec has a property with a `date` or `date-time` format."""
+
+        def _uses_dates(schema_item: JSONSchema) -> bool:
+            if schema_item.format in ("date", "date-time"):
+                return True
+            children: List[JSONSchema] = []
+            children.extend((schema_item.properties or {}).values())
+            if isinstance(schema_item.items, JSONSchema):
+                children.append(schema_item.items)
+            if isinstance(schema_item.additionalProperties, JSONSchema):
+                children.append(schema_item.additionalProperties)
+            for composite_list in [schema_item.anyOf, schema_item.oneOf, schema_item.allOf]:
+                children.extend(composite_list or [])
+            return any(_uses_dates(child) for child in children)
+
+        return any(_uses_dates(schema) for schema in self.schema.schemas.values())
+
+    def _spec_uses_json_value(self) -> bool:
+        """Returns whether any schema has a free-form object, which is generated as the shared `JSONValue` type."""
+
+        # Subschemas are often shared between properties (see `SpecInterner`); each one is checked once
+        checked: set[int] = set()
+
+        def _uses_json_value(schema_item: JSONSchema, is_model: bool = False) -> bool:
+            if id(schema_item) in checked:
+                return False
+            checked.add(id(schema_item))
+            schema_types = schema_item.type if isinstance(schema_item.type, list) else [schema_item.type]
+            # Object schemas with properties are models, and objects with typed additional properties are maps
+            if EnumSchemaType.OBJECT in schema_types and not (is_model and schema_item.properties):
+                additional_properties = schema_item.additionalProperties
+                if schema_item.properties or not isinstance(additional_properties, JSONSchema):
+                    return True
+                if self._is_untyped_map_value(additional_properties):
+                    return True
+            children: List[JSONSchema] = []
+            children.extend((schema_item.properties or {}).values())
+            if isinstance(schema_item.items, JSONSchema):
+                children.append(schema_item.items)
+            if isinstance(schema_item.additionalProperties, JSONSchema):
+                children.append(schema_item.additionalProperties)
+            for composite_list in [schema_item.anyOf, schema_item.oneOf, schema_item.allOf]:
+                children.extend(composite_list or [])
+            return any(_uses_json_value(child) for child in children)
+
+        return any(_uses_json_value(schema, is_model=True) for schema in self.schema.schemas.values())
+
+    @staticmethod
+    def _is_untyped_map_value(value: Optional[Union[bool, JSONSchema]]) -> bool:
+        """Returns whether an `additionalProperties` value allows any JSON: `true`, `{}` or a schema without a type."""
+        if value is True:
+            return True
+        return isinstance(value, JSONSchema) and not (
+            value.type
+            or value.ref_
+            or value.anyOf
+            or value.oneOf
+            or value.allOf
+            or value.enum
+            or value.const is not None
+            or value.properties
+            or value.items
+        )
 
     def _import_statements(self) -> str:
         """Returns the import statements for the SwiftData models."""
@@ -29,7 +165,7 @@ class OpenAPISwiftModelGenerator:
 
         swift_code = []
         # Add a property with the correct type
-        swift_code.append(f"    var value: {swift_type}")
+        swift_code.append(f"    {self._access}var value: {swift_type}")
 
         # Add description as a comment if available
         if schema.description:
@@ -40,22 +176,70 @@ class OpenAPISwiftModelGenerator:
 
         # For string types, provide an empty string default
         if openapi_type == "string":
-            swift_code.append(f'    init(value: {swift_type} = "") {{')
+            swift_code.append(f'    {self._access}init(value: {swift_type} = "") {{')
         # For numeric types, provide a zero default
         elif openapi_type in ["integer", "number"]:
-            swift_code.append(f"    init(value: {swift_type} = 0) {{")
+            swift_code.append(f"    {self._access}init(value: {swift_type} = 0) {{")
         # For boolean, default to false
         elif openapi_type == "boolean":
-            swift_code.append(f"    init(value: {swift_type} = false) {{")
+            swift_code.append(f"    {self._access}init(value: {swift_type} = false) {{")
         # For other types, no default
         else:
-            swift_code.append(f"    init(value: {swift_type}) {{")
+            swift_code.append(f"    {self._access}init(value: {swift_type}) {{")
 
         swift_code.append("        self.value = value")
         swift_code.append("    }")
 
         return swift_code
 
+    def _enum_case_name(self, value: Any, fallback_index: int) -> str:
+        """Converts an enum value into a valid Swift identifier for its case or constant."""
+        # Handle values with spaces or special characters for case name
+        # First convert to camelCase for the case name
+        case_name = to_camel_case(str(value))
+
+        # Remove spaces and special characters to ensure a valid Swift identifier
+        case_name = "".join(c for c in case_name if c.isalnum())
+
+        # Ensure case name doesn't start with a digit
+        if case_name and case_name[0].isdigit():
+            case_name = "value" + case_name
+
+        # Handle empty case name (if original value was just special chars)
+        if not case_name:
+            case_name = f"value{fallback_index}"  # Use index as fallback
+
+        return case_name
+
+    def _handle_large_enum_schema(self, schema_name: str, schema: Schema) -> List[str]:
+        """
+        Generate a `RawRepresentable` struct for a string enum with too many values for a Swift enum.
+
+        Each value becomes a `static let` constant, which keeps type-checking linear in the number of values, and
+        decoding accepts values that are not known at generation time.
+        """
+        swift_code = []
+
+        # Add description as a comment if available
+        if schema.description:
+            swift_code.append(f"// {schema.description}")
+
+        swift_code.append(f"{self._access}struct {schema_name}: RawRepresentable, Codable, Hashable {{")
+        swift_code.append(f"    {self._access}let rawValue: String")
+        swift_code.append("")
+        swift_code.append(f"    {self._access}init(rawValue: String) {{")
+        swift_code.append("        self.rawValue = rawValue")
+        swift_code.append("    }")
+        swift_code.append("")
+
+        for index, value in enumerate(schema.enum or []):
+            const_name = self._enum_case_name(value, index)
+            swift_code.append(f'    {self._access}static let {const_name} = {schema_name}(rawValue: "{value}")')
+
+        swift_code.append("}")
+
+        return swift_code
+
     def _handle_enum_schema(self, schema: Schema) -> List[str]:
         """Generate Swift code for an enum schema."""
         swift_code = []
@@ -70,26 +254,12 @@ class OpenAPISwiftModelGenerator:
         # For string enums, we create a proper Swift enum
         if base_type == "string":
             # Create a Swift enum with String raw value and Codable conformance
-            swift_code.append("enum Value: String, Codable {")
+            swift_code.append(f"{self._access}enum Value: String, Codable {{")
 
             if schema.enum:
                 # Add enum cases
                 for value in schema.enum:
-                    # Handle values with spaces or special characters for case name
-                    # First convert to camelCase for the case name
-                    case_name = to_camel_case(str(value))
-
-                    # Remove spaces and special characters to ensure a valid Swift identifier
-                    case_name = "".join(c for c in case_name if c.isalnum())
-
-                    # Ensure case name doesn't start with a digit
-                    if case_name and case_name[0].isdigit():
-                        case_name = "value" + case_name
-
-                    # Handle empty case name (if original value was just special chars)
-                    if not case_name:
-                        case_name = f"value{len(swift_code)}"  # Use index as fallback
-
+                    case_name = self._enum_case_name(value, len(swift_code))
                     swift_code.append(f'    case {case_name} = "{value}"')
 
                 swift_code.append("}")
@@ -98,7 +268,7 @@ class OpenAPISwiftModelGenerator:
         # since Swift enums can't have raw values of arbitrary numbers
         else:
             swift_base_type = self._openapi_type_to_swift(schema, True)
-            swift_code.append(f"typealias Value = {swift_base_type}")
+            swift_code.append(f"{self._access}typealias Value = {swift_base_type}")
             swift_code.append("")
 
             if schema.enum:
@@ -108,7 +278,7 @@ class OpenAPISwiftModelGenerator:
                     const_name = f"{base_type}_{value}".upper()
                     # Remove any spaces or special characters from constant name
                     const_name = "".join(c for c in const_name if c.isalnum() or c == "_")
-                    swift_code.append(f"let {const_name}: {swift_base_type} = {value}")
+                    swift_code.append(f"{self._access}let {const_name}: {swift_base_type} = {value}")
 
         return swift_code
 
@@ -126,20 +296,18 @@ class OpenAPISwiftModelGenerator:
 
         # Handle reference to another schema
         if item_schema.ref_:
-            ref = item_schema.ref_
-            if ref.startswith("#/components/schemas/"):
-                item_type = ref.split("/")[-1]
+            item_type = schema_name_from_ref(item_schema.ref_) or item_type
         # Handle inline type definition
         elif item_schema.type:
             item_type = self._openapi_type_to_swift(item_schema, True)
 
         # Add array property
         swift_code = []
-        swift_code.append(f"    var items: [{item_type}]")
+        swift_code.append(f"    {self._access}var items: [{item_type}]")
 
         # Add initializer
         swift_code.append("")
-        swift_code.append(f"    init(items: [{item_type}]) {{")
+        swift_code.append(f"    {self._access}init(items: [{item_type}]) {{")
         swift_code.append("        self.items = items")
         swift_code.append("    }")
 
@@ -197,42 +365,15 @@ class OpenAPISwiftModelGenerator:
         # Keep track of renamed properties
         renamed_props = {}
 
-        # Swift reserved keywords that need to be renamed
-        swift_reserved_keywords = {
-            "description": "descriptionText",
-            "class": "classType",
-            "import": "importSource",
-            "public": "publicFlag",
-            "private": "privateFlag",
-            "internal": "internalFlag",
-            "protocol": "protocolType",
-            "struct": "structType",
-            "enum": "enumType",
-            "extension": "extensionType",
-            "func": "function",
-            "var": "variable",
-            "let": "constant",
-            "init": "initialize",
-            "self": "selfValue",
-            "super": "superValue",
-            "true": "trueValue",
-            "false": "falseValue",
-            "type": "typeValue",
-            "associatedtype": "associatedTypeValue",
-            "operator": "operatorValue",
-            "return": "returnValue",
-            "default": "defaultValue",
-        }
-
         # First add property declarations
         for prop_name, prop_schema in properties.items():
             swift_type = self._openapi_type_to_swift(prop_schema, prop_name in required_props)
             swift_prop_name = to_camel_case(prop_name)
 
             # Handle reserved Swift keywords
-            if swift_prop_name in swift_reserved_keywords:
-                renamed_props[swift_prop_name] = swift_reserved_keywords[swift_prop_name]
-                swift_prop_name = swift_reserved_keywords[swift_prop_name]
+            if swift_prop_name in SWIFT_RESERVED_KEYWORDS:
+                renamed_props[swift_prop_name] = SWIFT_RESERVED_KEYWORDS[swift_prop_name]
+                swift_prop_name = SWIFT_RESERVED_KEYWORDS[swift_prop_name]
 
             # Check if this property should be unique (using x_unique_key extension)
             is_unique = prop_schema.x_unique_key
@@ -297,15 +438,18 @@ class OpenAPISwiftModelGenerator:
         required_props = schema.required or []
         properties = schema.properties or {}
 
-        swift_code = [f"struct {dto_name}: Codable, Hashable, Identifiable {{"]
+        swift_code = [f"{self._access}struct {dto_name}: Codable, Hashable, Identifiable {{"]
 
         # Add properties
         for prop_name, prop_schema in properties.items():
             swift_type = self._openapi_type_to_swift(prop_schema, prop_name in required_props)
             swift_prop_name = to_camel_case(prop_name)
 
-            # Use 'let' for all DTO properties
-            swift_code.append(f"    let {swift_prop_name}: {swift_type}")
+            # Use 'let' for all DTO properties, except date-only ones, whose wrapper keeps them `yyyy-MM-dd` when encoded
+            if self.shared_coding and prop_schema.format == "date" and swift_type in ("Date", "Date?"):
+                swift_code.append(f"    @DateOnly {self._access}var {swift_prop_name}: {swift_type}")
+            else:
+                swift_code.append(f"    {self._access}let {swift_prop_name}: {swift_type}")
 
         # Add CodingKeys if we have properties with snake_case that need to be mapped
         has_snake_case = any("_" in prop_name for prop_name in properties.keys())
@@ -313,6 +457,19 @@ class OpenAPISwiftModelGenerator:
             swift_code.append("")
             swift_code.extend(self._generate_coding_keys(properties))
 
+        # Hash and compare by identity so diffing and set membership cost O(1) instead of O(fields)
+        key_prop = self._unique_key_property(schema) if self.identity_equality else None
+        if key_prop is not None:
+            swift_key = to_camel_case(key_prop)
+            swift_code.append("")
+            swift_code.append(f"    {self._access}static func == (lhs: {dto_name}, rhs: {dto_name}) -> Bool {{")
+            swift_code.append(f"        lhs.{swift_key} == rhs.{swift_key}")
+            swift_code.append("    }")
+            swift_code.append("")
+            swift_code.append(f"    {self._access}func hash(into hasher: inout Hasher) {{")
+            swift_code.append(f"        hasher.combine({swift_key})")
+            swift_code.append("    }")
+
         # Close the struct
         swift_code.append("}")
 
@@ -335,38 +492,11 @@ class OpenAPISwiftModelGenerator:
 
         # Start building the Swift class
         swift_code = ["@Model"]
-        swift_code.append(f"final class {schema_name} {{")
+        swift_code.append(f"{self._access}final class {schema_name} {{")
 
         # Keep track of renamed properties
         renamed_props = {}
 
-        # Swift reserved keywords that need to be renamed
-        swift_reserved_keywords = {
-            "description": "descriptionText",
-            "class": "classType",
-            "import": "importSource",
-            "public": "publicFlag",
-            "private": "privateFlag",
-            "internal": "internalFlag",
-            "protocol": "protocolType",
-            "struct": "structType",
-            "enum": "enumType",
-            "extension": "extensionType",
-            "func": "function",
-            "var": "variable",
-            "let": "constant",
-            "init": "initialize",
-            "self": "selfValue",
-            "super": "superValue",
-            "true": "trueValue",
-            "false": "falseValue",
-            "type": "typeValue",
-            "associatedtype": "associatedTypeValue",
-            "operator": "operatorValue",
-            "return": "returnValue",
-            "default": "defaultValue",
-        }
-
         # Add property declarations
         if properties:
             for prop_name, prop_schema in properties.items():
@@ -374,22 +504,22 @@ class OpenAPISwiftModelGenerator:
                 swift_prop_name = to_camel_case(prop_name)
 
                 # Handle reserved Swift keywords
-                if swift_prop_name in swift_reserved_keywords:
-                    renamed_props[swift_prop_name] = swift_reserved_keywords[swift_prop_name]
-                    swift_prop_name = swift_reserved_keywords[swift_prop_name]
+                if swift_prop_name in SWIFT_RESERVED_KEYWORDS:
+                    renamed_props[swift_prop_name] = SWIFT_RESERVED_KEYWORDS[swift_prop_name]
+                    swift_prop_name = SWIFT_RESERVED_KEYWORDS[swift_prop_name]
 
                 # Check if this property should be unique (using x_unique_key extension)
                 is_unique = prop_schema.x_unique_key or prop_name == "id"
 
                 # Add property with appropriate attributes
                 if is_unique:
-                    swift_code.append(f"    @Attribute(.unique) var {swift_prop_name}: {swift_type}")
+                    swift_code.append(f"    @Attribute(.unique) {self._access}var {swift_prop_name}: {swift_type}")
                 else:
-                    swift_code.append(f"    var {swift_prop_name}: {swift_type}")
+                    swift_code.append(f"    {self._access}var {swift_prop_name}: {swift_type}")
 
         # Add standard initializer
         swift_code.append("")
-        swift_code.append("    init(")
+        swift_code.append(f"    {self._access}init(")
 
         # Add initializer parameters
         init_params = []
@@ -426,7 +556,7 @@ class OpenAPISwiftModelGenerator:
 
         # Add convenience initializer from DTO
         swift_code.append("")
-        swift_code.append(f"    convenience init(item: {dto_name}) {{")
+        swift_code.append(f"    {self._access}convenience init(item: {dto_name}) {{")
         swift_code.append("        self.init(")
 
         # Add parameter mappings from DTO to model
@@ -447,7 +577,7 @@ class OpenAPISwiftModelGenerator:
 
         # Add update method from DTO
         swift_code.append("")
-        swift_code.append(f"    func update(fromDTO dto: {dto_name}) {{")
+        swift_code.append(f"    {self._access}func update(fromDTO dto: {dto_name}) {{")
 
         # Add property assignments from DTO
         for prop_name in properties.keys():
@@ -467,6 +597,125 @@ class OpenAPISwiftModelGenerator:
 
         return "\n".join(swift_code)
 
+    def _discriminated_variants(self, schema: Schema) -> Optional[List[tuple[str, List[str]]]]:
+        """
+        Returns the variant schema names of a discriminated `oneOf` and the discriminator values of each.
+
+        A variant's values are the `discriminator.mapping` keys that point at it. Variants without one use the single
+        `const` or `enum` value of their discriminator property, falling back to the variant's schema name as OpenAPI
+        specifies. Returns None if the schema isn't a `oneOf` of references to object schemas with a discriminator
+        property, since only objects have a DTO to decode the variant with.
+        """
+        if not schema.oneOf or schema.discriminator is None or not schema.discriminator.propertyName:
+            return None
+        variant_names = [schema_name_from_ref(option.ref_) if option.ref_ else None for option in schema.oneOf]
+        if any(variant_name is None or not self._is_object_variant(variant_name) for variant_name in variant_names):
+            return None
+
+        values_by_variant: Dict[str, List[str]] = {str(variant_name): [] for variant_name in variant_names}
+        for value, target in (schema.discriminator.mapping or {}).items():
+            # Mapping targets are references or bare schema names
+            target_name = schema_name_from_ref(target) or target
+            if target_name in values_by_variant:
+                values_by_variant[target_name].append(value)
+
+        property_name = schema.discriminator.propertyName
+        for variant_name, values in values_by_variant.items():
+            if values:
+                continue
+            variant = self.schema.get_schema(variant_name)
+            discriminator_schema = (variant.properties or {}).get(property_name) if variant is not None else None
+            if discriminator_schema is not None and discriminator_schema.const is not None:
+                values.append(str(discriminator_schema.const))
+            elif discriminator_schema is not None and discriminator_schema.enum and len(discriminator_schema.enum) == 1:
+                values.append(str(discriminator_schema.enum[0]))
+            else:
+                values.append(variant_name)
+        return list(values_by_variant.items())
+
+    def _is_object_variant(self, variant_name: str) -> bool:
+        """Returns whether a variant of a discriminated `oneOf` is an object, which has a DTO to decode it with."""
+        variant = self.schema.get_schema(variant_name)
+        return variant is not None and variant.type == "object" and bool(variant.properties)
+
+    def _generate_discriminated_union(self, schema_name: str, schema: Schema, variants: List[tuple[str, List[str]]]) -> str:
+        """
+        Generate a Swift enum with an associated value per variant of a discriminated `oneOf`.
+
+        Decoding reads the discriminator property once and looks its value up in a static table of variant decoders,
+        so each payload is decoded once, by its own variant, instead of trying every variant in turn. Encoding
+        encodes the variant, which includes its discriminator property.
+        """
+        property_name = schema.discriminator.propertyName if schema.discriminator is not None else None
+        discriminator_key = to_camel_case(str(property_name))
+
+        cases: List[tuple[str, str, List[str]]] = []
+        for variant_name, values in variants:
+            # The variant's name with a lowercase first letter: `PetCat` becomes `case petCat(PetCatDTO)`
+            case_name = "".join(c for c in variant_name if c.isalnum())
+            case_name = case_name[:1].lower() + case_name[1:] or f"value{len(cases)}"
+            cases.append((SWIFT_RESERVED_KEYWORDS.get(case_name, case_name), f"{variant_name}DTO", values))
+
+        swift_code = []
+
+        # Add description as a comment if available
+        if schema.description:
+            swift_code.append(f"// {schema.description}")
+
+        swift_code.append(f"{self._access}enum {schema_name}: Codable, Hashable {{")
+        for case_name, variant_type, _ in cases:
+            swift_code.append(f"    case {case_name}({variant_type})")
+
+        swift_code.append("")
+        swift_code.append("    private enum DiscriminatorKeys: String, CodingKey {")
+        swift_code.append(f'        case {discriminator_key} = "{property_name}"')
+        swift_code.append("    }")
+
+        swift_code.append("")
+        swift_code.append(f"    private static let decoders: [String: (Decoder) throws -> {schema_name}] = [")
+        for case_name, variant_type, values in cases:
+            for value in values:
+                swift_code.append(f'        "{value}": {{ .{case_name}(try {variant_type}(from: $0)) }},')
+        swift_code.append("    ]")
+
+        swift_code.append("")
+        swift_code.append(f"    {self._access}init(from decoder: Decoder) throws {{")
+        swift_code.append("        let container = try decoder.container(keyedBy: DiscriminatorKeys.self)")
+        swift_code.append(f"        let discriminator = try container.decode(String.self, forKey: .{discriminator_key})")
+        swift_code.append(f"        guard let decode = {schema_name}.decoders[discriminator] else {{")
+        swift_code.append("            throw DecodingError.dataCorruptedError(")
+        swift_code.append(f"                forKey: .{discriminator_key},")
+        swift_code.append("                in: container,")
+        swift_code.append(f'                debugDescription: "Unknown {schema_name} {property_name}: \\(discriminator)"')
+        swift_code.append("            )")
+        swift_code.append("        }")
+        swift_code.append("        self = try decode(decoder)")
+        swift_code.append("    }")
+
+        swift_code.append("")
+        swift_code.append(f"    {self._access}func encode(to encoder: Encoder) throws {{")
+        swift_code.append("        switch self {")
+        for case_name, _, _ in cases:
+            swift_code.append(f"        case .{case_name}(let value):")
+            swift_code.append("            try value.encode(to: encoder)")
+        swift_code.append("        }")
+        swift_code.append("    }")
+        swift_code.append("}")
+
+        if self.shared_coding:
+            swift_code.append("")
+            swift_code.append(f"extension {schema_name}: GeneratedCodable {{}}")
+
+        return "\n".join(swift_code)
+
+    def _generate_alias(self, schema_name: str, schema: Schema) -> str:
+        """Generate typealiases pointing a duplicate schema (and its DTO) at its canonical schema's types."""
+        canonical_name = self.schema_aliases[schema_name]
+        swift_code = [f"{self._access}typealias {schema_name} = {canonical_name}"]
+        if schema.type == "object" and schema.properties:
+            swift_code.append(f"{self._access}typealias {schema_name}DTO = {canonical_name}DTO")
+        return "\n".join(swift_code)
+
     def generate_model(self, schema_name: str) -> str:
         """
         Generates SwiftData model code from an OpenAPI schema.
@@ -482,9 +731,48 @@ class OpenAPISwiftModelGenerator:
         if schema is None:
             raise ValueError(f"Schema {schema_name} not found")
 
+        if self.cache is None:
+            return self._generate_model(schema_name, schema)
+
+        # The generated code only depends on the schema itself and the generator options, and for discriminated
+        # unions on their variants' discriminator values, which are None unless every variant is an object
+        variants = self._discriminated_variants(schema)
+        variants_key = None
+        if variants is not None:
+            variants_key = tuple((variant_name, tuple(values)) for variant_name, values in variants)
+        key = (
+            schema_name,
+            schema.model_dump_json(by_alias=True, exclude_none=True),
+            variants_key,
+            self.schema_aliases.get(schema_name),
+            self.identity_equality,
+            self.shared_coding,
+            self.enum_struct_threshold,
+            self.access_modifier,
+        )
+        return self.cache.get_model(key, lambda: self._generate_model(schema_name, schema))
+
+    def _generate_model(self, schema_name: str, schema: Schema) -> str:
+        """Generates the Swift code for a schema, see `generate_model`."""
+        # Duplicates of another schema reuse its types
+        if schema_name in self.schema_aliases:
+            return self._generate_alias(schema_name, schema)
+
+        # Discriminated oneOfs become enums with one case per variant
+        variants = self._discriminated_variants(schema)
+        if variants is not None:
+            return self._generate_discriminated_union(schema_name, schema, variants)
+
         # Handle enums separately - they should not be SwiftData models
         # Check for the presence of enum values rather than an explicit "enum" type
         if schema.enum is not None and len(schema.enum) > 0:
+            if (
+                schema.type == "string"
+                and self.enum_struct_threshold is not None
+                and len(schema.enum) > self.enum_struct_threshold
+            ):
+                return "\n".join(self._handle_large_enum_schema(schema_name, schema))
+
             enum_code = self._handle_enum_schema(schema)
             # Replace "Value" with the actual schema name in the enum definition
             enum_code = [
@@ -499,25 +787,391 @@ class OpenAPISwiftModelGenerator:
         # For object types, generate both a DTO and a SwiftData model
         if schema.type == "object" and schema.properties:
             dto_code = self._generate_dto_struct(schema_name, schema)
+            if self.shared_coding:
+                dto_code += f"\n\nextension {schema_name}DTO: GeneratedCodable {{}}"
             model_code = self._generate_model_with_dto_conveniences(schema_name, schema)
             return f"{dto_code}\n\n{model_code}"
 
         # For array types, use the existing array schema handler
         if schema.type == "array" and schema.items:
             swift_code = ["@Model"]
-            swift_code.append(f"final class {schema_name} {{")
+            swift_code.append(f"{self._access}final class {schema_name} {{")
             swift_code.extend(self._handle_array_schema(schema))
             swift_code.append("}")
             return "\n".join(swift_code)
 
         # For simple types, use the existing simple schema handler
         swift_code = ["@Model"]
-        swift_code.append(f"final class {schema_name} {{")
+        swift_code.append(f"{self._access}final class {schema_name} {{")
         swift_code.extend(self._handle_simple_schema(schema))
         swift_code.append("}")
         return "\n".join(swift_code)
 
+    def _unique_key_property(self, schema: Schema) -> Optional[str]:
+        """Returns the name of the property that uniquely identifies instances of an object schema, if any."""
+        properties = schema.properties or {}
+        if "id" in properties:
+            return "id"
+        for prop_name, prop_schema in properties.items():
+            if prop_schema.x_unique_key:
+                return prop_name
+        return None
+
+    def _generate_upsert_method(self, schema_name: str, schema: Schema) -> List[str]:
+        """Generate the single-item and batched upsert methods of an importer for one model."""
+        dto_name = f"{schema_name}DTO"
+        swift_code = [f"    {self._access}func upsert(_ dto: {dto_name}) throws {{"]
+
+        key_prop = self._unique_key_property(schema)
+        if key_prop is None:
+            # Without a unique key there is nothing to match against, so every DTO is a new model
+            swift_code.append(f"        modelContext.insert({schema_name}(item: dto))")
+        else:
+            dto_key = to_camel_case(key_prop)
+            model_key = SWIFT_RESERVED_KEYWORDS.get(dto_key, dto_key)
+            swift_code.append(f"        let key = dto.{dto_key}")
+            predicate = f"#Predicate {{ $0.{model_key} == key }}"
+            swift_code.append(f"        var descriptor = FetchDescriptor<{schema_name}>(predicate: {predicate})")
+            swift_code.append("        descriptor.fetchLimit = 1")
+            swift_code.append("        if let existing = try modelContext.fetch(descriptor).first {")
+            swift_code.append("            existing.update(fromDTO: dto)")
+            swift_code.append("        } else {")
+            swift_code.append(f"            modelContext.insert({schema_name}(item: dto))")
+            swift_code.append("        }")
+        swift_code.append("    }")
+
+        swift_code.append("")
+        swift_code.append(
+            f"    {self._access}func upsert(_ dtos: [{dto_name}], batchSize: Int = {DEFAULT_IMPORT_BATCH_SIZE}) throws {{"
+        )
+        swift_code.append("        try inBatches(dtos, batchSize: batchSize) { batch in")
+        if key_prop is None:
+            swift_code.append("            for dto in batch {")
+            swift_code.append(f"                modelContext.insert({schema_name}(item: dto))")
+            swift_code.append("            }")
+        else:
+            # One fetch per batch: the existing models are looked up by key instead of fetched one DTO at a time
+            swift_code.append(f"            let keys = batch.map(\\.{dto_key})")
+            predicate = f"#Predicate {{ keys.contains($0.{model_key}) }}"
+            swift_code.append(f"            let descriptor = FetchDescriptor<{schema_name}>(predicate: {predicate})")
+            swift_code.append("            var existing = Dictionary(")
+            swift_code.append(f"                try modelContext.fetch(descriptor).map {{ ($0.{model_key}, $0) }},")
+            swift_code.append("                uniquingKeysWith: { first, _ in first }")
+            swift_code.append("            )")
+            swift_code.append("            for dto in batch {")
+            swift_code.append(f"                if let model = existing[dto.{dto_key}] {{")
+            swift_code.append("                    model.update(fromDTO: dto)")
+            swift_code.append("                } else {")
+            swift_code.append(f"                    let model = {schema_name}(item: dto)")
+            swift_code.append("                    modelContext.insert(model)")
+            # Later DTOs with the same key in the batch update the model inserted for the first one
+            swift_code.append(f"                    existing[dto.{dto_key}] = model")
+            swift_code.append("                }")
+            swift_code.append("            }")
+        swift_code.append("        }")
+        swift_code.append("    }")
+
+        return swift_code
+
+    def generate_importer(self, root_schema_name: str, schema_names: List[str]) -> Optional[str]:
+        """
+        Generates a `@ModelActor` importer for a group of schemas.
+
+        The importer decodes and upserts the group's models on a background model context, saving and draining the
+        autorelease pool after every batch so large payloads neither block the main actor nor grow memory unbounded.
+
+        Args:
+            root_schema_name: Name of the root schema of the group
+            schema_names: Names of all schemas in the group, ordered by reference level
+
+        Returns:
+            Swift code for the importer actor, or None if the group has no object models to import
+        """
+        model_schemas = []
+        for schema_name in schema_names:
+            # Aliases share their canonical schema's types, which already have upsert methods
+            if schema_name in self.schema_aliases:
+                continue
+            schema = self.schema.get_schema(schema_name)
+            if schema is not None and schema.type == "object" and schema.properties:
+                model_schemas.append((schema_name, schema))
+        if not model_schemas:
+            return None
+
+        swift_code = ["@ModelActor"]
+        swift_code.append(f"{self._access}actor {root_schema_name}Importer {{")
+
+        root_schema = self.schema.get_schema(root_schema_name)
+        if root_schema is not None and root_schema.type == "object" and root_schema.properties:
+            swift_code.append(f"    /// Decodes a JSON array of `{root_schema_name}DTO` and upserts it in batches.")
+            swift_code.append(
+                f"    {self._access}func import{root_schema_name}(from data: Data, "
+                f"batchSize: Int = {DEFAULT_IMPORT_BATCH_SIZE}) throws {{"
+            )
+            decoder = "GeneratedCoding.decoder" if self.shared_coding else "JSONDecoder()"
+            swift_code.append(f"        let dtos = try {decoder}.decode([{root_schema_name}DTO].self, from: data)")
+            swift_code.append("        try upsert(dtos, batchSize: batchSize)")
+            swift_code.append("    }")
+
+        for schema_name, schema in model_schemas:
+            if len(swift_code) > 2:
+                swift_code.append("")
+            swift_code.extend(self._generate_upsert_method(schema_name, schema))
+
+        # Shared batching loop: each batch is saved and its temporaries released before the next one starts
+        swift_code.append("")
+        swift_code.append("    private func inBatches<Item>(")
+        swift_code.append("        _ items: [Item],")
+        swift_code.append("        batchSize: Int,")
+        swift_code.append("        _ body: (ArraySlice<Item>) throws -> Void")
+        swift_code.append("    ) throws {")
+        swift_code.append("        for start in stride(from: 0, to: items.count, by: max(batchSize, 1)) {")
+        swift_code.append("            let batch = items[start..<min(start + max(batchSize, 1), items.count)]")
+        swift_code.append("            try autoreleasepool {")
+        swift_code.append("                try body(batch)")
+        swift_code.append("                try modelContext.save()")
+        swift_code.append("            }")
+        swift_code.append("        }")
+        swift_code.append("    }")
+        swift_code.append("}")
+
+        return "\n".join(swift_code)
+
+    def generate_coding_support(self) -> str:
+        """
+        Generates the shared JSON coding configuration referenced by generated DTOs.
+
+        Date formatters are expensive to create, so a single cached instance per format is shared by one decoder and
+        one encoder. Decoding accepts `date-time` values with or without fractional seconds or a time zone, and
+        `date` values. Dates are encoded as `date-time` values, except DTO properties with a `date` format, which are
+        wrapped in `@DateOnly` and encoded as `date` values.
+
+        Returns:
+            Swift code for the `GeneratedCoding` namespace and the `GeneratedCodable` protocol
+        """
+        return """/// Shared JSON coding configuration for generated types.
+///
+/// Formatters are created once and reused; `ISO8601DateFormatter` and `DateFormatter` are thread-safe once configured.
+{access}enum GeneratedCoding {
+    private static let dateTimeFormatter: ISO8601DateFormatter = {
+        let formatter = ISO8601DateFormatter()
+        formatter.formatOptions = [.withInternetDateTime, .withFractionalSeconds]
+        return formatter
+    }()
+
+    private static let dateTimeWithoutFractionFormatter: ISO8601DateFormatter = {
+        let formatter = ISO8601DateFormatter()
+        formatter.formatOptions = [.withInternetDateTime]
+        return formatter
+    }()
+
+    private static let localDateTimeFormatter = makePOSIXFormatter("yyyy-MM-dd'T'HH:mm:ss.SSSSSS")
+    private static let localDateTimeWithoutFractionFormatter = makePOSIXFormatter("yyyy-MM-dd'T'HH:mm:ss")
+    private static let dateFormatter = makePOSIXFormatter("yyyy-MM-dd")
+
+    private static func makePOSIXFormatter(_ dateFormat: String) -> DateFormatter {
+        let formatter = DateFormatter()
+        formatter.calendar = Calendar(identifier: .iso8601)
+        formatter.locale = Locale(identifier: "en_US_POSIX")
+        formatter.timeZone = TimeZone(secondsFromGMT: 0)
+        formatter.dateFormat = dateFormat
+        return formatter
+    }
+
+    /// Parses a `date-time` or `date` string using the cached formatters.
+    {access}static func date(from string: String) -> Date? {
+        dateTimeFormatter.date(from: string)
+            ?? dateTimeWithoutFractionFormatter.date(from: string)
+            ?? localDateTimeFormatter.date(from: string)
+            ?? localDateTimeWithoutFractionFormatter.date(from: string)
+            ?? dateFormatter.date(from: string)
+    }
+
+    /// Parses a `date` string, trying the `yyyy-MM-dd` formatter before the `date-time` ones.
+    {access}static func dateOnly(from string: String) -> Date? {
+        dateFormatter.date(from: string) ?? date(from: string)
+    }
+
+    {access}static let decoder: JSONDecoder = {
+        let decoder = JSONDecoder()
+        decoder.dateDecodingStrategy = .custom { decoder in
+            let container = try decoder.singleValueContainer()
+            let string = try container.decode(String.self)
+            guard let date = GeneratedCoding.date(from: string) else {
+                throw DecodingError.dataCorruptedError(in: container, debugDescription: "Invalid date: \\(string)")
+            }
+            return date
+        }
+        return decoder
+    }()
+
+    /// Formats a `date` value, without a time.
+    {access}static func dateString(from date: Date) -> String {
+        dateFormatter.string(from: date)
+    }
+
+    {access}static let encoder: JSONEncoder = {
+        let encoder = JSONEncoder()
+        encoder.dateEncodingStrategy = .custom { date, encoder in
+            var container = encoder.singleValueContainer()
+            try container.encode(GeneratedCoding.dateTimeFormatter.string(from: date))
+        }
+        return encoder
+    }()
+}
+
+/// Values that `DateOnly` can wrap: `Date` and `Date?`.
+{access}protocol DateOnlyCodable: Hashable {
+    static func decodeDateOnly(from container: SingleValueDecodingContainer) throws -> Self
+    func encodeDateOnly(to container: inout SingleValueEncodingContainer) throws
+}
+
+extension Date: DateOnlyCodable {
+    {access}static func decodeDateOnly(from container: SingleValueDecodingContainer) throws -> Date {
+        let string = try container.decode(String.self)
+        guard let date = GeneratedCoding.dateOnly(from: string) else {
+            throw DecodingError.dataCorruptedError(in: container, debugDescription: "Invalid date: \\(string)")
+        }
+        return date
+    }
+
+    {access}func encodeDateOnly(to container: inout SingleValueEncodingContainer) throws {
+        try container.encode(GeneratedCoding.dateString(from: self))
+    }
+}
+
+extension Optional: DateOnlyCodable where Wrapped == Date {
+    {access}static func decodeDateOnly(from container: SingleValueDecodingContainer) throws -> Date? {
+        container.decodeNil() ? nil : try Date.decodeDateOnly(from: container)
+    }
+
+    {access}func encodeDateOnly(to container: inout SingleValueEncodingContainer) throws {
+        if let date = self {
+            try date.encodeDateOnly(to: &container)
+        } else {
+            try container.encodeNil()
+        }
+    }
+}
+
+/// Codes a `date` property as `yyyy-MM-dd` instead of a full `date-time` timestamp.
+@propertyWrapper
+{access}struct DateOnly<Value: DateOnlyCodable>: Codable, Hashable {
+    {access}var wrappedValue: Value
+
+    {access}init(wrappedValue: Value) {
+        self.wrappedValue = wrappedValue
+    }
+
+    {access}init(from decoder: Decoder) throws {
+        wrappedValue = try Value.decodeDateOnly(from: decoder.singleValueContainer())
+    }
+
+    {access}func encode(to encoder: Encoder) throws {
+        var container = encoder.singleValueContainer()
+        try wrappedValue.encodeDateOnly(to: &container)
+    }
+}
+
+extension KeyedDecodingContainer {
+    /// Optional date-only properties may be missing, like other optional properties.
+    {access}func decode(_ type: DateOnly<Date?>.Type, forKey key: Key) throws -> DateOnly<Date?> {
+        try decodeIfPresent(type, forKey: key) ?? DateOnly(wrappedValue: nil)
+    }
+}
+
+extension KeyedEncodingContainer {
+    /// Optional date-only properties are omitted when nil, like other optional properties.
+    {access}mutating func encode(_ value: DateOnly<Date?>, forKey key: Key) throws {
+        if value.wrappedValue != nil {
+            try encodeIfPresent(value, forKey: key)
+        }
+    }
+}
+
+/// Generated types that decode and encode through `GeneratedCoding`.
+{access}protocol GeneratedCodable: Codable {}
+
+extension GeneratedCodable {
+    {access}static func decode(from data: Data) throws -> Self {
+        try GeneratedCoding.decoder.decode(Self.self, from: data)
+    }
+
+    {access}static func decodeArray(from data: Data) throws -> [Self] {
+        try GeneratedCoding.decoder.decode([Self].self, from: data)
+    }
+
+    {access}func encoded() throws -> Data {
+        try GeneratedCoding.encoder.encode(self)
+    }
+}""".replace("{access}", self._access)
+
+    def generate_json_value_support(self) -> str:
+        """
+        Generates the `JSONValue` type that free-form objects are decoded into.
+
+        Unlike `Dictionary<String, Any>`, it is `Codable` and `Hashable`, so free-form fields decode with the rest of
+        the payload instead of going through `JSONSerialization`.
+
+        Returns:
+            Swift code for the `JSONValue` enum
+        """
+        return """/// A free-form JSON value.
+{access}enum JSONValue: Codable, Hashable {
+    case string(String)
+    case number(Double)
+    case bool(Bool)
+    case object([String: JSONValue])
+    case array([JSONValue])
+    case null
+
+    {access}init(from decoder: Decoder) throws {
+        let container = try decoder.singleValueContainer()
+        if container.decodeNil() {
+            self = .null
+        } else if let value = try? container.decode(Bool.self) {
+            self = .bool(value)
+        } else if let value = try? container.decode(Double.self) {
+            self = .number(value)
+        } else if let value = try? container.decode(String.self) {
+            self = .string(value)
+        } else if let value = try? container.decode([JSONValue].self) {
+            self = .array(value)
+        } else {
+            self = .object(try container.decode([String: JSONValue].self))
+        }
+    }
+
+    {access}func encode(to encoder: Encoder) throws {
+        var container = encoder.singleValueContainer()
+        switch self {
+        case .string(let value):
+            try container.encode(value)
+        case .number(let value):
+            try container.encode(value)
+        case .bool(let value):
+            try container.encode(value)
+        case .object(let value):
+            try container.encode(value)
+        case .array(let value):
+            try container.encode(value)
+        case .null:
+            try container.encodeNil()
+        }
+    }
+}""".replace("{access}", self._access)
+
     def _openapi_type_to_swift(self, prop_schema: JSONSchema, is_required: bool) -> str:
+        """Converts an OpenAPI property type to a Swift type, once per property schema instance."""
+        cached = self._swift_types.get((id(prop_schema), is_required))
+        # The schema is kept with its type, so its id can't be reused by another schema
+        if cached is not None and cached[0] is prop_schema:
+            return cached[1]
+        swift_type = self._convert_openapi_type_to_swift(prop_schema, is_required)
+        self._swift_types[(id(prop_schema), is_required)] = (prop_schema, swift_type)
+        return swift_type
+
+    def _convert_openapi_type_to_swift(self, prop_schema: JSONSchema, is_required: bool) -> str:
         """
         Converts an OpenAPI property type to a Swift type.
 
@@ -543,7 +1197,7 @@ class OpenAPISwiftModelGenerator:
                 case EnumSchemaType.BOOLEAN:
                     return "Bool"
                 case EnumSchemaType.OBJECT:
-                    return "Dictionary<String, Any>"
+                    return "JSONValue"
                 case _:
                     return "Any"
 
@@ -559,9 +1213,7 @@ class OpenAPISwiftModelGenerator:
 
             for option in prop_schema.anyOf:
                 if option.ref_:
-                    ref = option.ref_
-                    if ref.startswith("#/components/schemas/"):
-                        ref_type = ref.split("/")[-1]
+                    ref_type = schema_name_from_ref(option.ref_) or ref_type
                 elif option.type == "null":
                     has_null = True
                 elif option.type and not ref_type:
@@ -573,6 +1225,8 @@ class OpenAPISwiftModelGenerator:
                             if option.items.type:
                                 item_type = self._openapi_type_to_swift(option.items, True)
                         simple_type = f"[{item_type}]"
+                    elif option.type == "object":
+                        simple_type = self._openapi_type_to_swift(option, True)
                     else:
                         # Extract the type as a string
                         simple_type = get_swift_type(option.type)
@@ -591,9 +1245,8 @@ class OpenAPISwiftModelGenerator:
 
         # Handle direct references to other schemas
         if prop_schema.ref_:
-            ref = prop_schema.ref_
-            if ref.startswith("#/components/schemas/"):
-                ref_type = ref.split("/")[-1]
+            ref_type = schema_name_from_ref(prop_schema.ref_)
+            if ref_type is not None:
                 return f"{ref_type}{'?' if not is_required else ''}"
 
         # Handle arrays
@@ -601,6 +1254,14 @@ class OpenAPISwiftModelGenerator:
             item_type = self._openapi_type_to_swift(prop_schema.items, True)  # Array items are always required
             return f"[{item_type}]{'?' if not is_required else ''}"
 
+        # Handle maps: objects whose values all have the additionalProperties schema, or any JSON value
+        if prop_schema.type == "object" and not prop_schema.properties:
+            if self._is_untyped_map_value(prop_schema.additionalProperties):
+                return f"[String: JSONValue]{'?' if not is_required else ''}"
+            if isinstance(prop_schema.additionalProperties, JSONSchema):
+                value_type = self._openapi_type_to_swift(prop_schema.additionalProperties, True)
+                return f"[String: {value_type}]{'?' if not is_required else ''}"
+
         # Get the base type as a string
         swift_type = "Any"
         if prop_schema.type:
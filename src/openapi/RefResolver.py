@@ -0,0 +1,307 @@
+import json
+import os
+from typing import Any, Optional, cast
+from urllib.parse import unquote
+
+import yaml
+from pydantic import BaseModel, RootModel
+
+SCHEMA_REF_PREFIX = "#/components/schemas/"
+
+# Keywords whose value maps arbitrary names to subschemas
+_SCHEMA_MAP_KEYWORDS = {"properties", "patternProperties", "dependentSchemas", "$defs", "definitions"}
+
+# Keywords whose value is a single subschema
+_SCHEMA_KEYWORDS = {
+    "items",
+    "additionalItems",
+    "additionalProperties",
+    "unevaluatedItems",
+    "unevaluatedProperties",
+    "propertyNames",
+    "contains",
+    "not",
+    "if",
+    "then",
+    "else",
+}
+
+# Keywords whose value is a list of subschemas
+_SCHEMA_LIST_KEYWORDS = {"allOf", "anyOf", "oneOf", "prefixItems"}
+
+
+def load_document(filepath: str) -> dict[str, Any]:
+    """Loads a JSON or YAML document from a file."""
+    with open(filepath, "r", encoding="utf-8") as file:
+        if filepath.endswith(".json"):
+            return cast(dict[str, Any], json.load(file))
+        elif filepath.endswith((".yaml", ".yml")):
+            return cast(dict[str, Any], yaml.safe_load(file))
+        else:
+            raise ValueError("Unsupported file format. Use JSON or YAML.")
+
+
+def parse_json_pointer(pointer: str) -> list[str]:
+    """Splits a JSON pointer (RFC 6901) into its unescaped reference tokens."""
+    if not pointer:
+        return []
+    if not pointer.startswith("/"):
+        raise ValueError(f"Invalid JSON pointer: {pointer}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def escape_json_pointer_token(token: str) -> str:
+    """Escapes a reference token for use in a JSON pointer."""
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def schema_name_from_ref(ref: str) -> Optional[str]:
+    """
+    Returns the schema name of a local reference to a named schema.
+
+    Both `#/components/schemas/<name>` and `#/$defs/<name>` are recognised; any other reference returns None.
+    """
+    if not ref.startswith("#"):
+        return None
+    tokens = parse_json_pointer(unquote(ref[1:]))
+    if len(tokens) == 3 and tokens[:2] == ["components", "schemas"]:
+        return tokens[2]
+    if len(tokens) == 2 and tokens[0] == "$defs":
+        return tokens[1]
+    return None
+
+
+def _ref_of(node: Any) -> Optional[str]:
+    """Returns the `$ref` of a raw or parsed reference object, or None if the node isn't a reference."""
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+    else:
+        ref = getattr(node, "ref_", None)
+    return ref if isinstance(ref, str) else None
+
+
+def _child(node: Any, token: str) -> Any:
+    """Returns the child of a raw or parsed node for a JSON pointer token, raising KeyError if it doesn't exist."""
+    if isinstance(node, RootModel):
+        node = node.root
+    if isinstance(node, dict):
+        return node[token]
+    if isinstance(node, list):
+        if not token.isdigit() or int(token) >= len(node):
+            raise KeyError(token)
+        return node[int(token)]
+    if isinstance(node, BaseModel):
+        for name, field in type(node).model_fields.items():
+            if token in (name, field.alias):
+                value = getattr(node, name)
+                if value is None:
+                    raise KeyError(token)
+                return value
+    raise KeyError(token)
+
+
+def _has_external_refs(node: Any) -> bool:
+    """Returns whether a raw node contains any reference to another file."""
+    if isinstance(node, list):
+        return any(_has_external_refs(item) for item in node)
+    if not isinstance(node, dict):
+        return False
+    ref = node.get("$ref")
+    if isinstance(ref, str) and not ref.startswith("#"):
+        return True
+    return any(_has_external_refs(value) for value in node.values())
+
+
+class RefResolver:
+    """
+    Resolves `$ref`s in a document by JSON pointer, following references into other files.
+
+    The document can be a raw (JSON/YAML) document or a parsed pydantic model. External documents are resolved
+    relative to the document that references them and are loaded once. Resolved targets are cached.
+    """
+
+    def __init__(self, document: Any, base_uri: str = ""):
+        """
+        Args:
+            document: The root document
+            base_uri: The path of the root document, used to resolve relative references to other files
+        """
+        self.base_uri = os.path.abspath(base_uri) if base_uri else ""
+        self._documents: dict[str, Any] = {self.base_uri: document}
+        self._cache: dict[tuple[str, str], tuple[str, Any]] = {}
+
+        # Bundling state: the name each schema from another file is bundled as, and the bundled schemas
+        self._hoisted: dict[tuple[str, str], str] = {}
+        self._hoisted_schemas: dict[str, Any] = {}
+        self._taken_names: set[str] = set()
+        self._inlining: list[tuple[str, str]] = []
+
+    @property
+    def document_paths(self) -> list[str]:
+        """The paths of the root document and of every other file loaded so far to resolve references."""
+        return [uri for uri in self._documents if uri]
+
+    def _split_ref(self, ref: str, base_uri: str) -> tuple[str, str]:
+        """Splits a reference into the absolute path of its document and its JSON pointer."""
+        location, _, fragment = ref.partition("#")
+        if "://" in location:
+            raise ValueError(f"Unsupported remote $ref: {ref}")
+        if location:
+            base_dir = os.path.dirname(base_uri) if base_uri else os.getcwd()
+            location = os.path.normpath(os.path.join(base_dir, unquote(location)))
+        else:
+            location = base_uri
+        return location, unquote(fragment)
+
+    def _document(self, uri: str) -> Any:
+        """Returns a document, loading it on first use."""
+        if uri not in self._documents:
+            try:
+                self._documents[uri] = load_document(uri)
+            except Exception as e:
+                raise RuntimeError(f"Failed to load referenced file {uri}: {e}")
+        return self._documents[uri]
+
+    def _resolve(self, uri: str, pointer: str) -> tuple[str, Any]:
+        """Resolves a pointer into a document, following chains of references, returning the target's document."""
+        key = (uri, pointer)
+        if key in self._cache:
+            return self._cache[key]
+
+        chain = [key]
+        while True:
+            node = self._document(uri)
+            try:
+                for token in parse_json_pointer(pointer):
+                    node = _child(node, token)
+            except KeyError:
+                raise ValueError(f"Could not resolve $ref: {uri}#{pointer}")
+
+            ref = _ref_of(node)
+            if ref is None:
+                break
+            uri, pointer = self._split_ref(ref, uri)
+            if (uri, pointer) in chain:
+                cycle = " -> ".join(f"{chain_uri}#{chain_pointer}" for chain_uri, chain_pointer in chain)
+                raise ValueError(f"Circular $ref: {cycle} -> {uri}#{pointer}")
+            chain.append((uri, pointer))
+
+        for chain_key in chain:
+            self._cache[chain_key] = (uri, node)
+        return uri, node
+
+    def resolve(self, ref: str, base_uri: Optional[str] = None) -> Any:
+        """
+        Resolves a reference to its target, following references that point to other references.
+
+        Args:
+            ref: The reference, e.g. `#/components/responses/NotFound` or `common.yaml#/components/schemas/Error`
+            base_uri: The document the reference appears in; defaults to the root document
+
+        Returns:
+            Any: The target node
+        """
+        return self._resolve(*self._split_ref(ref, self.base_uri if base_uri is None else base_uri))[1]
+
+    def bundle(self) -> dict[str, Any]:
+        """
+        Returns a copy of the (raw) root document without references to other files, or the document itself if it
+        doesn't reference other files.
+
+        Schemas referenced from other files are added to `components.schemas`, named after the last token of their
+        pointer (or their file name), and referenced locally so recursive schemas keep working. Every other external
+        reference (responses, parameters, request bodies, ...) is replaced by its target.
+        """
+        root = self._documents[self.base_uri]
+        # Avoid copying large single-file specs
+        if not _has_external_refs(root):
+            return cast(dict[str, Any], root)
+
+        root_schemas = (root.get("components") or {}).get("schemas") or {}
+        self._taken_names = set(root_schemas)
+        # Named schemas that are just a reference to another file take the place of their target
+        for name, schema in root_schemas.items():
+            ref = _ref_of(schema)
+            if ref is not None and len(schema) == 1:
+                key = self._split_ref(ref, self.base_uri)
+                if key[0] != self.base_uri:
+                    self._hoisted.setdefault(key, name)
+
+        bundled = cast(dict[str, Any], self._bundle_node(root, self.base_uri, False))
+        if self._hoisted_schemas:
+            components = bundled.setdefault("components", {})
+            components["schemas"] = {**(components.get("schemas") or {}), **self._hoisted_schemas}
+        return bundled
+
+    def _hoist_schema(self, uri: str, pointer: str) -> str:
+        """Adds a schema from another file to the bundled components, returning its name."""
+        key = (uri, pointer)
+        if key in self._hoisted and self._hoisted[key] in self._hoisted_schemas:
+            return self._hoisted[key]
+
+        name = self._hoisted.get(key)
+        if name is None:
+            tokens = parse_json_pointer(pointer)
+            base_name = tokens[-1] if tokens else os.path.splitext(os.path.basename(uri))[0]
+            name = base_name
+            suffix = 2
+            while name in self._taken_names:
+                name = f"{base_name}{suffix}"
+                suffix += 1
+            self._taken_names.add(name)
+            self._hoisted[key] = name
+
+        # Register the name before bundling the target so references back to it terminate
+        self._hoisted_schemas[name] = None
+        target_uri, target = self._resolve(uri, pointer)
+        self._hoisted_schemas[name] = self._bundle_node(target, target_uri, True)
+        return name
+
+    def _bundle_node(self, node: Any, uri: str, in_schema: bool) -> Any:
+        """Returns a copy of a raw node with its references to other files bundled."""
+        if isinstance(node, list):
+            return [self._bundle_node(item, uri, in_schema) for item in node]
+        if not isinstance(node, dict):
+            return node
+
+        ref = _ref_of(node)
+        if ref is not None:
+            ref_uri, pointer = self._split_ref(ref, uri)
+            if ref_uri != self.base_uri:
+                if in_schema:
+                    name = self._hoist_schema(ref_uri, pointer)
+                    return {**node, "$ref": SCHEMA_REF_PREFIX + escape_json_pointer_token(name)}
+                if (ref_uri, pointer) in self._inlining:
+                    raise ValueError(f"Circular $ref: {ref_uri}#{pointer}")
+                self._inlining.append((ref_uri, pointer))
+                target_uri, target = self._resolve(ref_uri, pointer)
+                bundled = self._bundle_node(target, target_uri, False)
+                self._inlining.pop()
+                return bundled
+            if uri != self.base_uri:
+                return {**node, "$ref": "#" + pointer}
+
+        bundled = {}
+        for key, value in node.items():
+            if in_schema and key in ("enum", "const", "default", "example", "examples"):
+                bundled[key] = value
+            elif in_schema and key in _SCHEMA_MAP_KEYWORDS and isinstance(value, dict):
+                bundled[key] = {name: self._bundle_node(subschema, uri, True) for name, subschema in value.items()}
+            elif in_schema and key in _SCHEMA_LIST_KEYWORDS:
+                bundled[key] = self._bundle_node(value, uri, True)
+            elif (in_schema and key in _SCHEMA_KEYWORDS) or (not in_schema and key == "schema"):
+                bundled[key] = self._bundle_node(value, uri, True)
+            elif not in_schema and key == "schemas" and isinstance(value, dict):
+                bundled[key] = {name: self._bundle_schema(name, subschema, uri) for name, subschema in value.items()}
+            else:
+                bundled[key] = self._bundle_node(value, uri, in_schema)
+        return bundled
+
+    def _bundle_schema(self, name: str, schema: Any, uri: str) -> Any:
+        """Bundles a named schema, replacing it by its target when it's just a reference to another file."""
+        ref = _ref_of(schema)
+        if uri == self.base_uri and ref is not None:
+            key = self._split_ref(ref, uri)
+            if self._hoisted.get(key) == name:
+                return self._hoisted_schemas[self._hoist_schema(*key)]
+        return self._bundle_node(schema, uri, True)
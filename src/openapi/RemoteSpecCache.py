@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import urllib.error
+import urllib.request
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+from pydantic import BaseModel
+
+# Directory remote specs are cached in when no other directory is given
+DEFAULT_REMOTE_SPEC_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "swift-generator", "specs")
+
+# Seconds to wait for the server before giving up
+DEFAULT_FETCH_TIMEOUT = 30.0
+
+
+def is_remote_spec(location: str) -> bool:
+    """Returns whether a spec location is an HTTP(S) URL rather than a file path."""
+    return urlparse(location).scheme in ("http", "https")
+
+
+class CachedSpecMetadata(BaseModel):
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # SHA-256 of the cached body, to tell unchanged bodies apart from servers without validators
+    digest: str
+    # Fingerprint of the generation options the cached body was last generated with
+    generated_with: Optional[str] = None
+
+
+class RemoteSpec(BaseModel):
+    url: str
+    # Local copy of the spec, loadable like any other spec file
+    path: str
+    # Whether the spec changed since it was last fetched; False on `304 Not Modified` or an identical body
+    modified: bool
+
+
+class RemoteSpecCache:
+    """
+    Keeps local copies of remote specs, refreshed with conditional requests.
+
+    Each URL's body is stored next to its `ETag` and `Last-Modified` validators, which are sent back as `If-None-Match`
+    and `If-Modified-Since` on the next fetch, so an unchanged spec costs one `304 Not Modified` round trip and no
+    download. The cache also records which generation options each spec was last generated with, so callers can skip
+    parsing, generating and writing entirely when neither the spec nor the options changed.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_REMOTE_SPEC_CACHE_DIR, timeout: float = DEFAULT_FETCH_TIMEOUT) -> None:
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+
+    def _paths(self, url: str) -> tuple[str, str]:
+        """Returns the paths of a URL's cached body and metadata."""
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        # Keep the extension so the body is parsed as JSON or YAML like a local file
+        extension = ".yaml" if urlparse(url).path.endswith((".yaml", ".yml")) else ".json"
+        return os.path.join(self.cache_dir, key + extension), os.path.join(self.cache_dir, key + ".meta.json")
+
+    def _load_metadata(self, url: str) -> Optional[CachedSpecMetadata]:
+        body_path, metadata_path = self._paths(url)
+        if not os.path.exists(body_path) or not os.path.exists(metadata_path):
+            return None
+        with open(metadata_path, "r", encoding="utf-8") as file:
+            return CachedSpecMetadata.model_validate_json(file.read())
+
+    def _save_metadata(self, metadata: CachedSpecMetadata) -> None:
+        _write_atomic(self._paths(metadata.url)[1], metadata.model_dump_json().encode("utf-8"))
+
+    def fetch(self, url: str) -> RemoteSpec:
+        """
+        Returns the local copy of a remote spec, downloading it only if it changed since the last fetch.
+
+        Raises:
+            RuntimeError: If the spec can't be fetched
+        """
+        body_path = self._paths(url)[0]
+        metadata = self._load_metadata(url)
+
+        headers = {"Accept": "application/json, application/yaml;q=0.9, */*;q=0.1"}
+        if metadata is not None and metadata.etag is not None:
+            headers["If-None-Match"] = metadata.etag
+        if metadata is not None and metadata.last_modified is not None:
+            headers["If-Modified-Since"] = metadata.last_modified
+
+        try:
+            with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=self.timeout) as response:
+                body = response.read()
+                response_headers: Any = response.headers
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and metadata is not None:
+                return RemoteSpec(url=url, path=body_path, modified=False)
+            raise RuntimeError(f"Failed to fetch OpenAPI spec {url}: HTTP {e.code}")
+        except urllib.error.URLError as e:
+            raise RuntimeError(f"Failed to fetch OpenAPI spec {url}: {e.reason}")
+
+        digest = hashlib.sha256(body).hexdigest()
+        modified = metadata is None or metadata.digest != digest
+        if modified:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            _write_atomic(body_path, body)
+        self._save_metadata(
+            CachedSpecMetadata(
+                url=url,
+                etag=response_headers.get("ETag"),
+                last_modified=response_headers.get("Last-Modified"),
+                digest=digest,
+                generated_with=None if modified or metadata is None else metadata.generated_with,
+            )
+        )
+        return RemoteSpec(url=url, path=body_path, modified=modified)
+
+    def is_generated(self, remote_spec: RemoteSpec, options: dict[str, Any]) -> bool:
+        """Returns whether an unmodified spec was already generated with the same options."""
+        metadata = self._load_metadata(remote_spec.url)
+        return not remote_spec.modified and metadata is not None and metadata.generated_with == _fingerprint(options)
+
+    def record_generation(self, remote_spec: RemoteSpec, options: dict[str, Any]) -> None:
+        """Records that the cached spec was generated with the given options."""
+        metadata = self._load_metadata(remote_spec.url)
+        if metadata is not None:
+            self._save_metadata(metadata.model_copy(update={"generated_with": _fingerprint(options)}))
+
+
+def _fingerprint(options: dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(options, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _write_atomic(path: str, contents: bytes) -> None:
+    """Writes a file through a temporary file, so an interrupted write never leaves a partial cache entry."""
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(contents)
+    os.replace(temporary_path, path)
@@ -0,0 +1,96 @@
+import sys
+from typing import Any, Hashable
+
+from pydantic import BaseModel
+
+from src.jsonschema.JSONSchema import JSONSchema
+from src.openapi.schemas.Spec import Spec
+
+
+class SpecInterner:
+    """
+    Shares identical strings and identical schemas between the parts of a spec.
+
+    Large specs repeat the same property names, titles, descriptions and small inline schemas (`{"type": "string"}`,
+    `anyOf: [X, null]`) thousands of times. Interning makes every copy of a string one object, and hash-consing makes
+    every copy of an inline schema one `JSONSchema` instance, so the spec takes less memory and caches keyed by schema
+    identity hit for every copy.
+
+    Shared schemas must not be modified: a change to one copy is a change to all of them. Named schemas
+    (`components.schemas`) are never shared with each other, since each one is generated as its own model.
+    """
+
+    def __init__(self) -> None:
+        self._schemas: dict[Hashable, JSONSchema] = {}
+        self._named_schema_ids: set[int] = set()
+        self.schema_count = 0
+        self.unique_schema_count = 0
+
+    @property
+    def shared_schema_count(self) -> int:
+        """The number of inline schemas that were replaced by an identical schema."""
+        return self.schema_count - self.unique_schema_count
+
+    def intern_raw(self, node: Any) -> Any:
+        """
+        Returns a copy of a raw JSON or YAML document with its strings (keys and values) interned, to be validated.
+
+        Validation keeps the string objects, so the validated spec shares them too. The document isn't modified.
+        """
+        if isinstance(node, dict):
+            return {self._intern_raw_value(key): self._intern_raw_value(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [self._intern_raw_value(item) for item in node]
+        return node
+
+    def _intern_raw_value(self, value: Any) -> Any:
+        if type(value) is str:
+            return sys.intern(value)
+        return self.intern_raw(value)
+
+    def intern_spec(self, spec: Spec) -> Spec:
+        """Replaces every inline schema of a validated spec by a shared instance of an identical schema, in place."""
+        named_schemas = spec.components.schemas if spec.components is not None else None
+        # Named schemas keep their identity; only their contents are shared
+        self._named_schema_ids = {id(schema) for schema in (named_schemas or {}).values()}
+        self._intern_fields(spec)
+        # The keys hold the JSON of every schema; only the shared instances are needed afterwards
+        self.unique_schema_count += len(self._schemas)
+        self._schemas.clear()
+        return spec
+
+    def _intern_value(self, value: Any) -> Any:
+        """Interns a value and returns it, or the shared instance that replaces it."""
+        if type(value) is str:
+            return sys.intern(value)
+        if isinstance(value, list):
+            for i, item in enumerate(value):
+                value[i] = self._intern_value(item)
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                value[key] = self._intern_value(item)
+        elif isinstance(value, BaseModel):
+            self._intern_fields(value)
+            if isinstance(value, JSONSchema) and id(value) not in self._named_schema_ids:
+                self.schema_count += 1
+                return self._schemas.setdefault(self._schema_key(value), value)
+        return value
+
+    def _intern_fields(self, model: BaseModel) -> None:
+        # Fields that weren't set hold their default
+        fields = model.__dict__
+        for name in model.model_fields_set:
+            if fields[name] is not None:
+                fields[name] = self._intern_value(fields[name])
+        if model.__pydantic_extra__:
+            for name, value in model.__pydantic_extra__.items():
+                model.__pydantic_extra__[name] = self._intern_value(value)
+
+    def _schema_key(self, schema: JSONSchema) -> Hashable:
+        """
+        Returns a key that is equal for identical schemas.
+
+        The JSON of the fields that were set tells `1`, `1.0` and `true` apart, which are equal in Python but not in a
+        schema, and keeps a `null` that was given explicitly.
+        """
+        return (type(schema), schema.model_dump_json(by_alias=True, exclude_unset=True))
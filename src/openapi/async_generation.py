@@ -0,0 +1,94 @@
+import asyncio
+import functools
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from src.openapi.OpenAPISpec import OpenAPISpec
+from src.openapi.parse_openapi_to_swift import (
+    parse_openapi_to_swift,
+    plan_swift_files,
+    prepare_output_dir,
+    print_files_summary,
+    write_files,
+)
+
+# Maximum number of files written at the same time
+DEFAULT_MAX_CONCURRENT_WRITES = 16
+
+T = TypeVar("T")
+
+
+async def _run_in_executor(executor: Optional[Executor], func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Runs a blocking function in an executor (the loop's default thread pool if None) without blocking the loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+
+async def load_openapi_spec_async(
+    filepath: Optional[str] = None, spec_dict: Optional[dict[str, Any]] = None, executor: Optional[Executor] = None
+) -> OpenAPISpec:
+    """Loads and validates an OpenAPI spec in an executor, see `OpenAPISpec`."""
+    return await _run_in_executor(executor, OpenAPISpec, filepath=filepath, spec_dict=spec_dict)
+
+
+async def parse_openapi_to_swift_async(
+    filepath: Optional[str] = None,
+    spec_dict: Optional[dict[str, Any]] = None,
+    executor: Optional[Executor] = None,
+    **options: Any,
+) -> dict[str, Any]:
+    """
+    Loads a spec and generates its Swift models in an executor, without blocking the event loop.
+
+    Loading and generation are separate executor jobs, so cancelling the task between them skips generation. A job
+    that is already running can't be interrupted: it finishes in the background and its result is discarded. Pass a
+    `ProcessPoolExecutor` to generate several specs in parallel rather than just concurrently; the spec is then loaded
+    and generated in a single job, since sending the loaded spec to another process costs more than loading it there.
+
+    Args:
+        filepath: Path to the OpenAPI file
+        spec_dict: The OpenAPI spec as a dictionary
+        executor: Executor to run the blocking work in; defaults to the loop's default thread pool
+        options: Generation options, see `parse_openapi_to_swift`
+
+    Returns:
+        dict[str, Any]: The generated models, see `parse_openapi_to_swift`
+    """
+    if isinstance(executor, ProcessPoolExecutor):
+        return await _run_in_executor(executor, parse_openapi_to_swift, filepath=filepath, spec_dict=spec_dict, **options)
+
+    openapi = await load_openapi_spec_async(filepath, spec_dict, executor)
+    return await _run_in_executor(executor, parse_openapi_to_swift, openapi=openapi, **options)
+
+
+async def write_swift_files_async(
+    swift_models: dict[str, Any],
+    output_dir: str,
+    max_models_per_file: Optional[int] = None,
+    max_bytes_per_file: Optional[int] = None,
+    single_file: bool = False,
+    max_concurrent_writes: int = DEFAULT_MAX_CONCURRENT_WRITES,
+) -> int:
+    """
+    Writes the generated Swift models like `write_swift_files`, writing up to `max_concurrent_writes` files at once.
+
+    Planning the files and writing them both run in the loop's default thread pool, so neither blocks the event loop.
+    Cancelling the task stops writing: files that weren't written yet are skipped, leaving a partial output directory
+    that the next run replaces.
+
+    Returns:
+        int: The number of files written
+    """
+    files = await asyncio.to_thread(plan_swift_files, swift_models, max_models_per_file, max_bytes_per_file, single_file)
+    await asyncio.to_thread(prepare_output_dir, output_dir, single_file)
+
+    semaphore = asyncio.Semaphore(max_concurrent_writes)
+
+    async def _write(relative_path: str, contents: str) -> None:
+        async with semaphore:
+            await asyncio.to_thread(write_files, output_dir, {relative_path: contents}, 1)
+
+    await asyncio.gather(*(_write(relative_path, contents) for relative_path, contents in files.items()))
+
+    print_files_summary(output_dir, files)
+    return len(files)
@@ -0,0 +1,283 @@
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Optional, Sequence
+
+from pydantic import BaseModel
+
+from src.openapi.GenerationCache import GenerationCache
+from src.openapi.OpenAPISwiftModelGenerator import DEFAULT_ENUM_STRUCT_THRESHOLD
+from src.openapi.parse_openapi_to_swift import (
+    DEFAULT_MIN_TARGET_SCHEMAS,
+    parse_openapi_to_swift,
+    write_swift_files,
+    write_swift_package,
+)
+from src.openapi.RefResolver import load_document
+
+
+class BatchEntry(BaseModel):
+    """One spec to generate, with the same options as the `parse_openapi_to_swift` command line."""
+
+    openapi: str
+    output: str
+    include_importers: bool = False
+    identity_equality: bool = False
+    enum_struct_threshold: Optional[int] = DEFAULT_ENUM_STRUCT_THRESHOLD
+    swift_package: Optional[str] = None
+    min_target_schemas: int = DEFAULT_MIN_TARGET_SCHEMAS
+    path_prefixes: Optional[list[str]] = None
+    tags: Optional[list[str]] = None
+    operation_ids: Optional[list[str]] = None
+    deduplicate: bool = False
+    max_models_per_file: Optional[int] = None
+    max_bytes_per_file: Optional[int] = None
+    single_file: bool = False
+
+
+class BatchManifest(BaseModel):
+    specs: list[BatchEntry]
+    # Directory to write shared schemas that are generated identically by several specs to, once
+    shared_output: Optional[str] = None
+    # Swift module the shared output is compiled into, imported by every spec's models
+    shared_module: str = "GeneratedShared"
+
+
+class BatchResult(BaseModel):
+    openapi: str
+    output: str
+    model_count: int = 0
+    file_count: int = 0
+    seconds: float = 0.0
+    cache_hits: int = 0
+    shared_count: int = 0
+    error: Optional[str] = None
+
+
+def load_batch_manifest(filepath: str) -> BatchManifest:
+    """Loads a JSON or YAML batch manifest, resolving spec and output paths relative to the manifest."""
+    manifest = BatchManifest.model_validate(load_document(filepath))
+    base_dir = os.path.dirname(os.path.abspath(filepath))
+    for entry in manifest.specs:
+        entry.openapi = os.path.join(base_dir, entry.openapi)
+        entry.output = os.path.join(base_dir, entry.output)
+    if manifest.shared_output is not None:
+        manifest.shared_output = os.path.join(base_dir, manifest.shared_output)
+    return manifest
+
+
+def generate_entry_models(entry: BatchEntry, cache: GenerationCache, public: bool = False) -> dict[str, Any]:
+    """
+    Generates the models for one manifest entry with its options, see `parse_openapi_to_swift`.
+
+    Models are public for Swift package entries, or when `public` is set because they are used from another module.
+    """
+    return parse_openapi_to_swift(
+        filepath=entry.openapi,
+        include_importers=entry.include_importers,
+        identity_equality=entry.identity_equality,
+        enum_struct_threshold=entry.enum_struct_threshold,
+        access_modifier="public" if public or entry.swift_package else None,
+        path_prefixes=entry.path_prefixes,
+        tags=entry.tags,
+        operation_ids=entry.operation_ids,
+        deduplicate=entry.deduplicate,
+        cache=cache,
+    )
+
+
+def _generate_models(
+    entry: BatchEntry, cache: GenerationCache, public: bool = False
+) -> tuple[BatchResult, Optional[dict[str, Any]]]:
+    """Generates the models for one manifest entry, returning None instead of the models if generation failed."""
+    start = time.perf_counter()
+    hits_before, misses_before = cache.hits, cache.misses
+    result = BatchResult(openapi=entry.openapi, output=entry.output)
+    swift_models = None
+    try:
+        swift_models = generate_entry_models(entry, cache, public)
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.seconds = time.perf_counter() - start
+    result.cache_hits = cache.hits - hits_before
+    result.model_count = result.cache_hits + cache.misses - misses_before
+    return result, swift_models
+
+
+def _write_models(
+    entry: BatchEntry, swift_models: dict[str, Any], result: BatchResult, imports: Sequence[str] = ()
+) -> None:
+    """Writes the generated models of one manifest entry, recording the file count or failure in its result."""
+    start = time.perf_counter()
+    try:
+        if entry.swift_package:
+            result.file_count = write_swift_package(
+                swift_models, entry.output, entry.swift_package, entry.min_target_schemas
+            )
+        else:
+            result.file_count = write_swift_files(
+                swift_models,
+                entry.output,
+                entry.max_models_per_file,
+                entry.max_bytes_per_file,
+                entry.single_file,
+                imports=imports,
+            )
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.seconds += time.perf_counter() - start
+
+
+def generate_batch_entry(entry: BatchEntry, cache: GenerationCache) -> BatchResult:
+    """Generates and writes the models for one manifest entry, reporting failures in the result."""
+    result, swift_models = _generate_models(entry, cache)
+    if swift_models is not None:
+        _write_models(entry, swift_models, result)
+    return result
+
+
+def find_common_models(spec_models: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """
+    Finds the shared models that can be generated once for several specs.
+
+    A shared model is common when at least two specs generate it, every spec that has a model with that name generates
+    identical code for it, and everything it references is common too.
+
+    Args:
+        spec_models: The generated models of each spec, as returned by `parse_openapi_to_swift`
+
+    Returns:
+        dict[str, dict[str, Any]]: The common models by name
+    """
+    candidates: dict[str, dict[str, Any]] = {}
+    spec_counts: dict[str, int] = defaultdict(int)
+    conflicts: set[str] = set()
+    for swift_models in spec_models:
+        for model_name, model_data in swift_models.items():
+            spec_counts[model_name] += 1
+            candidate = candidates.setdefault(model_name, model_data)
+            if model_data["type"] != "shared" or model_data.get("code") != candidate.get("code"):
+                conflicts.add(model_name)
+
+    common = {
+        model_name: model_data
+        for model_name, model_data in candidates.items()
+        if spec_counts[model_name] > 1 and model_name not in conflicts
+    }
+
+    # A common model can't reference a model that each spec generates on its own
+    changed = True
+    while changed:
+        changed = False
+        for model_name, model_data in list(common.items()):
+            if not all(reference in common for reference in model_data.get("references", [])):
+                del common[model_name]
+                changed = True
+    return common
+
+
+# Each worker process keeps its own cache across the entries it generates
+_worker_cache: Optional[GenerationCache] = None
+
+
+def _worker_cache_instance() -> GenerationCache:
+    global _worker_cache
+    if _worker_cache is None:
+        _worker_cache = GenerationCache()
+    return _worker_cache
+
+
+def _generate_batch_entry_in_worker(entry: BatchEntry) -> BatchResult:
+    return generate_batch_entry(entry, _worker_cache_instance())
+
+
+def _generate_public_models_in_worker(entry: BatchEntry) -> tuple[BatchResult, Optional[dict[str, Any]]]:
+    return _generate_models(entry, _worker_cache_instance(), public=True)
+
+
+def generate_batch(manifest: BatchManifest, workers: Optional[int] = None) -> list[BatchResult]:
+    """
+    Generates the models for every spec of a manifest in this process, or across a pool of worker processes.
+
+    Parsed specs and generated models are cached across specs, so interpreter start-up, pydantic model building and
+    models shared between specs are paid once (per worker) rather than once per spec.
+
+    With `shared_output`, shared schemas that several specs generate identically are written once to that directory
+    instead of to each spec's output, so the app compiles them once. The shared output is meant to be its own Swift
+    module named `shared_module`: every model is generated public and each spec's files import that module. Shared
+    schemas the specs disagree on stay in each spec's output, which are separate modules, so their copies don't clash.
+    If no model is common to several specs, the shared output isn't written and nothing imports it.
+
+    Args:
+        manifest: The specs to generate
+        workers: Number of worker processes; None or 1 generates everything in this process
+
+    Returns:
+        list[BatchResult]: The result of each entry, in manifest order
+    """
+    in_process = workers is None or workers <= 1 or len(manifest.specs) <= 1
+    if manifest.shared_output is None:
+        if in_process:
+            cache = GenerationCache()
+            return [generate_batch_entry(entry, cache) for entry in manifest.specs]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_generate_batch_entry_in_worker, manifest.specs))
+
+    if any(entry.swift_package for entry in manifest.specs):
+        raise ValueError("shared_output can't be combined with swift_package entries")
+
+    # Generate every spec before writing anything, since common models are only known once all specs are generated
+    if in_process:
+        cache = GenerationCache()
+        generated = [_generate_models(entry, cache, public=True) for entry in manifest.specs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            generated = list(executor.map(_generate_public_models_in_worker, manifest.specs))
+
+    common = find_common_models([swift_models for _, swift_models in generated if swift_models is not None])
+    # Without common models there's no shared module to write or import
+    imports = [manifest.shared_module] if common else []
+    if common:
+        write_swift_files(common, manifest.shared_output)
+
+    results = []
+    for entry, (result, swift_models) in zip(manifest.specs, generated):
+        if swift_models is not None:
+            result.shared_count = sum(1 for model_name in swift_models if model_name in common)
+            own_models = {k: v for k, v in swift_models.items() if k not in common}
+            _write_models(entry, own_models, result, imports=imports)
+        results.append(result)
+    return results
+
+
+def print_batch_summary(results: list[BatchResult]) -> None:
+    """Prints one line per spec and the totals of a batch."""
+    print(f"Generated {len(results)} specs:")
+    for result in results:
+        if result.error is not None:
+            print(f"  - {result.openapi}: FAILED {result.error}")
+        else:
+            print(
+                f"  - {result.openapi}: {result.model_count} models, {result.file_count} files, "
+                f"{result.cache_hits} cached, {result.shared_count} from shared output, {result.seconds:.2f}s"
+            )
+    failed = sum(1 for result in results if result.error is not None)
+    total_seconds = sum(result.seconds for result in results)
+    print(f"Total: {len(results) - failed} succeeded, {failed} failed, {total_seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    import argparse
+    import logging
+    import sys
+
+    parser = argparse.ArgumentParser(description="Generate Swift models for every spec in a manifest")
+    parser.add_argument("manifest", help="Path to a JSON or YAML manifest with a list of specs and their options")
+    parser.add_argument("--workers", type=int, help="Number of worker processes (default: generate in this process)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    results = generate_batch(load_batch_manifest(args.manifest), args.workers)
+    print_batch_summary(results)
+    sys.exit(1 if any(result.error is not None for result in results) else 0)
@@ -0,0 +1,106 @@
+import json
+from collections import defaultdict
+from typing import Any, Collection, Optional
+
+from pydantic import BaseModel
+
+from src.openapi.OpenAPISpec import OpenAPISpec
+from src.openapi.RefResolver import SCHEMA_REF_PREFIX, escape_json_pointer_token, schema_name_from_ref
+
+# Annotation keywords that don't change the shape of a schema, ignored when comparing schemas
+_METADATA_KEYWORDS = {"title", "description", "example", "examples", "$comment", "deprecated"}
+
+# Keywords whose value maps arbitrary names (not keywords) to subschemas
+_SCHEMA_MAP_KEYWORDS = {"properties", "patternProperties", "dependentSchemas", "$defs"}
+
+
+class SchemaDeduplication(BaseModel):
+    """The result of structurally deduplicating the schemas of a spec."""
+
+    aliases: dict[str, str]
+    schema_count: int
+
+    @property
+    def canonical_count(self) -> int:
+        """The number of canonical schemas that duplicates were collapsed into."""
+        return len(set(self.aliases.values()))
+
+    def summary(self) -> str:
+        """Returns a one-line report of how much was collapsed."""
+        return (
+            f"Deduplicated {len(self.aliases)} of {self.schema_count} schemas into {self.canonical_count} canonical schemas"
+        )
+
+
+def _strip_metadata(node: Any) -> Any:
+    """Returns a dumped schema without annotation keywords, recursing through subschemas."""
+    if isinstance(node, list):
+        return [_strip_metadata(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+
+    stripped = {}
+    for key, value in node.items():
+        if key in _METADATA_KEYWORDS:
+            continue
+        if key in _SCHEMA_MAP_KEYWORDS and isinstance(value, dict):
+            stripped[key] = {name: _strip_metadata(subschema) for name, subschema in value.items()}
+        elif key in ("enum", "const", "default", "required"):
+            stripped[key] = value
+        else:
+            stripped[key] = _strip_metadata(value)
+    return stripped
+
+
+def _rewrite_refs(node: Any, canonical: dict[str, str]) -> Any:
+    """Returns a stripped schema with references to schemas replaced by references to their canonical schema."""
+    if isinstance(node, list):
+        return [_rewrite_refs(item, canonical) for item in node]
+    if not isinstance(node, dict):
+        return node
+
+    rewritten = {key: _rewrite_refs(value, canonical) for key, value in node.items()}
+    ref = node.get("$ref")
+    ref_name = schema_name_from_ref(ref) if isinstance(ref, str) else None
+    if ref_name is not None:
+        rewritten["$ref"] = SCHEMA_REF_PREFIX + escape_json_pointer_token(canonical.get(ref_name, ref_name))
+    return rewritten
+
+
+def deduplicate_schemas(openapi: OpenAPISpec, schema_names: Optional[Collection[str]] = None) -> SchemaDeduplication:
+    """
+    Finds schemas that are structurally identical and picks a canonical representative for each set of duplicates.
+
+    Schemas are compared after dropping annotations (titles, descriptions, examples) and after resolving references
+    to their canonical schema, so schemas that only differ in which duplicate they reference also collapse. This is
+    repeated until no more schemas collapse. The first schema of each set in spec order is the representative.
+
+    Args:
+        openapi: The OpenAPI spec
+        schema_names: Only deduplicate these schemas; defaults to all schemas
+
+    Returns:
+        SchemaDeduplication: The canonical schema name for each duplicate schema
+    """
+    names = [name for name in openapi.schemas if schema_names is None or name in schema_names]
+    stripped = {
+        name: _strip_metadata(openapi.schemas[name].model_dump(mode="json", by_alias=True, exclude_none=True))
+        for name in names
+    }
+
+    canonical = {name: name for name in names}
+    while True:
+        representatives: dict[str, str] = {}
+        duplicates_of: dict[str, list[str]] = defaultdict(list)
+        for name in names:
+            key = json.dumps(_rewrite_refs(stripped[name], canonical), sort_keys=True)
+            representative = representatives.setdefault(key, name)
+            duplicates_of[representative].append(name)
+
+        new_canonical = {name: representative for representative, group in duplicates_of.items() for name in group}
+        if new_canonical == canonical:
+            break
+        canonical = new_canonical
+
+    aliases = {name: representative for name, representative in canonical.items() if name != representative}
+    return SchemaDeduplication(aliases=aliases, schema_count=len(names))
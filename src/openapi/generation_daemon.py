@@ -0,0 +1,254 @@
+import hashlib
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import tempfile
+import time
+from collections import OrderedDict
+from contextlib import redirect_stdout
+from typing import Any, Iterable, Optional
+
+from src.openapi.batch_generate import BatchEntry, BatchResult, generate_batch_entry, generate_entry_models
+from src.openapi.GenerationCache import GenerationCache
+from src.openapi.parse_openapi_to_swift import write_swift_files, write_swift_package
+
+# Seconds a client waits for the daemon before giving up
+DEFAULT_CLIENT_TIMEOUT = 60.0
+
+# Number of generated spec outputs kept before the least recently used ones are evicted
+DEFAULT_MAX_CACHED_OUTPUTS = 64
+
+
+def default_socket_path() -> str:
+    """
+    Returns the per-user path of the daemon's Unix socket.
+
+    The socket lives in `$XDG_RUNTIME_DIR` when it's set, or else in a per-user directory in the temporary directory
+    that only the user can access, since anyone who can connect can make the daemon replace any output directory.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    socket_dir = runtime_dir or os.path.join(tempfile.gettempdir(), f"swift-generator-{os.getuid()}")
+    return os.path.join(socket_dir, "swift-generator.sock")
+
+
+def _check_owner(path: str) -> None:
+    """Raises an error if a path exists and belongs to another user."""
+    try:
+        owner = os.lstat(path).st_uid
+    except FileNotFoundError:
+        return
+    if owner != os.getuid():
+        raise RuntimeError(f"{path} is owned by another user")
+
+
+def _ensure_private_dir(path: str) -> None:
+    """Creates a directory only the user can access, raising an error if it exists and others can access it."""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    _check_owner(path)
+    mode = os.lstat(path).st_mode
+    if not stat.S_ISDIR(mode) or mode & 0o077:
+        raise RuntimeError(f"{path} must be a directory only its owner can access")
+
+
+def _documents_digest(documents: Iterable[str]) -> str:
+    """Returns a hash of the paths and contents of the files a spec was loaded from."""
+    digest = hashlib.sha256()
+    for path in documents:
+        with open(path, "rb") as file:
+            digest.update(path.encode("utf-8") + b"\0" + hashlib.sha256(file.read()).digest())
+    return digest.hexdigest()
+
+
+class GenerationDaemon:
+    """
+    Serves generate and write requests from warm caches.
+
+    Parsed specs and generated models are kept in a `GenerationCache`, and the generated output of each spec is kept
+    per spec path and options until the contents (by hash) of the spec or of any file its references point to change,
+    so repeated requests for an unchanged spec skip parsing and generation entirely. Outputs of a changed spec are
+    dropped, and at most `max_outputs` outputs are kept.
+    """
+
+    def __init__(self, max_outputs: int = DEFAULT_MAX_CACHED_OUTPUTS) -> None:
+        self.cache = GenerationCache()
+        self.stopped = False
+        self.max_outputs = max_outputs
+        self._outputs: OrderedDict[tuple[str, str], tuple[str, dict[str, Any]]] = OrderedDict()
+
+    def generate(self, entry: BatchEntry) -> tuple[dict[str, Any], bool]:
+        """Returns the generated models for an entry and whether they were served from the cache."""
+        openapi = self.cache.load_spec(entry.openapi)
+        digest = _documents_digest(openapi.documents)
+        key = (os.path.abspath(entry.openapi), entry.model_dump_json(exclude={"openapi", "output"}))
+        cached = self._outputs.get(key)
+        if cached is not None and cached[0] == digest:
+            self._outputs.move_to_end(key)
+            return cached[1], True
+
+        swift_models = generate_entry_models(entry, self.cache)
+        # Outputs generated with other options from an older version of the spec won't be served again
+        for outdated_key in [k for k, (d, _) in self._outputs.items() if k[0] == key[0] and d != digest]:
+            del self._outputs[outdated_key]
+        self._outputs[key] = (digest, swift_models)
+        self._outputs.move_to_end(key)
+        while len(self._outputs) > self.max_outputs:
+            self._outputs.popitem(last=False)
+        return swift_models, False
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Handles one request, returning the response to send back."""
+        command = request.get("command")
+        if command == "ping":
+            return {"ok": True}
+        if command == "stop":
+            self.stopped = True
+            return {"ok": True}
+        if command not in ("generate", "write"):
+            return {"ok": False, "error": f"Unknown command: {command}"}
+
+        start = time.perf_counter()
+        output = io.StringIO()
+        try:
+            entry = BatchEntry.model_validate(request["entry"])
+            with redirect_stdout(output):
+                swift_models, cached = self.generate(entry)
+                response: dict[str, Any] = {"ok": True, "cached": cached}
+                if command == "generate":
+                    response["swift_models"] = swift_models
+                elif entry.swift_package:
+                    response["file_count"] = write_swift_package(
+                        swift_models, entry.output, entry.swift_package, entry.min_target_schemas
+                    )
+                else:
+                    response["file_count"] = write_swift_files(
+                        swift_models, entry.output, entry.max_models_per_file, entry.max_bytes_per_file, entry.single_file
+                    )
+        except Exception as e:
+            response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        response["output"] = output.getvalue()
+        response["seconds"] = time.perf_counter() - start
+        return response
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: "_DaemonServer"
+
+    def handle(self) -> None:
+        request = json.loads(self.rfile.readline())
+        response = self.server.daemon.handle(request)
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class _DaemonServer(socketserver.UnixStreamServer):
+    def __init__(self, socket_path: str, daemon: GenerationDaemon):
+        self.daemon = daemon
+        self.socket_path = socket_path
+        super().__init__(socket_path, _RequestHandler)
+
+    def server_bind(self) -> None:
+        super().server_bind()
+        # Only the user may connect
+        os.chmod(self.socket_path, 0o600)
+
+
+def serve(socket_path: Optional[str] = None) -> None:
+    """
+    Runs the daemon on a Unix socket until it receives a stop request.
+
+    Requests are handled one at a time, so the caches are never accessed concurrently. The socket is only accessible
+    by the user, and a socket path that belongs to another user is refused.
+    """
+    if socket_path is None:
+        socket_path = default_socket_path()
+        _ensure_private_dir(os.path.dirname(socket_path))
+    _check_owner(socket_path)
+    if os.path.exists(socket_path):
+        if send_request({"command": "ping"}, socket_path) is not None:
+            raise RuntimeError(f"A daemon is already running on {socket_path}")
+        os.remove(socket_path)
+
+    daemon = GenerationDaemon()
+    with _DaemonServer(socket_path, daemon) as server:
+        print(f"Serving on {socket_path}")
+        try:
+            while not daemon.stopped:
+                server.handle_request()
+        finally:
+            os.remove(socket_path)
+
+
+def send_request(
+    request: dict[str, Any], socket_path: Optional[str] = None, timeout: float = DEFAULT_CLIENT_TIMEOUT
+) -> Optional[dict[str, Any]]:
+    """
+    Sends a request to the daemon, returning its response or None if no daemon answered.
+
+    A daemon that doesn't reply within `timeout` seconds, or closes the connection without replying, is treated like
+    one that isn't running, so callers fall back to generating in process. A socket that belongs to another user is
+    refused with an error.
+    """
+    socket_path = socket_path or default_socket_path()
+    _check_owner(socket_path)
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(socket_path)
+            client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with client.makefile("rb") as response:
+                line = response.readline()
+    except OSError:
+        # Also covers timeouts and connections reset by a stopping daemon
+        return None
+    if not line.strip():
+        return None
+    return dict(json.loads(line))
+
+
+def write_with_daemon(entry: BatchEntry, socket_path: Optional[str] = None) -> BatchResult:
+    """Generates and writes the models for an entry through the daemon, or in this process if it isn't running."""
+    # The daemon runs in a different working directory
+    entry = entry.model_copy(update={"openapi": os.path.abspath(entry.openapi), "output": os.path.abspath(entry.output)})
+    response = send_request({"command": "write", "entry": entry.model_dump()}, socket_path)
+    if response is None:
+        return generate_batch_entry(entry, GenerationCache())
+
+    print(response["output"], end="")
+    return BatchResult(
+        openapi=entry.openapi,
+        output=entry.output,
+        file_count=response.get("file_count", 0),
+        seconds=response["seconds"],
+        error=response.get("error"),
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Generate Swift models through a long-running local daemon")
+    parser.add_argument("--socket", help="Path of the daemon's Unix socket")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("serve", help="Run the daemon")
+    subparsers.add_parser("stop", help="Stop the running daemon")
+    write_parser = subparsers.add_parser(
+        "write", help="Generate and write models, in this process if the daemon isn't running"
+    )
+    write_parser.add_argument(
+        "entry", help="JSON object with the spec, output directory and options, as in a batch manifest entry"
+    )
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.socket)
+    elif args.command == "stop":
+        if send_request({"command": "stop"}, args.socket) is None:
+            print("No daemon is running")
+    else:
+        result = write_with_daemon(BatchEntry.model_validate_json(args.entry), args.socket)
+        if result.error is not None:
+            print(result.error, file=sys.stderr)
+            sys.exit(1)
@@ -1,13 +1,38 @@
+import difflib
+import logging
+import os
 import shutil
+import zlib
 from collections import defaultdict
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Collection, Dict, Iterable, Iterator, Literal, Optional, Sequence
 
 from pydantic import BaseModel
 
+from src.openapi.deduplicate_schemas import deduplicate_schemas
+from src.openapi.GenerationCache import GenerationCache
 from src.openapi.OpenAPISpec import OpenAPISpec
-from src.openapi.OpenAPISwiftModelGenerator import OpenAPISwiftModelGenerator
+from src.openapi.OpenAPISwiftModelGenerator import DEFAULT_ENUM_STRUCT_THRESHOLD, OpenAPISwiftModelGenerator
+from src.openapi.RemoteSpecCache import DEFAULT_REMOTE_SPEC_CACHE_DIR, RemoteSpecCache, is_remote_spec
 from src.openapi.schemas.Schema import Schema
 
+logger = logging.getLogger(__name__)
+
+# Root groups with at least this many schemas get a Swift target of their own in package output
+DEFAULT_MIN_TARGET_SCHEMAS = 8
+
+# File that all models are written to when bundling into a single file
+SINGLE_FILE_NAME = "GeneratedModels.swift"
+
+# Typical size of a small model's code, used to pick shard boundaries when bundling by size only
+BUNDLE_ASSUMED_MODEL_BYTES = 1024
+
+# Number of threads writing generated files at the same time
+DEFAULT_WRITE_WORKERS = 8
+
+# Bytes read at a time when comparing planned files with the files on disk
+PLAN_CHUNK_BYTES = 64 * 1024
+
 
 class SchemaGroup(BaseModel):
     root_schema_name: str
@@ -21,45 +46,66 @@ class SchemasGroupedByDeps(BaseModel):
     shared_schemas: dict[str, Schema]
 
 
-def group_schemas_by_deps(openapi: OpenAPISpec) -> SchemasGroupedByDeps:
-    # For each schema, get the names of the schemas that reference it
+class PlannedChange(BaseModel):
+    # Path relative to the output directory
+    path: str
+    status: Literal["added", "modified", "removed"]
+    lines_added: int = 0
+    lines_removed: int = 0
+
+
+class SchemaNameGroup(BaseModel):
+    root_schema_name: str
+    # The reference depth of every schema in the group, in the order they were added
+    ref_levels: dict[str, int]
+
+
+class SchemaNamesGroupedByDeps(BaseModel):
+    schema_groups: list[SchemaNameGroup]
+    shared_schema_names: list[str]
+
+
+def group_schema_names_by_deps(
+    openapi: OpenAPISpec, schema_names: Optional[Collection[str]] = None
+) -> SchemaNamesGroupedByDeps:
+    """Groups schemas like `group_schemas_by_deps`, but only keeps the schema names instead of copies of the schemas."""
+    # Restrict grouping to a subset of schemas, which must include everything they reference
+    schemas = openapi.schemas
+    if schema_names is not None:
+        schemas = {k: v for k, v in schemas.items() if k in schema_names}
+
+    # For each schema, get the names of the schemas it references and the names of the schemas that reference it
+    references = {schema_name: schema.get_references() for schema_name, schema in schemas.items()}
     referenced_by = defaultdict(set)
-    for schema_name, schema in openapi.schemas.items():
-        for reference in schema.get_references():
+    for schema_name, schema_references in references.items():
+        for reference in schema_references:
             referenced_by[reference].add(schema_name)
 
-    # Get the schema_name, schema pairs for all schemas that are not referenced by any other schema
-    root_schemas = [x for x in openapi.schemas.items() if x[0] not in referenced_by]
+    # Get the names of all schemas that are not referenced by any other schema
+    root_schema_names = [x for x in schemas if x not in referenced_by]
 
-    schema_groups: list[SchemaGroup] = []
-    for root_schema_name, root_schema in root_schemas:
-        schema_group = SchemaGroup(
-            root_schema_name=root_schema_name,
-            root_schema=root_schema,
-            ref_levels={root_schema_name: 0},
-            schemas={root_schema_name: root_schema},
-        )
-        references_to_check = set(root_schema.get_references())
+    schema_groups: list[SchemaNameGroup] = []
+    for root_schema_name in root_schema_names:
+        ref_levels = {root_schema_name: 0}
+        references_to_check = set(references[root_schema_name])
         references_checked: set[str] = set(root_schema_name)
 
         while not all(referenced_schema_name in references_checked for referenced_schema_name in references_to_check):
             referenced_schema_name = references_to_check.pop()
 
             # Skip if we've already checked this schema or it's already in the group
-            if referenced_schema_name in references_checked or referenced_schema_name in schema_group.schemas:
+            if referenced_schema_name in references_checked or referenced_schema_name in ref_levels:
                 continue
 
             # Get the referenced schema
-            referenced_schema = openapi.schemas.get(referenced_schema_name)
-            if not referenced_schema:
+            if referenced_schema_name not in schemas:
                 raise ValueError(f"Could not find schema: {referenced_schema_name}")
 
-            if all(name in schema_group.schemas for name in referenced_by[referenced_schema_name]):
-                schema_group.schemas[referenced_schema_name] = referenced_schema
-                cur_level = max(schema_group.ref_levels[name] for name in referenced_by[referenced_schema_name])
-                schema_group.ref_levels[referenced_schema_name] = cur_level + 1
-                for reference in referenced_schema.get_references():
-                    if reference not in schema_group.schemas:
+            if all(name in ref_levels for name in referenced_by[referenced_schema_name]):
+                cur_level = max(ref_levels[name] for name in referenced_by[referenced_schema_name])
+                ref_levels[referenced_schema_name] = cur_level + 1
+                for reference in references[referenced_schema_name]:
+                    if reference not in ref_levels:
                         references_to_check.add(reference)
 
                 # Reset the references checked set to recheck if references might be now all in the group
@@ -67,47 +113,312 @@ def group_schemas_by_deps(openapi: OpenAPISpec) -> SchemasGroupedByDeps:
 
             references_checked.add(referenced_schema_name)
 
-        schema_groups.append(schema_group)
+        schema_groups.append(SchemaNameGroup(root_schema_name=root_schema_name, ref_levels=ref_levels))
 
     all_schemas_in_groups: set[str] = set()
     for schema_group in schema_groups:
-        all_schemas_in_groups.add(schema_group.root_schema_name)
-        all_schemas_in_groups.update(schema_group.schemas.keys())
-    shared_schemas = {k: v for k, v in openapi.schemas.items() if k not in all_schemas_in_groups}
+        all_schemas_in_groups.update(schema_group.ref_levels)
+    shared_schema_names = [k for k in schemas if k not in all_schemas_in_groups]
+
+    return SchemaNamesGroupedByDeps(schema_groups=schema_groups, shared_schema_names=shared_schema_names)
+
 
+def group_schemas_by_deps(openapi: OpenAPISpec, schema_names: Optional[Collection[str]] = None) -> SchemasGroupedByDeps:
+    grouped_names = group_schema_names_by_deps(openapi, schema_names)
+    schemas = openapi.schemas
+    schema_groups = [
+        SchemaGroup(
+            root_schema_name=group.root_schema_name,
+            root_schema=schemas[group.root_schema_name],
+            ref_levels=group.ref_levels,
+            schemas={name: schemas[name] for name in group.ref_levels},
+        )
+        for group in grouped_names.schema_groups
+    ]
+    shared_schemas = {name: schemas[name] for name in grouped_names.shared_schema_names}
     return SchemasGroupedByDeps(schema_groups=schema_groups, shared_schemas=shared_schemas)
 
 
-def parse_openapi_to_swift(filepath: Optional[str] = None, spec_dict: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+def parse_openapi_to_swift(
+    filepath: Optional[str] = None,
+    spec_dict: Optional[Dict[str, Any]] = None,
+    include_importers: bool = False,
+    identity_equality: bool = False,
+    enum_struct_threshold: Optional[int] = DEFAULT_ENUM_STRUCT_THRESHOLD,
+    access_modifier: Optional[str] = None,
+    path_prefixes: Optional[Collection[str]] = None,
+    tags: Optional[Collection[str]] = None,
+    operation_ids: Optional[Collection[str]] = None,
+    deduplicate: bool = False,
+    cache: Optional[GenerationCache] = None,
+    openapi: Optional[OpenAPISpec] = None,
+) -> Dict[str, Any]:
     """
     Parses an OpenAPI JSON file and generates Swift models.
 
     Args:
         filepath: Path to the OpenAPI JSON file
         spec_dict: The OpenAPI spec as a dictionary
+        include_importers: Whether to append a background `@ModelActor` importer to each root group
+        identity_equality: Whether DTOs with an identifying property hash and compare by that property only
+        enum_struct_threshold: String enums with more values than this become `RawRepresentable` structs
+        access_modifier: Access modifier for generated declarations, e.g. "public" for a separate Swift module
+        path_prefixes: Only generate schemas reachable from operations under one of these path prefixes
+        tags: Only generate schemas reachable from operations with one of these tags
+        operation_ids: Only generate schemas reachable from operations with one of these operation IDs
+        deduplicate: Whether to generate structurally identical schemas once, with typealiases for the duplicates
+        cache: Cache of parsed specs and generated models to reuse across calls
+        openapi: An already loaded spec, used instead of `filepath` and `spec_dict`
 
     Returns:
-        Dict[str, Any]: A dictionary of schema names, their Swift code, and metadata.
+        Dict[str, Any]: A dictionary of schema names, their Swift code, and metadata. The metadata lists the
+            schemas defined by each entry and the schemas it references from other entries.
     """
-    openapi = OpenAPISpec(filepath=filepath, spec_dict=spec_dict)
-    swift_model_generator = OpenAPISwiftModelGenerator(openapi)
+    return dict(
+        iter_swift_models(
+            filepath=filepath,
+            spec_dict=spec_dict,
+            include_importers=include_importers,
+            identity_equality=identity_equality,
+            enum_struct_threshold=enum_struct_threshold,
+            access_modifier=access_modifier,
+            path_prefixes=path_prefixes,
+            tags=tags,
+            operation_ids=operation_ids,
+            deduplicate=deduplicate,
+            cache=cache,
+            openapi=openapi,
+        )
+    )
+
+
+def iter_swift_models(
+    filepath: Optional[str] = None,
+    spec_dict: Optional[Dict[str, Any]] = None,
+    include_importers: bool = False,
+    identity_equality: bool = False,
+    enum_struct_threshold: Optional[int] = DEFAULT_ENUM_STRUCT_THRESHOLD,
+    access_modifier: Optional[str] = None,
+    path_prefixes: Optional[Collection[str]] = None,
+    tags: Optional[Collection[str]] = None,
+    operation_ids: Optional[Collection[str]] = None,
+    deduplicate: bool = False,
+    cache: Optional[GenerationCache] = None,
+    openapi: Optional[OpenAPISpec] = None,
+) -> Iterator[tuple[str, Dict[str, Any]]]:
+    """
+    Generates the same entries as `parse_openapi_to_swift`, one at a time.
+
+    Each entry's code is only generated when the entry is requested, so callers that write and drop entries as they go
+    never hold the generated code of the whole spec at once. See `parse_openapi_to_swift` for the arguments.
+
+    Yields:
+        tuple[str, Dict[str, Any]]: The entry name and its Swift code and metadata
+    """
+    if openapi is None and cache is not None and filepath is not None:
+        openapi = cache.load_spec(filepath)
+    elif openapi is None:
+        openapi = OpenAPISpec(filepath=filepath, spec_dict=spec_dict)
+
+    # Tree-shake down to the schemas reachable from the selected operations
+    schema_names = None
+    if path_prefixes is not None or tags is not None or operation_ids is not None:
+        schema_names = openapi.get_reachable_schemas(openapi.get_operation_schemas(path_prefixes, tags, operation_ids))
+
+    # Collapse structurally identical schemas into typealiases of a canonical schema
+    schema_aliases: dict[str, str] = {}
+    if deduplicate:
+        deduplication = deduplicate_schemas(openapi, schema_names)
+        schema_aliases = deduplication.aliases
+        logger.info(deduplication.summary())
+
+    swift_model_generator = OpenAPISwiftModelGenerator(
+        openapi,
+        identity_equality=identity_equality,
+        enum_struct_threshold=enum_struct_threshold,
+        access_modifier=access_modifier,
+        schema_aliases=schema_aliases,
+        cache=cache,
+    )
 
     # Get the schema hierarchy
-    schema_groups = group_schemas_by_deps(openapi)
+    schema_groups = group_schema_names_by_deps(openapi, schema_names)
+
+    # Every DTO conforms to `GeneratedCodable`, so all entries depend on the shared coding support when it exists
+    support_references = ["GeneratedCoding"] if swift_model_generator.shared_coding else []
+    # Free-form objects are decoded into the shared `JSONValue` type
+    if swift_model_generator.uses_json_value:
+        support_references.append("JSONValue")
+
+    def _external_references(schema_names: list[str]) -> list[str]:
+        references = {ref for name in schema_names for ref in openapi.schemas[name].get_references()}
+        references.update(schema_aliases[name] for name in schema_names if name in schema_aliases)
+        return sorted(references - set(schema_names)) + support_references
 
     # Generate Swift models with metadata
-    swift_models = {}
     for schema_group in schema_groups.schema_groups:
-        schemas_ordered = sorted(schema_group.schemas.keys(), key=lambda x: schema_group.ref_levels[x])
+        ref_levels = schema_group.ref_levels
+        # Schemas on the same level are ordered by name, so regenerating an unchanged spec gives identical files
+        schemas_ordered = sorted(ref_levels, key=lambda x: (ref_levels[x], x))
         code = "\n\n".join(swift_model_generator.generate_model(schema_name) for schema_name in schemas_ordered)
-        swift_models[schema_group.root_schema_name] = {"type": "root", "code": code}
-    for schema_name in schema_groups.shared_schemas:
-        swift_models[schema_name] = {"type": "shared", "code": swift_model_generator.generate_model(schema_name)}
+        if include_importers:
+            importer_code = swift_model_generator.generate_importer(schema_group.root_schema_name, schemas_ordered)
+            if importer_code is not None:
+                code = f"{code}\n\n{importer_code}"
+        yield (
+            schema_group.root_schema_name,
+            {"type": "root", "code": code, "schemas": schemas_ordered, "references": _external_references(schemas_ordered)},
+        )
+    for schema_name in schema_groups.shared_schema_names:
+        yield (
+            schema_name,
+            {
+                "type": "shared",
+                "code": swift_model_generator.generate_model(schema_name),
+                "schemas": [schema_name],
+                "references": _external_references([schema_name]),
+            },
+        )
+    if swift_model_generator.shared_coding:
+        yield (
+            "GeneratedCoding",
+            {
+                "type": "shared",
+                "code": swift_model_generator.generate_coding_support(),
+                "schemas": ["GeneratedCoding"],
+                "references": [],
+            },
+        )
+    if swift_model_generator.uses_json_value:
+        yield (
+            "JSONValue",
+            {
+                "type": "shared",
+                "code": swift_model_generator.generate_json_value_support(),
+                "schemas": ["JSONValue"],
+                "references": [],
+            },
+        )
+
+
+def _swift_file_contents(model_code: str, imports: Sequence[str] = ()) -> str:
+    """Returns the full contents of a generated Swift file: the header, the imports and the model code."""
+    header = ["//", "// Generated code - do not modify", "//", "", "import Foundation", "import SwiftData"]
+    header.extend(f"import {module}" for module in imports)
+    return "\n".join(header) + "\n\n" + model_code + "\n"
+
+
+def _bundle_entries(
+    entries: list[tuple[str, str]], max_models_per_file: Optional[int], max_bytes_per_file: Optional[int]
+) -> list[tuple[str, list[str]]]:
+    """
+    Packs (model name, code) entries into shards, returning each shard's file stem and its codes.
 
-    return swift_models
+    Shard boundaries are content-defined: entries are sorted by name and a shard ends after any entry whose name hashes
+    to a boundary (once the shard holds a minimum number of models), or when a size limit is reached. Adding or
+    removing a model therefore only changes the shard it falls into rather than shifting every later shard, which
+    keeps incremental Swift builds stable across runs.
+    """
+    # Expected shard size is half of the limit, so most shards end on a hash boundary rather than a hard limit
+    if max_models_per_file is not None:
+        boundary_divisor = max(2, max_models_per_file // 2)
+    else:
+        boundary_divisor = max(2, (max_bytes_per_file or 0) // (2 * BUNDLE_ASSUMED_MODEL_BYTES))
+
+    shards: list[tuple[str, list[str]]] = []
+    shard_names: list[str] = []
+    shard_codes: list[str] = []
+    shard_bytes = 0
+
+    def _close_shard() -> None:
+        nonlocal shard_names, shard_codes, shard_bytes
+        if shard_names:
+            # Single models keep their own file name; bundles are named after their first model
+            stem = shard_names[0] if len(shard_names) == 1 else f"{shard_names[0]}+Bundle"
+            shards.append((stem, shard_codes))
+        shard_names, shard_codes, shard_bytes = [], [], 0
+
+    for model_name, model_code in sorted(entries):
+        code_bytes = len(model_code.encode("utf-8"))
+        # Models over the byte limit, and models that would push the current shard over it, start a new shard
+        if max_bytes_per_file is not None and shard_names and shard_bytes + code_bytes > max_bytes_per_file:
+            _close_shard()
+
+        shard_names.append(model_name)
+        shard_codes.append(model_code)
+        shard_bytes += code_bytes
+
+        at_model_limit = max_models_per_file is not None and len(shard_names) >= max_models_per_file
+        at_byte_limit = max_bytes_per_file is not None and shard_bytes >= max_bytes_per_file
+        at_boundary = (
+            len(shard_names) >= boundary_divisor // 2 and zlib.crc32(model_name.encode("utf-8")) % boundary_divisor == 0
+        )
+        if at_model_limit or at_byte_limit or at_boundary:
+            _close_shard()
+
+    _close_shard()
+    return shards
+
+
+def plan_swift_files(
+    swift_models: Dict[str, Any],
+    max_models_per_file: Optional[int] = None,
+    max_bytes_per_file: Optional[int] = None,
+    single_file: bool = False,
+    imports: Sequence[str] = (),
+) -> dict[str, str]:
+    """
+    Lays out the generated Swift models as files without writing anything.
+
+    By default each root group and each shared schema gets its own file in the `Root` or `Shared` subfolder. With
+    `max_models_per_file` or `max_bytes_per_file`, small models in each subfolder are packed into deterministic shard
+    files to cut the Swift compiler's per-file overhead, and `single_file` amalgamates everything into one file.
+
+    Args:
+        swift_models: Dictionary of schema names with their Swift code and metadata
+        max_models_per_file: Maximum number of models bundled into one file
+        max_bytes_per_file: Maximum size of the model code bundled into one file
+        single_file: Whether to write all models into a single file
+        imports: Modules every file imports besides Foundation and SwiftData, e.g. a module of shared models
 
+    Returns:
+        dict[str, str]: File contents keyed by path relative to the output directory
+    """
+    # Group the model code by subfolder
+    categories: dict[str, list[tuple[str, str]]] = {"Root": [], "Shared": []}
+    for model_name, model_data in swift_models.items():
+        if "code" not in model_data:
+            continue  # Skip models that were marked for inlining
 
-def write_swift_files(swift_models: Dict[str, Any], output_dir: str) -> None:
+        category = "Root" if model_data["type"] == "root" else "Shared"
+        categories[category].append((model_name, model_data["code"]))
+
+    if single_file:
+        model_codes = [code for category in categories.values() for _, code in sorted(category)]
+        return {SINGLE_FILE_NAME: _swift_file_contents("\n\n".join(model_codes), imports)}
+
+    files: dict[str, str] = {}
+    for category, entries in categories.items():
+        if max_models_per_file is None and max_bytes_per_file is None:
+            shards = [(model_name, [model_code]) for model_name, model_code in entries]
+        else:
+            shards = _bundle_entries(entries, max_models_per_file, max_bytes_per_file)
+        for stem, model_codes in shards:
+            files[os.path.join(category, f"{stem}.swift")] = _swift_file_contents("\n\n".join(model_codes), imports)
+
+    return files
+
+
+def write_swift_files(
+    swift_models: Dict[str, Any],
+    output_dir: str,
+    max_models_per_file: Optional[int] = None,
+    max_bytes_per_file: Optional[int] = None,
+    single_file: bool = False,
+    write_workers: int = DEFAULT_WRITE_WORKERS,
+    fsync: bool = False,
+    imports: Sequence[str] = (),
+) -> int:
     """
     Writes the generated Swift models to separate files in the output directory,
     organizing them into subfolders based on OpenAPI schema semantics.
@@ -115,9 +426,179 @@ def write_swift_files(swift_models: Dict[str, Any], output_dir: str) -> None:
     Args:
         swift_models: Dictionary of schema names with their Swift code and metadata
         output_dir: Directory to write the files to
+        max_models_per_file: Maximum number of models bundled into one file, see `plan_swift_files`
+        max_bytes_per_file: Maximum size of the model code bundled into one file, see `plan_swift_files`
+        single_file: Whether to write all models into a single file
+        write_workers: Number of threads writing files, see `write_files`
+        fsync: Whether to fsync every file before returning
+        imports: Modules every file imports, see `plan_swift_files`
+
+    Returns:
+        int: The number of files written
+    """
+    files = plan_swift_files(swift_models, max_models_per_file, max_bytes_per_file, single_file, imports)
+    prepare_output_dir(output_dir, single_file)
+    write_files(output_dir, files, write_workers, fsync)
+    print_files_summary(output_dir, files)
+    return len(files)
+
+
+def write_swift_files_streaming(entries: Iterable[tuple[str, Dict[str, Any]]], output_dir: str, fsync: bool = False) -> int:
+    """
+    Writes generated entries as they are produced, one file per entry in the default `write_swift_files` layout.
+
+    Each entry is written before the next one is requested, so with `iter_swift_models` only one entry's generated code
+    is in memory at a time. This only streams the output: the spec is still loaded and validated in full, and on large
+    specs the validated spec, not the generated code, accounts for most of the peak memory (see
+    `benchmarks/peak_memory.py`). Bundling options aren't supported since they need every entry up front.
+
+    Args:
+        entries: (name, Swift code and metadata) pairs, e.g. from `iter_swift_models`
+        output_dir: Directory to write the files to
+        fsync: Whether to fsync every file
+
+    Returns:
+        int: The number of files written
+    """
+    prepare_output_dir(output_dir)
+
+    relative_paths = []
+    for relative_path, contents in iter_entry_files(entries):
+        write_files(output_dir, {relative_path: contents}, max_workers=1, fsync=fsync)
+        relative_paths.append(relative_path)
+
+    print_files_summary(output_dir, relative_paths)
+    return len(relative_paths)
+
+
+def iter_entry_files(entries: Iterable[tuple[str, Dict[str, Any]]]) -> Iterator[tuple[str, str]]:
+    """Lays out generated entries as they are produced, one file per entry, yielding each file's path and contents."""
+    for model_name, model_data in entries:
+        if "code" not in model_data:
+            continue  # Skip models that were marked for inlining
+
+        category = "Root" if model_data["type"] == "root" else "Shared"
+        yield os.path.join(category, f"{model_name}.swift"), _swift_file_contents(model_data["code"])
+
+
+def iter_planned_changes(files: Iterable[tuple[str, str]], output_dir: str) -> Iterator[PlannedChange]:
+    """
+    Compares files with the output directory, yielding the changes that writing them would make, without writing.
+
+    Each file is compared as soon as it's produced, so with `iter_entry_files` only one file is in memory at a time.
+    Files whose size differs from the file on disk are modified without reading it; files of the same size are read in
+    chunks until the first difference, and only modified files are read whole to count the changed lines. Since
+    writing replaces the output directory, files on disk that aren't among the given files are removed, and are
+    yielded after every given file.
+
+    Args:
+        files: (path relative to the output directory, contents) pairs, e.g. from `plan_swift_files`
+        output_dir: Directory the files would be written to
+
+    Yields:
+        PlannedChange: Every added, modified or removed file; unchanged files are skipped
+    """
+    existing_paths: set[str] = set()
+    for dirpath, _, filenames in os.walk(output_dir):
+        existing_paths.update(os.path.relpath(os.path.join(dirpath, filename), output_dir) for filename in filenames)
+
+    for relative_path, contents in files:
+        relative_path = os.path.normpath(relative_path)
+        path = os.path.join(output_dir, relative_path)
+        if relative_path not in existing_paths:
+            yield PlannedChange(path=relative_path, status="added", lines_added=len(contents.splitlines()))
+            continue
+        existing_paths.discard(relative_path)
+        if _file_matches(path, contents.encode("utf-8")):
+            continue
+        with open(path, "r", encoding="utf-8", errors="replace") as file:
+            lines_added, lines_removed = _line_delta(file.read().splitlines(), contents.splitlines())
+        yield PlannedChange(path=relative_path, status="modified", lines_added=lines_added, lines_removed=lines_removed)
+
+    for relative_path in sorted(existing_paths):
+        with open(os.path.join(output_dir, relative_path), "rb") as file:
+            line_count = sum(1 for _ in file)
+        yield PlannedChange(path=relative_path, status="removed", lines_removed=line_count)
+
+
+def _file_matches(path: str, contents: bytes) -> bool:
+    """Returns whether a file has exactly the given contents, reading it in chunks up to the first difference."""
+    if os.path.getsize(path) != len(contents):
+        return False
+    view = memoryview(contents)
+    offset = 0
+    with open(path, "rb") as file:
+        while chunk := file.read(PLAN_CHUNK_BYTES):
+            if view[offset : offset + len(chunk)] != chunk:
+                return False
+            offset += len(chunk)
+    return True
+
+
+def _line_delta(old_lines: list[str], new_lines: list[str]) -> tuple[int, int]:
+    """Returns the number of lines added and removed between two versions of a file."""
+    lines_added = lines_removed = 0
+    for tag, old_start, old_end, new_start, new_end in difflib.SequenceMatcher(
+        None, old_lines, new_lines, autojunk=False
+    ).get_opcodes():
+        if tag in ("replace", "delete"):
+            lines_removed += old_end - old_start
+        if tag in ("replace", "insert"):
+            lines_added += new_end - new_start
+    return lines_added, lines_removed
+
+
+def print_planned_changes(changes: Iterable[PlannedChange], output_dir: str) -> int:
+    """Prints each planned change as it's produced, then a summary, returning the number of changed files."""
+    counts = {"added": 0, "modified": 0, "removed": 0}
+    print(f"Planned changes in {output_dir}:")
+    for change in changes:
+        counts[change.status] += 1
+        delta = " ".join(
+            f"{sign}{count}" for sign, count in (("+", change.lines_added), ("-", change.lines_removed)) if count
+        )
+        print(f"  {change.status:<8} {change.path} ({delta or 'no line changes'})")
+    print(", ".join(f"{count} {status}" for status, count in counts.items()))
+    return sum(counts.values())
+
+
+def write_files(
+    output_dir: str, files: dict[str, str], max_workers: int = DEFAULT_WRITE_WORKERS, fsync: bool = False
+) -> None:
     """
-    import os
+    Writes files with a bounded pool of threads.
 
+    Every directory is created up front, and each file's contents are encoded once and written with a single call, so
+    on network or encrypted volumes the per-file latency of many small files overlaps instead of adding up.
+
+    Args:
+        output_dir: Directory the file paths are relative to
+        files: File contents keyed by path relative to `output_dir`
+        max_workers: Maximum number of files written at the same time; 1 writes them one after another
+        fsync: Whether to fsync every file, which is slow and rarely needed for generated code
+    """
+    for directory in sorted({os.path.dirname(os.path.join(output_dir, relative_path)) for relative_path in files}):
+        os.makedirs(directory, exist_ok=True)
+
+    def _write(relative_path: str, contents: str) -> None:
+        with open(os.path.join(output_dir, relative_path), "wb") as f:
+            f.write(contents.encode("utf-8"))
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+    if max_workers <= 1:
+        for relative_path, contents in files.items():
+            _write(relative_path, contents)
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Consume the results so a failed write raises here
+        list(executor.map(_write, files.keys(), files.values()))
+
+
+def prepare_output_dir(output_dir: str, single_file: bool = False) -> None:
+    """Replaces the output directory with an empty one, with the `Root` and `Shared` subfolders unless single file."""
     # Delete the output directory if it exists
     if os.path.exists(output_dir):
         shutil.rmtree(output_dir)
@@ -126,65 +607,287 @@ def write_swift_files(swift_models: Dict[str, Any], output_dir: str) -> None:
     os.makedirs(output_dir, exist_ok=True)
 
     # Create subdirectories for different model types
-    root_dir = os.path.join(output_dir, "Root")
-    shared_dir = os.path.join(output_dir, "Shared")
+    if not single_file:
+        os.makedirs(os.path.join(output_dir, "Root"), exist_ok=True)
+        os.makedirs(os.path.join(output_dir, "Shared"), exist_ok=True)
 
-    os.makedirs(root_dir, exist_ok=True)
-    os.makedirs(shared_dir, exist_ok=True)
 
+def print_files_summary(output_dir: str, relative_paths: Collection[str]) -> None:
+    """Prints how many files were written to each subfolder of the output directory."""
     # Category counts
     category_counts = {"Root": 0, "Shared": 0}
-
-    # Create file for each model in the appropriate subdirectory
-    for model_name, model_data in swift_models.items():
-        if "code" not in model_data:
-            continue  # Skip models that were marked for inlining
-
-        model_code = model_data["code"]
-        model_type = model_data["type"]
-
-        # Determine the appropriate directory for this model
-        if model_type == "root":
-            target_dir = root_dir
-            category_counts["Root"] += 1
-        else:
-            target_dir = shared_dir
-            category_counts["Shared"] += 1
-
-        # Create file path
-        file_path = os.path.join(target_dir, f"{model_name}.swift")
-
-        # Write the Swift file
-        with open(file_path, "w") as f:
-            # Add file header
-            header = ["//", "// Generated code - do not modify", "//", "", "import Foundation", "import SwiftData", ""]
-            f.write("\n".join(header))
-            f.write("\n")
-            f.write(model_code)
-            f.write("\n")
+    for relative_path in relative_paths:
+        category = os.path.dirname(relative_path)
+        if category in category_counts:
+            category_counts[category] += 1
 
     # Print summary of generated files
     print(f"Generated Swift files in {output_dir}:")
     for category, count in category_counts.items():
         if count > 0:
             print(f"  - {category}: {count} files")
-    print(f"Total: {sum(category_counts.values())} files")
+    print(f"Total: {len(relative_paths)} files")
+
+
+def write_swift_package(
+    swift_models: Dict[str, Any],
+    output_dir: str,
+    package_name: str = "GeneratedModels",
+    min_target_schemas: int = DEFAULT_MIN_TARGET_SCHEMAS,
+) -> int:
+    """
+    Writes the generated Swift models as a Swift package with one target per large root group, so the Swift compiler
+    can build the generated layer in parallel and only rebuild the targets whose models changed.
+
+    Root groups with at least `min_target_schemas` schemas get a target of their own, smaller root groups share the
+    `package_name` target and shared schemas go into the `<package_name>Shared` target. Target dependencies are derived
+    from the references between the entries. The models should be generated with `access_modifier="public"` so they
+    are visible across targets.
+
+    Args:
+        swift_models: Dictionary of schema names with their Swift code and metadata
+        output_dir: Directory to write the package to
+        package_name: Name of the package, its library product and the target for small root groups
+        min_target_schemas: Minimum number of schemas in a root group for it to get a target of its own
+
+    Returns:
+        int: The number of Swift files written, not counting the manifest
+    """
+    shared_target = f"{package_name}Shared"
+
+    # Assign each entry to a target
+    entry_targets: dict[str, str] = {}
+    for model_name, model_data in swift_models.items():
+        if "code" not in model_data:
+            continue
+        if model_data["type"] != "root":
+            entry_targets[model_name] = shared_target
+        elif len(model_data.get("schemas", [model_name])) >= min_target_schemas:
+            entry_targets[model_name] = f"{model_name}Models"
+        else:
+            entry_targets[model_name] = package_name
+
+    # Derive target dependencies from the schemas each entry references
+    schema_targets = {
+        schema_name: entry_targets[model_name]
+        for model_name, model_data in swift_models.items()
+        if model_name in entry_targets
+        for schema_name in model_data.get("schemas", [model_name])
+    }
+    target_dependencies: dict[str, set[str]] = {}
+    for model_name, target in entry_targets.items():
+        target_dependencies.setdefault(target, set())
+        for reference in swift_models[model_name].get("references", []):
+            if reference not in schema_targets:
+                raise ValueError(f"Could not find schema: {reference}")
+            if schema_targets[reference] != target:
+                target_dependencies[target].add(schema_targets[reference])
+
+    # SwiftPM rejects cyclic target graphs, so fail early with the offending targets
+    visiting: set[str] = set()
+    visited: set[str] = set()
+
+    def _check_acyclic(target: str) -> None:
+        if target in visited:
+            return
+        if target in visiting:
+            raise ValueError(f"Cyclic dependency between generated targets involving {target}")
+        visiting.add(target)
+        for dependency in target_dependencies[target]:
+            _check_acyclic(dependency)
+        visiting.remove(target)
+        visited.add(target)
+
+    for target in target_dependencies:
+        _check_acyclic(target)
+
+    # Delete the output directory if it exists
+    if os.path.exists(output_dir):
+        shutil.rmtree(output_dir)
+
+    files = {
+        os.path.join("Sources", target, f"{model_name}.swift"): _swift_file_contents(
+            swift_models[model_name]["code"], sorted(target_dependencies[target])
+        )
+        for model_name, target in entry_targets.items()
+    }
+
+    # Shared target first, then the remaining targets in a stable order
+    targets = sorted(target_dependencies, key=lambda x: (x != shared_target, x))
+    product_targets = ", ".join(f'"{x}"' for x in targets)
+    manifest = [
+        "// swift-tools-version:5.9",
+        "// Generated code - do not modify",
+        "",
+        "import PackageDescription",
+        "",
+        "let package = Package(",
+        f'    name: "{package_name}",',
+        "    platforms: [.iOS(.v17), .macOS(.v14)],",
+        "    products: [",
+        f'        .library(name: "{package_name}", targets: [{product_targets}]),',
+        "    ],",
+        "    targets: [",
+    ]
+    for target in targets:
+        dependencies = ", ".join(f'"{x}"' for x in sorted(target_dependencies[target]))
+        manifest.append(f'        .target(name: "{target}", dependencies: [{dependencies}], path: "Sources/{target}"),')
+    manifest.extend(["    ]", ")", ""])
+
+    files["Package.swift"] = "\n".join(manifest)
+    write_files(output_dir, files)
+
+    # Print summary of generated targets
+    print(f"Generated Swift package {package_name} in {output_dir}:")
+    for target in targets:
+        file_count = sum(1 for x in entry_targets.values() if x == target)
+        print(f"  - {target}: {file_count} files")
+    print(f"Total: {len(entry_targets)} files in {len(targets)} targets")
+    return len(entry_targets)
 
 
 if __name__ == "__main__":
     import argparse
 
     parser = argparse.ArgumentParser(description="Generate Swift models from OpenAPI spec")
-    parser.add_argument("--openapi", default="src/openapi/__examples/progress.json", help="Path to OpenAPI spec file")
+    parser.add_argument(
+        "--openapi", default="src/openapi/__examples/progress.json", help="Path or HTTP(S) URL of the OpenAPI spec"
+    )
     parser.add_argument(
         "--output",
         default="/Users/spencerbard/code/progress/progress-ios/Progress/Data/Generated",
         help="Output directory for Swift files",
     )
+    parser.add_argument(
+        "--importers", action="store_true", help="Generate a background ModelActor importer for each root group"
+    )
+    parser.add_argument(
+        "--identity-equality",
+        action="store_true",
+        help="Make DTOs with an id property hash and compare by that property only",
+    )
+    parser.add_argument(
+        "--enum-struct-threshold",
+        type=int,
+        default=DEFAULT_ENUM_STRUCT_THRESHOLD,
+        help="Generate string enums with more values than this as RawRepresentable structs",
+    )
+    parser.add_argument(
+        "--swift-package",
+        metavar="NAME",
+        help="Write a Swift package with one target per large root group instead of a single folder of files",
+    )
+    parser.add_argument(
+        "--min-target-schemas",
+        type=int,
+        default=DEFAULT_MIN_TARGET_SCHEMAS,
+        help="Minimum number of schemas in a root group for it to get its own target in --swift-package mode",
+    )
+    parser.add_argument(
+        "--path-prefix", action="append", help="Only generate schemas used by operations under this path prefix"
+    )
+    parser.add_argument("--tag", action="append", help="Only generate schemas used by operations with this tag")
+    parser.add_argument(
+        "--operation-id", action="append", help="Only generate schemas used by the operation with this operationId"
+    )
+    parser.add_argument(
+        "--deduplicate", action="store_true", help="Generate structurally identical schemas once, aliasing the rest"
+    )
+    parser.add_argument("--max-models-per-file", type=int, help="Bundle up to this many small models into one file")
+    parser.add_argument("--max-bytes-per-file", type=int, help="Bundle small models into files of up to this size")
+    parser.add_argument("--single-file", action="store_true", help="Write all models into a single file")
+    parser.add_argument("--write-workers", type=int, default=DEFAULT_WRITE_WORKERS, help="Number of threads writing files")
+    parser.add_argument("--fsync", action="store_true", help="Fsync every written file")
+    parser.add_argument(
+        "--low-memory",
+        action="store_true",
+        help=(
+            "Write each group's file as soon as it's generated instead of holding the generated code of the whole spec; "
+            "the spec is still loaded and validated up front, which dominates peak memory"
+        ),
+    )
+    parser.add_argument(
+        "--intern",
+        action="store_true",
+        help="Share identical strings and inline schemas of the spec to save memory on specs that repeat them a lot",
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Print the files that would be added, modified or removed in the output directory, without writing",
+    )
+    parser.add_argument(
+        "--spec-cache-dir", default=DEFAULT_REMOTE_SPEC_CACHE_DIR, help="Directory remote specs are cached in between runs"
+    )
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.low_memory and (args.swift_package or args.max_models_per_file or args.max_bytes_per_file or args.single_file):
+        parser.error("--low-memory writes one file per group and can't be combined with package or bundling options")
+    if args.plan and args.swift_package:
+        parser.error("--plan can't be combined with --swift-package")
+
+    # Remote specs are only downloaded when they changed, and unchanged specs that were already generated with the
+    # same options (into an output directory that still exists) skip parsing, generating and writing. Plans are always
+    # computed, since the output directory may have changed since it was generated
+    remote_cache = None
+    remote_spec = None
+    spec_path = args.openapi
+    # Options that change how the output is produced, but not the generated files themselves
+    run_options = {"openapi", "plan", "fsync", "write_workers", "low_memory", "intern", "spec_cache_dir"}
+    output_options = {key: value for key, value in vars(args).items() if key not in run_options}
+    if is_remote_spec(args.openapi):
+        remote_cache = RemoteSpecCache(args.spec_cache_dir)
+        remote_spec = remote_cache.fetch(args.openapi)
+        if not args.plan and remote_cache.is_generated(remote_spec, output_options) and os.path.isdir(args.output):
+            print(f"{args.openapi} is not modified, skipping generation")
+            raise SystemExit(0)
+        spec_path = remote_spec.path
+
+    generation_options: dict[str, Any] = dict(
+        filepath=spec_path,
+        include_importers=args.importers,
+        identity_equality=args.identity_equality,
+        enum_struct_threshold=args.enum_struct_threshold,
+        access_modifier="public" if args.swift_package else None,
+        path_prefixes=args.path_prefix,
+        tags=args.tag,
+        operation_ids=args.operation_id,
+        deduplicate=args.deduplicate,
+    )
+    if args.intern:
+        generation_options["openapi"] = OpenAPISpec(filepath=generation_options.pop("filepath"), intern=True)
 
-    # Generate Swift models
-    swift_models = parse_openapi_to_swift(filepath=args.openapi)
+    if args.plan and args.low_memory:
+        # Compare each group as soon as it's generated
+        print_planned_changes(
+            iter_planned_changes(iter_entry_files(iter_swift_models(**generation_options)), args.output), args.output
+        )
+    elif args.plan:
+        planned_files = plan_swift_files(
+            parse_openapi_to_swift(**generation_options),
+            args.max_models_per_file,
+            args.max_bytes_per_file,
+            args.single_file,
+        )
+        print_planned_changes(iter_planned_changes(planned_files.items(), args.output), args.output)
+    elif args.low_memory:
+        # Write each group as soon as it's generated
+        write_swift_files_streaming(iter_swift_models(**generation_options), args.output, args.fsync)
+    elif args.swift_package:
+        write_swift_package(
+            parse_openapi_to_swift(**generation_options), args.output, args.swift_package, args.min_target_schemas
+        )
+    else:
+        # Write models to separate files in organized directories
+        write_swift_files(
+            parse_openapi_to_swift(**generation_options),
+            args.output,
+            args.max_models_per_file,
+            args.max_bytes_per_file,
+            args.single_file,
+            args.write_workers,
+            args.fsync,
+        )
 
-    # Write models to separate files in organized directories
-    write_swift_files(swift_models, args.output)
+    if remote_cache is not None and remote_spec is not None and not args.plan:
+        remote_cache.record_generation(remote_spec, output_options)
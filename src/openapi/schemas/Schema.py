@@ -3,6 +3,7 @@ from typing import Any, Optional
 from pydantic import BaseModel
 
 from src.jsonschema.JSONSchema import JSONSchema
+from src.openapi.RefResolver import schema_name_from_ref
 from src.openapi.schemas.ExternalDocumentation import ExternalDocumentation
 
 
@@ -32,15 +33,20 @@ class Schema(JSONSchema):
         def _extract_references(schema_item: JSONSchema) -> None:
             """Extract references from a schema item."""
             # Check for direct reference
-            if schema_item.ref_ and schema_item.ref_.startswith("#/components/schemas/"):
-                ref_schema_name = schema_item.ref_.split("/")[-1]
-                references.add(ref_schema_name)
+            if schema_item.ref_:
+                ref_schema_name = schema_name_from_ref(schema_item.ref_)
+                if ref_schema_name is not None:
+                    references.add(ref_schema_name)
 
             # Check properties if it's an object type
             if schema_item.type == "object" and schema_item.properties:
                 for _, prop_schema in schema_item.properties.items():
                     _extract_references(prop_schema)
 
+            # Check the values of a map
+            if isinstance(schema_item.additionalProperties, JSONSchema):
+                _extract_references(schema_item.additionalProperties)
+
             # Check items if it's an array type
             if schema_item.type == "array" and schema_item.items:
                 if isinstance(schema_item.items, list):
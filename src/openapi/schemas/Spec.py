@@ -66,8 +66,12 @@ class PathItem(BaseModel):
 
     @property
     def methods(self) -> dict[EnumHttpMethod, "Operation"]:
-        all_methods = [method for method in EnumHttpMethod]
-        return {method: getattr(self, method) for method in all_methods if getattr(self, method) is not None}
+        methods = {}
+        for method in EnumHttpMethod:
+            operation = getattr(self, method)
+            if operation is not None:
+                methods[method] = operation
+        return methods
 
 
 class Operation(BaseModel):
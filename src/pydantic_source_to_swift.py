@@ -0,0 +1,416 @@
+import ast
+import os
+from typing import Any, Iterable, NamedTuple, Optional, Sequence
+
+from src.jsonschema.JSONSchema import JSONSchema
+from src.openapi.OpenAPISpec import OpenAPISpec
+from src.openapi.parse_openapi_to_swift import parse_openapi_to_swift
+from src.openapi.RefResolver import SCHEMA_REF_PREFIX
+from src.openapi.schemas.Schema import Schema
+from src.pydantic_to_swift import PYTHON_TO_JSON_SCHEMA, enum_schema, spec_from_schemas
+
+# JSON schemas of the Python types with a direct Swift counterpart, by the name they are annotated with
+_JSON_SCHEMAS_BY_NAME: dict[str, dict[str, Any]] = {
+    python_type.__name__: schema for python_type, schema in PYTHON_TO_JSON_SCHEMA.items()
+}
+_JSON_SCHEMAS_BY_NAME.update(
+    {
+        "None": {"type": "null"},
+        "List": {"type": "array"},
+        "Dict": {"type": "object"},
+        "HttpUrl": {"type": "string", "format": "uri"},
+        "EmailStr": {"type": "string", "format": "email"},
+        "Any": {},
+    }
+)
+
+_UNION_NAMES = {"Union"}
+_OPTIONAL_NAMES = {"Optional"}
+_SEQUENCE_NAMES = {"list", "List", "Sequence", "MutableSequence", "set", "Set", "frozenset", "FrozenSet", "tuple", "Tuple"}
+_MAPPING_NAMES = {"dict", "Dict", "Mapping", "MutableMapping"}
+_MODEL_BASES = {("pydantic", "BaseModel"), ("pydantic", "RootModel")}
+_ENUM_BASES = {("enum", "Enum"), ("enum", "IntEnum"), ("enum", "StrEnum")}
+
+
+class _ImportedName(NamedTuple):
+    # Dotted module name as written, and the file it resolved to if it is part of the sources
+    module: str
+    path: Optional[str]
+    # Name of the imported attribute, or None for a whole module
+    name: Optional[str]
+
+
+class _SourceModule:
+    """The classes and imports of a parsed source file."""
+
+    def __init__(self, path: str, tree: ast.Module, imports: dict[str, _ImportedName]) -> None:
+        self.path = path
+        self.imports = imports
+        self.classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+
+
+class _SourceClass(NamedTuple):
+    module: _SourceModule
+    node: ast.ClassDef
+
+
+def _identifier(node: ast.expr) -> Optional[str]:
+    """Returns the last identifier of a name or attribute (`Optional`, `typing.Optional`), if any."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _field_calls(nodes: Iterable[Optional[ast.expr]]) -> list[ast.Call]:
+    return [node for node in nodes if isinstance(node, ast.Call) and _identifier(node.func) == "Field"]
+
+
+def _keyword_string(call: ast.Call, name: str) -> Optional[str]:
+    for keyword in call.keywords:
+        if keyword.arg == name and isinstance(keyword.value, ast.Constant) and isinstance(keyword.value.value, str):
+            return keyword.value.value
+    return None
+
+
+class StaticPydanticMapper:
+    """
+    Maps pydantic models to named schemas by reading their source files, without importing anything.
+
+    Classes are recognized as models or enums when they (transitively) subclass `pydantic.BaseModel`,
+    `pydantic.RootModel` or an `enum` base class. Imports of other modules are resolved to files under the source
+    roots (relative imports relative to the importing file) and parsed on demand; anything outside the sources, such
+    as third-party packages, is never loaded. Fields are read from annotated class attributes, with their alias,
+    description and required-ness taken from the default value and `Field(...)` calls. Annotations that can't be
+    resolved statically (type aliases, generics, names from outside the sources) are mapped to an untyped schema.
+    """
+
+    def __init__(self, source_roots: Sequence[str] = (".",)) -> None:
+        self.source_roots = [os.path.abspath(root) for root in source_roots]
+        self.schemas: dict[str, Schema] = {}
+        self._modules: dict[str, _SourceModule] = {}
+        self._kinds: dict[tuple[str, str], Optional[str]] = {}
+        self._paths_by_name: dict[str, str] = {}
+
+    def load_module(self, path: str) -> _SourceModule:
+        """Parses a source file once, recording its classes and imports."""
+        path = os.path.abspath(path)
+        module = self._modules.get(path)
+        if module is not None:
+            return module
+
+        with open(path, "rb") as file:
+            tree = ast.parse(file.read(), filename=path)
+        imports: dict[str, _ImportedName] = {}
+        for node in tree.body:
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    if alias.asname is not None:
+                        imports[alias.asname] = _ImportedName(alias.name, self._module_path(alias.name), None)
+                    else:
+                        top_level = alias.name.split(".")[0]
+                        imports[top_level] = _ImportedName(top_level, self._module_path(top_level), None)
+            elif isinstance(node, ast.ImportFrom):
+                module_name = node.module or ""
+                module_path = self._module_path(module_name, path, node.level)
+                for alias in node.names:
+                    imports[alias.asname or alias.name] = _ImportedName(module_name, module_path, alias.name)
+        module = self._modules[path] = _SourceModule(path, tree, imports)
+        return module
+
+    def _module_path(self, module_name: str, importer: Optional[str] = None, level: int = 0) -> Optional[str]:
+        """Returns the source file of a module, or None if it isn't part of the sources."""
+        if level > 0 and importer is not None:
+            base = os.path.dirname(importer)
+            for _ in range(level - 1):
+                base = os.path.dirname(base)
+            bases = [base]
+        else:
+            bases = self.source_roots
+        relative_path = os.path.join(*module_name.split(".")) if module_name else ""
+        for base in bases:
+            for candidate in (os.path.join(base, relative_path + ".py"), os.path.join(base, relative_path, "__init__.py")):
+                if os.path.isfile(candidate):
+                    return candidate
+        return None
+
+    def _resolve_class(self, module: _SourceModule, node: ast.expr, depth: int = 0) -> Optional[_SourceClass]:
+        """Resolves a class reference (`User`, `models.User`) to its definition in the sources."""
+        if depth > 16:
+            return None
+        if isinstance(node, ast.Name):
+            if node.id in module.classes:
+                return _SourceClass(module, module.classes[node.id])
+            imported = module.imports.get(node.id)
+            if imported is None or imported.path is None or imported.name is None:
+                return None
+            return self._resolve_imported_class(imported.path, imported.name, depth)
+        if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+            imported = module.imports.get(node.value.id)
+            if imported is None or imported.name is not None:
+                return None
+            module_path = self._module_path(imported.module) if imported.path is None else imported.path
+            if module_path is None:
+                return None
+            return self._resolve_imported_class(module_path, node.attr, depth)
+        return None
+
+    def _resolve_imported_class(self, path: str, name: str, depth: int) -> Optional[_SourceClass]:
+        # The name may itself be imported into that module, e.g. re-exported from a package's __init__.py
+        return self._resolve_class(self.load_module(path), ast.Name(id=name), depth + 1)
+
+    def _external_base(self, module: _SourceModule, node: ast.expr) -> Optional[tuple[str, str]]:
+        """Returns the (module, name) of a base class imported from outside the sources, e.g. `pydantic.BaseModel`."""
+        if isinstance(node, ast.Subscript):
+            node = node.value
+        if isinstance(node, ast.Name):
+            imported = module.imports.get(node.id)
+            if imported is not None and imported.name is not None and imported.path is None:
+                return (imported.module, imported.name)
+        if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+            imported = module.imports.get(node.value.id)
+            if imported is not None and imported.name is None:
+                return (imported.module, node.attr)
+        return None
+
+    def kind(self, source_class: _SourceClass) -> Optional[str]:
+        """Returns "model" or "enum" for pydantic models and enums, or None for other classes."""
+        key = (source_class.module.path, source_class.node.name)
+        if key in self._kinds:
+            return self._kinds[key]
+        self._kinds[key] = None  # Guards against circular base classes
+        kind = None
+        for base in source_class.node.bases:
+            external_base = self._external_base(source_class.module, base)
+            if external_base in _MODEL_BASES:
+                kind = "model"
+            elif external_base in _ENUM_BASES:
+                kind = "enum"
+            else:
+                base_class = self._resolve_class(source_class.module, base)
+                kind = self.kind(base_class) if base_class is not None else None
+            if kind is not None:
+                break
+        self._kinds[key] = kind
+        return kind
+
+    def add_module(self, path: str) -> list[str]:
+        """Adds every model and enum defined in a source file, returning their schema names."""
+        module = self.load_module(path)
+        return [
+            self.add(source_class)
+            for source_class in (_SourceClass(module, node) for node in module.classes.values())
+            if self.kind(source_class) is not None
+        ]
+
+    def add(self, source_class: _SourceClass) -> str:
+        """Adds a model or enum (and every model and enum it uses), returning its schema name."""
+        name = source_class.node.name
+        existing_path = self._paths_by_name.get(name)
+        if existing_path == source_class.module.path:
+            return name
+        if existing_path is not None:
+            raise ValueError(f"Two types are named {name}: {existing_path} and {source_class.module.path}")
+
+        # Register the class first so models referencing themselves terminate
+        self._paths_by_name[name] = source_class.module.path
+        if self.kind(source_class) == "enum":
+            self.schemas[name] = self._enum_schema(source_class)
+        else:
+            self.schemas[name] = self._model_schema(source_class)
+        return name
+
+    def _enum_schema(self, source_class: _SourceClass) -> Schema:
+        values = [
+            statement.value.value
+            for statement in source_class.node.body
+            if isinstance(statement, ast.Assign)
+            and len(statement.targets) == 1
+            and isinstance(statement.targets[0], ast.Name)
+            and not statement.targets[0].id.startswith("_")
+            and isinstance(statement.value, ast.Constant)
+        ]
+        return enum_schema(source_class.node.name, values)
+
+    def _model_schema(self, source_class: _SourceClass) -> Schema:
+        module, node = source_class
+        for base in node.bases:
+            # RootModel[X] is the schema of X
+            if isinstance(base, ast.Subscript) and self._external_base(module, base) == ("pydantic", "RootModel"):
+                root_schema = self.annotation_schema(module, base.slice)
+                return Schema.model_validate(
+                    {**root_schema.model_dump(by_alias=True, exclude_unset=True), "title": node.name}
+                )
+
+        properties: dict[str, JSONSchema] = {}
+        required: list[str] = []
+        for property_name, property_schema, is_required in self._fields(source_class):
+            properties.pop(property_name, None)
+            properties[property_name] = property_schema
+            if is_required and property_name not in required:
+                required.append(property_name)
+            elif not is_required and property_name in required:
+                required.remove(property_name)
+
+        schema: dict[str, Any] = {"type": "object", "title": node.name, "properties": properties}
+        if required:
+            schema["required"] = required
+        docstring = ast.get_docstring(node)
+        if docstring:
+            schema["description"] = docstring
+        return Schema.model_validate(schema)
+
+    def _fields(self, source_class: _SourceClass) -> Iterable[tuple[str, JSONSchema, bool]]:
+        """Yields the (property name, schema, required) of a model's fields, inherited fields first."""
+        module, node = source_class
+        for base in node.bases:
+            base_class = self._resolve_class(module, base)
+            if base_class is not None and self.kind(base_class) == "model":
+                yield from self._fields(base_class)
+
+        for statement in node.body:
+            if not isinstance(statement, ast.AnnAssign) or not isinstance(statement.target, ast.Name):
+                continue
+            field_name = statement.target.id
+            if field_name.startswith("_") or field_name == "model_config":
+                continue
+            annotation = statement.annotation
+            if _identifier(annotation.value if isinstance(annotation, ast.Subscript) else annotation) == "ClassVar":
+                continue
+
+            # Field(...) calls hold the alias and description, as the default or as Annotated metadata
+            field_calls = _field_calls([statement.value])
+            if isinstance(annotation, ast.Subscript) and _identifier(annotation.value) == "Annotated":
+                if isinstance(annotation.slice, ast.Tuple):
+                    field_calls.extend(_field_calls(annotation.slice.elts[1:]))
+
+            property_name = field_name
+            description = None
+            is_required = statement.value is None
+            for call in field_calls:
+                property_name = (
+                    _keyword_string(call, "serialization_alias") or _keyword_string(call, "alias") or property_name
+                )
+                description = _keyword_string(call, "description") or description
+                if call is statement.value:
+                    has_default = any(keyword.arg in ("default", "default_factory") for keyword in call.keywords)
+                    first_arg = call.args[0] if call.args else None
+                    is_required = not has_default and (
+                        first_arg is None or (isinstance(first_arg, ast.Constant) and first_arg.value is Ellipsis)
+                    )
+
+            property_schema = self.annotation_schema(module, annotation)
+            if description:
+                property_schema = property_schema.model_copy(update={"description": description})
+            yield property_name, property_schema, is_required
+
+    def annotation_schema(self, module: _SourceModule, annotation: ast.expr) -> JSONSchema:
+        """Returns the schema of a field annotation, like `PydanticSchemaMapper.annotation_schema` does at runtime."""
+        # Forward references are annotations in a string
+        if isinstance(annotation, ast.Constant) and isinstance(annotation.value, str):
+            return self.annotation_schema(module, ast.parse(annotation.value, mode="eval").body)
+        if isinstance(annotation, ast.Constant) and annotation.value is None:
+            return JSONSchema.model_validate({"type": "null"})
+        if isinstance(annotation, ast.BinOp) and isinstance(annotation.op, ast.BitOr):
+            return self._union_schema(module, [annotation.left, annotation.right])
+
+        if isinstance(annotation, ast.Subscript):
+            name = _identifier(annotation.value)
+            args = annotation.slice.elts if isinstance(annotation.slice, ast.Tuple) else [annotation.slice]
+            if name == "Annotated":
+                return self.annotation_schema(module, args[0])
+            if name in _OPTIONAL_NAMES:
+                return self._union_schema(module, [args[0], ast.Constant(value=None)])
+            if name in _UNION_NAMES:
+                return self._union_schema(module, args)
+            if name == "Literal":
+                values = [arg.value for arg in args if isinstance(arg, ast.Constant)]
+                if all(isinstance(value, str) for value in values):
+                    return JSONSchema.model_validate({"type": "string", "enum": values})
+                return JSONSchema.model_validate({"enum": values})
+            if name in _MAPPING_NAMES:
+                if len(args) != 2 or _identifier(args[1]) == "Any":
+                    return JSONSchema.model_validate({"type": "object"})
+                return JSONSchema.model_validate(
+                    {"type": "object", "additionalProperties": self.annotation_schema(module, args[1])}
+                )
+            if name in _SEQUENCE_NAMES:
+                return JSONSchema.model_validate({"type": "array", "items": self.annotation_schema(module, args[0])})
+            return JSONSchema.model_validate({})
+
+        source_class = self._resolve_class(module, annotation)
+        if source_class is not None and self.kind(source_class) is not None:
+            return JSONSchema.model_validate({"$ref": SCHEMA_REF_PREFIX + self.add(source_class)})
+        name = _identifier(annotation)
+        return JSONSchema.model_validate(_JSON_SCHEMAS_BY_NAME.get(name or "", {}))
+
+    def _union_schema(self, module: _SourceModule, args: list[ast.expr]) -> JSONSchema:
+        options: list[JSONSchema] = []
+        for arg in args:
+            # `A | B | None` nests, like the unions it is flattened into at runtime
+            option = self.annotation_schema(module, arg)
+            is_nested_union = isinstance(arg, ast.BinOp) or (
+                isinstance(arg, ast.Subscript) and _identifier(arg.value) in _UNION_NAMES | _OPTIONAL_NAMES
+            )
+            options.extend(option.anyOf or [] if is_nested_union else [option])
+        return JSONSchema.model_validate({"anyOf": options}) if len(options) > 1 else options[0]
+
+    def spec(self) -> OpenAPISpec:
+        """Returns a spec whose schemas are the mapped models and enums."""
+        return spec_from_schemas(self.schemas)
+
+
+def _source_files(paths: Iterable[str]) -> list[str]:
+    """Returns the Python files among the paths, searching directories recursively."""
+    files = []
+    for path in paths:
+        if not os.path.isdir(path):
+            files.append(path)
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            files.extend(os.path.join(dirpath, filename) for filename in sorted(filenames) if filename.endswith(".py"))
+    return files
+
+
+def parse_pydantic_source_to_swift(
+    paths: Iterable[str], source_roots: Sequence[str] = (".",), **options: Any
+) -> dict[str, Any]:
+    """
+    Converts the pydantic models defined in Python source files into Swift models, without importing them.
+
+    The files are parsed with `ast` (see `StaticPydanticMapper`), so converting models doesn't run any of the code
+    they import, and the models are generated exactly like `parse_pydantic_to_swift` generates imported models.
+
+    Args:
+        paths: Python files, or directories to search for Python files; every model and enum defined in them is
+            converted, along with the models and enums they use from other files
+        source_roots: Directories that absolute imports are resolved against, like entries of `sys.path`
+        options: Generation options, see `parse_openapi_to_swift`
+
+    Returns:
+        dict[str, Any]: The generated models, see `parse_openapi_to_swift`
+    """
+    mapper = StaticPydanticMapper(source_roots)
+    for path in _source_files(paths):
+        mapper.add_module(path)
+    return parse_openapi_to_swift(openapi=mapper.spec(), **options)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from src.openapi.parse_openapi_to_swift import write_swift_files
+
+    parser = argparse.ArgumentParser(description="Generate Swift models from pydantic source files without importing them")
+    parser.add_argument("paths", nargs="+", help="Python files or directories containing the models")
+    parser.add_argument("--output", required=True, help="Output directory for Swift files")
+    parser.add_argument(
+        "--source-root",
+        action="append",
+        help="Directory that absolute imports are resolved against (repeatable); defaults to the current directory",
+    )
+    args = parser.parse_args()
+
+    write_swift_files(parse_pydantic_source_to_swift(args.paths, args.source_root or ["."]), args.output)
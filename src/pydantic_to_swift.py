@@ -1,46 +1,213 @@
-from pydantic import BaseModel
+import datetime
+import decimal
+import enum
+import inspect
+import types
+import uuid
+from collections.abc import Mapping, Sequence
+from typing import Annotated, Any, Iterable, Literal, Union, get_args, get_origin
 
-PYTHON_TO_SWIFT_TYPES = {int: "Int", float: "Double", str: "String", bool: "Bool", list: "Array", dict: "Dictionary"}
+from pydantic import AnyUrl, BaseModel, RootModel
 
+from src.jsonschema.JSONSchema import JSONSchema
+from src.openapi.OpenAPISpec import OpenAPISpec
+from src.openapi.OpenAPISwiftModelGenerator import OpenAPISwiftModelGenerator
+from src.openapi.parse_openapi_to_swift import parse_openapi_to_swift
+from src.openapi.RefResolver import SCHEMA_REF_PREFIX
+from src.openapi.schemas.Info import Info
+from src.openapi.schemas.Schema import Schema
+from src.openapi.schemas.Spec import Components, Paths, Spec
 
-def generate_swiftdata_model(pydantic_model: type[BaseModel]) -> str:
-    """Generate a SwiftData model from a Pydantic model."""
-    model_name = pydantic_model.__name__
-    fields = pydantic_model.model_fields
+# JSON schemas of the Python types with a direct Swift counterpart
+PYTHON_TO_JSON_SCHEMA: dict[Any, dict[str, Any]] = {
+    int: {"type": "integer"},
+    float: {"type": "number"},
+    decimal.Decimal: {"type": "number"},
+    str: {"type": "string"},
+    bool: {"type": "boolean"},
+    bytes: {"type": "string"},
+    datetime.datetime: {"type": "string", "format": "date-time"},
+    datetime.date: {"type": "string", "format": "date"},
+    uuid.UUID: {"type": "string", "format": "uuid"},
+    AnyUrl: {"type": "string", "format": "uri"},
+    dict: {"type": "object"},
+    list: {"type": "array"},
+    type(None): {"type": "null"},
+}
+
+
+def enum_schema(name: str, values: list[Any]) -> Schema:
+    """Returns the schema of an enum with the given member values."""
+    schema_type = None
+    if all(isinstance(value, str) for value in values):
+        schema_type = "string"
+    elif all(isinstance(value, int) and not isinstance(value, bool) for value in values):
+        schema_type = "integer"
+    return Schema.model_validate({"type": schema_type, "enum": values, "title": name})
+
+
+def spec_from_schemas(schemas: dict[str, Schema]) -> OpenAPISpec:
+    """Returns a spec with the given named schemas and no paths."""
+    return OpenAPISpec.from_value(
+        Spec(
+            openapi="3.1.0",
+            info=Info(title="Pydantic models", version="1.0.0"),
+            paths=Paths(root={}),
+            components=Components(schemas=schemas),
+        )
+    )
+
+
+class PydanticSchemaMapper:
+    """
+    Maps pydantic models (and the models and enums they reference) to named schemas.
+
+    Field annotations are mapped once per distinct annotation, and every field with that annotation shares the
+    resulting schema instance, so repeated annotations such as `Optional[str]` or `list[Item]` cost one mapping and,
+    in the generator, one Swift type conversion.
+    """
+
+    def __init__(self) -> None:
+        self.schemas: dict[str, Schema] = {}
+        self._types: dict[str, type] = {}
+        self._annotation_schemas: dict[Any, JSONSchema] = {}
+
+    def add(self, named_type: type) -> str:
+        """Adds a model or enum (and every model and enum it uses), returning its schema name."""
+        name = named_type.__name__
+        existing = self._types.get(name)
+        if existing is named_type:
+            return name
+        if existing is not None:
+            raise ValueError(f"Two types are named {name}: {existing.__module__} and {named_type.__module__}")
+
+        # Register the type first so models referencing themselves terminate
+        self._types[name] = named_type
+        if issubclass(named_type, enum.Enum):
+            self.schemas[name] = self._enum_schema(named_type)
+        elif issubclass(named_type, BaseModel):
+            self.schemas[name] = self._model_schema(named_type)
+        else:
+            raise ValueError(f"{name} is not a pydantic model or an enum")
+        return name
 
-    swift_model = f"import SwiftData\n\n@Model\nclass {model_name} {{\n"
+    def _enum_schema(self, enum_type: type[enum.Enum]) -> Schema:
+        return enum_schema(enum_type.__name__, [member.value for member in enum_type])
 
-    for field_name, field_info in fields.items():
-        print(field_info.annotation)
-    #     field_type = field_info.annotation
-    #     swift_type = PYTHON_TO_SWIFT_TYPES.get(field_type, "Any")
+    def _model_schema(self, model: type[BaseModel]) -> Schema:
+        if issubclass(model, RootModel):
+            root_schema = self.annotation_schema(model.model_fields["root"].annotation)
+            return Schema.model_validate(
+                {**root_schema.model_dump(by_alias=True, exclude_unset=True), "title": model.__name__}
+            )
 
-    #     if getattr(field_type, "__origin__", None) is Optional:
-    #         swift_type = f"{PYTHON_TO_SWIFT_TYPES.get(field_type.__args__[0], 'Any')}?"
+        properties: dict[str, JSONSchema] = {}
+        required = []
+        for field_name, field_info in model.model_fields.items():
+            # Payloads use the field's alias
+            property_name = field_info.serialization_alias or field_info.alias or field_name
+            property_schema = self.annotation_schema(field_info.annotation)
+            if field_info.description:
+                property_schema = property_schema.model_copy(update={"description": field_info.description})
+            properties[property_name] = property_schema
+            if field_info.is_required():
+                required.append(property_name)
 
-    #     elif getattr(field_type, "__origin__", None) is list:
-    #         item_type = field_type.__args__[0] if field_type.__args__ else "Any"
-    #         swift_type = f"[{PYTHON_TO_SWIFT_TYPES.get(item_type, 'Any')}]"
+        schema: dict[str, Any] = {"type": "object", "title": model.__name__, "properties": properties}
+        if required:
+            schema["required"] = required
+        if model.__doc__ and model.__doc__ is not BaseModel.__doc__:
+            schema["description"] = inspect.cleandoc(model.__doc__)
+        return Schema.model_validate(schema)
 
-    #     default_value = field_info.default if field_info.default is not None else None
-    #     default_str = f" = {repr(default_value)}" if default_value is not None else ""
+    def annotation_schema(self, annotation: Any) -> JSONSchema:
+        """Returns the schema of a field annotation, mapping each distinct annotation once."""
+        try:
+            return self._annotation_schemas[annotation]
+        except KeyError:
+            pass
+        except TypeError:
+            # Annotations with unhashable metadata can't be cached
+            return self._map_annotation(annotation)
+        schema = self._annotation_schemas[annotation] = self._map_annotation(annotation)
+        return schema
 
-    #     attribute_prefix = "@Attribute(.primaryKey) " if field_name == "id" else ""
+    def _map_annotation(self, annotation: Any) -> JSONSchema:
+        origin = get_origin(annotation)
+        args = get_args(annotation)
 
-    #     swift_model += (
-    #         f"    {attribute_prefix}var {field_name}: {swift_type}{default_str}\n"
-    #     )
+        if origin is Annotated:
+            return self.annotation_schema(args[0])
+        if origin is Union or origin is types.UnionType:
+            options = [self.annotation_schema(arg) for arg in args]
+            return JSONSchema.model_validate({"anyOf": options}) if len(options) > 1 else options[0]
+        if origin is Literal:
+            if all(isinstance(value, str) for value in args):
+                return JSONSchema.model_validate({"type": "string", "enum": list(args)})
+            return JSONSchema.model_validate({"enum": list(args)})
+        if isinstance(origin, type) and issubclass(origin, Mapping):
+            value_annotation = args[1] if len(args) == 2 else Any
+            if value_annotation is Any:
+                return JSONSchema.model_validate({"type": "object"})
+            return JSONSchema.model_validate(
+                {"type": "object", "additionalProperties": self.annotation_schema(value_annotation)}
+            )
+        if isinstance(origin, type) and issubclass(origin, (Sequence, set, frozenset)):
+            # Homogeneous sequences and tuple[X, ...]; fixed-size tuples use their first item type
+            item_annotation = args[0] if args else Any
+            return JSONSchema.model_validate({"type": "array", "items": self.annotation_schema(item_annotation)})
 
-    # init_params = ", ".join(
-    #     f"{field_name}: {PYTHON_TO_SWIFT_TYPES.get(field_info.annotation, 'Any')}"
-    #     for field_name, field_info in fields.items()
-    # )
-    # init_body = "\n        ".join(
-    #     f"self.{field_name} = {field_name}" for field_name in fields
-    # )
+        if isinstance(annotation, type):
+            if issubclass(annotation, (BaseModel, enum.Enum)):
+                return JSONSchema.model_validate({"$ref": SCHEMA_REF_PREFIX + self.add(annotation)})
+            for python_type in annotation.__mro__:
+                if python_type in PYTHON_TO_JSON_SCHEMA:
+                    return JSONSchema.model_validate(PYTHON_TO_JSON_SCHEMA[python_type])
+        return JSONSchema.model_validate({})
 
-    # swift_model += f"\n    init({init_params}) {{\n        {init_body}\n    }}\n"
-    # swift_model += "}"
+    def spec(self) -> OpenAPISpec:
+        """Returns a spec whose schemas are the mapped models and enums."""
+        return spec_from_schemas(self.schemas)
 
-    # return swift_model
-    return ""
+
+def _collect_types(models: types.ModuleType | Iterable[type]) -> list[type]:
+    """Returns the models and enums to convert: the given ones, or the ones defined in the given module."""
+    if not isinstance(models, types.ModuleType):
+        return list(models)
+    return [
+        value
+        for value in vars(models).values()
+        if isinstance(value, type) and value.__module__ == models.__name__ and issubclass(value, (BaseModel, enum.Enum))
+    ]
+
+
+def pydantic_models_to_spec(models: types.ModuleType | Iterable[type]) -> OpenAPISpec:
+    """Returns a spec whose schemas are the given pydantic models and enums, plus every model and enum they use."""
+    mapper = PydanticSchemaMapper()
+    for named_type in _collect_types(models):
+        mapper.add(named_type)
+    return mapper.spec()
+
+
+def parse_pydantic_to_swift(models: types.ModuleType | Iterable[type], **options: Any) -> dict[str, Any]:
+    """
+    Converts pydantic models directly into Swift models, without going through an OpenAPI document.
+
+    Field annotations (optional and union types, lists, dicts, nested models, enums, literals and `Annotated`
+    metadata) are mapped to schemas once per distinct annotation, and the models are generated and grouped by
+    dependency exactly like `parse_openapi_to_swift`.
+
+    Args:
+        models: A module, whose models and enums are all converted, or a list of models and enums. The models and
+            enums they use are converted too.
+        options: Generation options, see `parse_openapi_to_swift`
+
+    Returns:
+        dict[str, Any]: The generated models, see `parse_openapi_to_swift`
+    """
+    return parse_openapi_to_swift(openapi=pydantic_models_to_spec(models), **options)
+
+
+def generate_swiftdata_model(pydantic_model: type[BaseModel]) -> str:
+    """Generate a SwiftData model (and its DTO) from a Pydantic model."""
+    return OpenAPISwiftModelGenerator(pydantic_models_to_spec([pydantic_model])).generate_model(pydantic_model.__name__)
@@ -1,6 +1,9 @@
 import re
+from functools import lru_cache
 
 
+# Property names repeat across models, so each one is converted once
+@lru_cache(maxsize=None)
 def to_camel_case(text: str) -> str:
     """Converts a string to camel case."""
     words = re.split(r"[-_\s]+", text)
@@ -0,0 +1,21 @@
+from typing import Any
+
+import pytest
+
+
+def spec_with_schemas(schemas: dict[str, Any]) -> dict[str, Any]:
+    """Wraps named schemas in an otherwise empty OpenAPI spec."""
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Test API", "version": "1.0.0"},
+        "paths": {},
+        "components": {"schemas": schemas},
+    }
+
+
+@pytest.fixture
+def many_enums_schema() -> dict[str, Any]:
+    """Create a sample OpenAPI schema with many small shared enums."""
+    return spec_with_schemas(
+        {f"Status{i:03d}": {"type": "string", "enum": ["active", "inactive"]} for i in range(0, 200, 2)}
+    )
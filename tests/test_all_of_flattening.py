@@ -0,0 +1,133 @@
+from typing import Any
+
+import pytest
+from conftest import spec_with_schemas
+
+from src.jsonschema.JSONSchema import JSONSchema
+from src.openapi.AllOfFlattener import AllOfFlattener
+from src.openapi.OpenAPISpec import OpenAPISpec
+from src.openapi.parse_openapi_to_swift import parse_openapi_to_swift
+
+
+@pytest.fixture
+def inheritance_schemas() -> dict[str, Any]:
+    """Create schemas extending a base schema through a chain of allOf."""
+    return {
+        "Owner": {"type": "object", "properties": {"name": {"type": "string"}}, "required": ["name"]},
+        "Base": {
+            "type": "object",
+            "properties": {"id": {"type": "string"}, "created_at": {"type": "string", "format": "date-time"}},
+            "required": ["id"],
+        },
+        "Pet": {
+            "allOf": [
+                {"$ref": "#/components/schemas/Base"},
+                {"type": "object", "properties": {"name": {"type": "string"}}, "required": ["name"]},
+            ],
+            "description": "A pet",
+        },
+        "Cat": {
+            "allOf": [{"$ref": "#/components/schemas/Pet"}],
+            "properties": {
+                "lives": {"type": "integer"},
+                "owner": {"allOf": [{"$ref": "#/components/schemas/Owner"}], "description": "The owner"},
+            },
+        },
+    }
+
+
+def test_all_of_is_flattened(inheritance_schemas: dict[str, Any]) -> None:
+    """Test that allOf chains merge properties and required lists, and single references stay references."""
+    spec = OpenAPISpec(spec_dict=spec_with_schemas(inheritance_schemas))
+    cat = spec.schemas["Cat"]
+
+    assert cat.allOf is None
+    assert cat.type == "object"
+    assert list(cat.properties or {}) == ["id", "created_at", "name", "lives", "owner"]
+    assert cat.required == ["id", "name"]
+    assert (cat.properties or {})["owner"].ref_ == "#/components/schemas/Owner"
+    assert spec.schemas["Pet"].description == "A pet"
+    assert sorted(cat.get_references()) == ["Owner"]
+
+    code = parse_openapi_to_swift(spec_dict=spec_with_schemas(inheritance_schemas))["Cat"]["code"]
+    assert "let createdAt: Date?" in code
+    assert "let owner: Owner?" in code
+
+
+def test_shared_bases_are_merged_once(inheritance_schemas: dict[str, Any]) -> None:
+    """Test that a base extended by several schemas is flattened once and shared by all of them."""
+    spec = OpenAPISpec(spec_dict=spec_with_schemas(inheritance_schemas), flatten_all_of=False)
+    flattener = AllOfFlattener(spec.schemas)
+    flattened = flattener.flatten_all()
+
+    assert flattener.flatten("Pet") is flattened["Pet"]
+    assert (flattened["Cat"].properties or {})["id"] is (flattened["Pet"].properties or {})["id"]
+    assert flattened["Base"] is spec.schemas["Base"]
+    assert spec.schemas["Cat"].allOf is not None
+
+
+def test_circular_all_of_is_detected() -> None:
+    """Test that schemas extending each other raise an error naming the cycle."""
+    schemas = {"A": {"allOf": [{"$ref": "#/components/schemas/B"}]}, "B": {"allOf": [{"$ref": "#/components/schemas/A"}]}}
+    with pytest.raises(ValueError, match="Circular allOf: A -> B -> A"):
+        OpenAPISpec(spec_dict=spec_with_schemas(schemas))
+
+
+def test_all_of_keeps_member_keywords() -> None:
+    """Test that extending an enum, array or formatted string through allOf keeps the member's type."""
+    schemas = {
+        "Status": {"type": "string", "enum": ["active", "archived"]},
+        "Tags": {"type": "array", "items": {"type": "string"}, "maxItems": 10},
+        "Day": {"type": "string", "format": "date"},
+        "PetStatus": {"allOf": [{"$ref": "#/components/schemas/Status"}], "description": "The pet's status"},
+        "PetTags": {"allOf": [{"$ref": "#/components/schemas/Tags"}, {"maxItems": 5}]},
+        "Event": {
+            "type": "object",
+            "properties": {
+                "day": {"allOf": [{"$ref": "#/components/schemas/Day"}, {"readOnly": True}], "description": "When"}
+            },
+            "required": ["day"],
+        },
+    }
+    spec = OpenAPISpec(spec_dict=spec_with_schemas(schemas))
+
+    pet_status = spec.schemas["PetStatus"]
+    assert pet_status.type == "string" and pet_status.enum == ["active", "archived"]
+    assert pet_status.description == "The pet's status" and pet_status.title is None
+
+    pet_tags = spec.schemas["PetTags"]
+    assert pet_tags.type == "array" and pet_tags.properties is None
+    assert isinstance(pet_tags.items, JSONSchema) and pet_tags.items.type == "string"
+    # Later members override earlier ones
+    assert pet_tags.maxItems == 5
+
+    day = (spec.schemas["Event"].properties or {})["day"]
+    assert day.type == "string" and day.format == "date" and day.readOnly and day.description == "When"
+
+    swift_models = parse_openapi_to_swift(spec_dict=spec_with_schemas(schemas))
+    assert "case archived" in swift_models["PetStatus"]["code"]
+    assert "@DateOnly var day: Date" in swift_models["Event"]["code"]
+
+
+def test_variants_do_not_inherit_the_base_union() -> None:
+    """Test that variants extending a discriminated base through allOf stay objects instead of becoming the union."""
+    schemas = {
+        "Pet": {
+            "type": "object",
+            "properties": {"pet_type": {"type": "string"}, "name": {"type": "string"}},
+            "required": ["pet_type"],
+            "oneOf": [{"$ref": "#/components/schemas/Cat"}, {"$ref": "#/components/schemas/Dog"}],
+            "discriminator": {"propertyName": "pet_type"},
+        },
+        "Cat": {"allOf": [{"$ref": "#/components/schemas/Pet"}, {"properties": {"lives": {"type": "integer"}}}]},
+        "Dog": {"allOf": [{"$ref": "#/components/schemas/Pet"}, {"properties": {"bark": {"type": "string"}}}]},
+    }
+    spec = OpenAPISpec(spec_dict=spec_with_schemas(schemas))
+    for name in ("Cat", "Dog"):
+        assert spec.schemas[name].oneOf is None and spec.schemas[name].discriminator is None
+    assert list(spec.schemas["Cat"].properties or {}) == ["pet_type", "name", "lives"]
+
+    swift_models = parse_openapi_to_swift(spec_dict=spec_with_schemas(schemas))
+    code = "\n".join(model["code"] for model in swift_models.values())
+    assert "struct CatDTO" in code and "struct DogDTO" in code
+    assert "enum Cat" not in code and "enum Dog" not in code
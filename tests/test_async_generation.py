@@ -0,0 +1,73 @@
+import asyncio
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from src.openapi import async_generation
+from src.openapi.async_generation import parse_openapi_to_swift_async, write_swift_files_async
+from src.openapi.parse_openapi_to_swift import parse_openapi_to_swift, write_files
+
+
+def test_async_generation(tmp_path: Path) -> None:
+    """Test that several specs can be generated and written concurrently on one event loop."""
+    filepath = "tests/test_data/test_response_generation.json"
+
+    async def _generate_and_write(name: str) -> int:
+        swift_models = await parse_openapi_to_swift_async(filepath=filepath, deduplicate=True)
+        return await write_swift_files_async(swift_models, str(tmp_path / name), max_concurrent_writes=4)
+
+    async def _main() -> list[int]:
+        return list(await asyncio.gather(_generate_and_write("Users"), _generate_and_write("Recipes")))
+
+    assert asyncio.run(_main()) == [16, 16]
+    expected = parse_openapi_to_swift(filepath=filepath, deduplicate=True)["AuthResponse"]["code"]
+    assert expected in (tmp_path / "Recipes" / "Root" / "AuthResponse.swift").read_text()
+
+
+def test_async_generation_cancellation(tmp_path: Path) -> None:
+    """Test that a run cancelled while generating stops before writing its output."""
+    output_dir = tmp_path / "Generated"
+
+    async def _generate_and_write() -> int:
+        swift_models = await parse_openapi_to_swift_async(filepath="tests/test_data/test_response_generation.json")
+        return await write_swift_files_async(swift_models, str(output_dir))
+
+    async def _main() -> None:
+        task = asyncio.create_task(_generate_and_write())
+        await asyncio.sleep(0)
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(_main())
+    assert not output_dir.exists()
+
+
+def test_async_write_cancellation(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a run cancelled while writing skips the files that weren't being written yet."""
+    output_dir = tmp_path / "Generated"
+    swift_models = parse_openapi_to_swift(filepath="tests/test_data/test_response_generation.json")
+    first_written = threading.Event()
+    release = threading.Event()
+
+    def _write_files(*args: Any) -> None:
+        # Holds the first write until the task was cancelled, so the test doesn't depend on how fast files are written
+        write_files(*args)
+        first_written.set()
+        release.wait(10)
+
+    monkeypatch.setattr(async_generation, "write_files", _write_files)
+
+    async def _main() -> None:
+        task = asyncio.create_task(write_swift_files_async(swift_models, str(output_dir), max_concurrent_writes=1))
+        assert await asyncio.to_thread(first_written.wait, 10), "No file was written"
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        release.set()
+
+    asyncio.run(_main())
+    # The write that was running when the task was cancelled finishes, the others are skipped
+    assert len(list(output_dir.rglob("*.swift"))) == 1
@@ -0,0 +1,88 @@
+import json
+from pathlib import Path
+
+from src.openapi.batch_generate import generate_batch, load_batch_manifest
+
+
+def test_batch_generate(tmp_path: Path) -> None:
+    """Test that every spec of a manifest is generated, sharing models between specs and reporting failures."""
+    spec = json.loads(Path("tests/test_data/test_response_generation.json").read_text())
+    (tmp_path / "users.json").write_text(json.dumps(spec))
+    (tmp_path / "recipes.json").write_text(json.dumps(spec))
+    manifest = {
+        "specs": [
+            {"openapi": "users.json", "output": "Generated/Users"},
+            {"openapi": "recipes.json", "output": "Generated/Recipes", "single_file": True},
+            {"openapi": "missing.json", "output": "Generated/Missing"},
+        ]
+    }
+    (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+
+    results = generate_batch(load_batch_manifest(str(tmp_path / "manifest.json")))
+
+    users, recipes, missing = results
+    assert users.error is None and users.cache_hits == 0
+    assert (tmp_path / "Generated" / "Users" / "Root" / "AuthResponse.swift").exists()
+
+    # The second spec has the same schemas, so all of its models come from the cache
+    assert recipes.error is None and recipes.cache_hits == recipes.model_count
+    assert recipes.file_count == 1
+    assert (tmp_path / "Generated" / "Recipes" / "GeneratedModels.swift").exists()
+
+    assert missing.error is not None and "missing.json" in missing.error
+
+
+def test_batch_generate_shared_output(tmp_path: Path) -> None:
+    """Test that shared models generated identically by several specs are written once to a shared module."""
+    spec = json.loads(Path("tests/test_data/test_response_generation.json").read_text())
+    (tmp_path / "users.json").write_text(json.dumps(spec))
+    spec["components"]["schemas"]["RecipeSourceType"]["enum"].append("image_content")
+    (tmp_path / "recipes.json").write_text(json.dumps(spec))
+    manifest = {
+        "shared_output": "Generated/Common",
+        "specs": [
+            {"openapi": "users.json", "output": "Generated/Users"},
+            {"openapi": "recipes.json", "output": "Generated/Recipes"},
+        ],
+    }
+    (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+
+    results = generate_batch(load_batch_manifest(str(tmp_path / "manifest.json")))
+    assert [result.shared_count for result in results] == [2, 2]
+
+    generated_dir = tmp_path / "Generated"
+    assert sorted(path.name for path in (generated_dir / "Common" / "Shared").iterdir()) == [
+        "GeneratedCoding.swift",
+        "GroceryListInviteStatus.swift",
+    ]
+    # The shared output is its own module, so its declarations are public and it doesn't import itself
+    status_code = (generated_dir / "Common" / "Shared" / "GroceryListInviteStatus.swift").read_text()
+    assert "public enum GroceryListInviteStatus" in status_code
+    assert "import GeneratedShared" not in status_code
+
+    # Each spec's output is a separate module that imports the shared one
+    for spec_dir in ("Users", "Recipes"):
+        for path in (generated_dir / spec_dir).rglob("*.swift"):
+            assert "import GeneratedShared\n" in path.read_text()
+
+    # The specs disagree on RecipeSourceType, so each module keeps its own copy
+    assert sorted(path.name for path in (generated_dir / "Users" / "Shared").iterdir()) == ["RecipeSourceType.swift"]
+    recipes_source_type = (generated_dir / "Recipes" / "Shared" / "RecipeSourceType.swift").read_text()
+    assert "image_content" in recipes_source_type
+    assert "public enum RecipeSourceType" in recipes_source_type
+
+
+def test_batch_generate_without_common_models(tmp_path: Path) -> None:
+    """Test that specs without common models neither get a shared output nor import it."""
+    spec = json.loads(Path("tests/test_data/test_response_generation.json").read_text())
+    (tmp_path / "users.json").write_text(json.dumps(spec))
+    manifest = {"shared_output": "Generated/Common", "specs": [{"openapi": "users.json", "output": "Generated/Users"}]}
+    (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+
+    results = generate_batch(load_batch_manifest(str(tmp_path / "manifest.json")))
+    assert [result.shared_count for result in results] == [0]
+
+    generated_dir = tmp_path / "Generated"
+    assert not (generated_dir / "Common").exists()
+    swift_files = list((generated_dir / "Users").rglob("*.swift"))
+    assert swift_files and all("import GeneratedShared" not in path.read_text() for path in swift_files)
@@ -0,0 +1,81 @@
+from typing import Any
+
+import pytest
+
+from src.openapi.OpenAPISpec import OpenAPISpec
+from src.openapi.OpenAPISwiftModelGenerator import OpenAPISwiftModelGenerator
+from src.openapi.parse_openapi_to_swift import parse_openapi_to_swift
+
+
+@pytest.fixture
+def dated_schema() -> dict[str, Any]:
+    """Create a sample OpenAPI schema with date and date-time properties."""
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Test API", "version": "1.0.0"},
+        "paths": {},
+        "components": {
+            "schemas": {
+                "Event": {
+                    "type": "object",
+                    "properties": {
+                        "id": {"type": "string"},
+                        "day": {"type": "string", "format": "date"},
+                        "starts_at": {"anyOf": [{"type": "string", "format": "date-time"}, {"type": "null"}]},
+                        "ends_on": {"type": "string", "format": "date"},
+                    },
+                    "required": ["id", "day"],
+                },
+                "Tag": {"type": "object", "properties": {"name": {"type": "string"}}, "required": ["name"]},
+            }
+        },
+    }
+
+
+def test_shared_coding_generation(dated_schema: dict[str, Any]) -> None:
+    """Test that specs with date formats get one shared coding file that every DTO conforms to."""
+    swift_models = parse_openapi_to_swift(spec_dict=dated_schema)
+
+    assert swift_models["GeneratedCoding"]["type"] == "shared"
+    coding_code = swift_models["GeneratedCoding"]["code"]
+    assert coding_code.count("ISO8601DateFormatter()") == 2
+    assert 'makePOSIXFormatter("yyyy-MM-dd")' in coding_code
+    assert "static let decoder: JSONDecoder = {" in coding_code
+    assert "protocol GeneratedCodable: Codable {}" in coding_code
+
+    assert "extension EventDTO: GeneratedCodable {}" in swift_models["Event"]["code"]
+    assert "extension TagDTO: GeneratedCodable {}" in swift_models["Tag"]["code"]
+
+
+def test_shared_coding_not_generated_without_dates(dated_schema: dict[str, Any]) -> None:
+    """Test that specs without date formats keep plain Codable DTOs unless shared coding is requested."""
+    del dated_schema["components"]["schemas"]["Event"]
+    swift_models = parse_openapi_to_swift(spec_dict=dated_schema)
+    assert "GeneratedCoding" not in swift_models
+    assert "GeneratedCodable" not in swift_models["Tag"]["code"]
+
+    swift_code = OpenAPISwiftModelGenerator(OpenAPISpec(spec_dict=dated_schema), shared_coding=True).generate_model("Tag")
+    assert "extension TagDTO: GeneratedCodable {}" in swift_code
+
+
+def test_date_only_round_trip(dated_schema: dict[str, Any]) -> None:
+    """Test that `date` properties decode and encode as `yyyy-MM-dd`, while `date-time` ones keep their timestamps."""
+    swift_models = parse_openapi_to_swift(spec_dict=dated_schema)
+    event_code = swift_models["Event"]["code"]
+    coding_code = swift_models["GeneratedCoding"]["code"]
+
+    assert "@DateOnly var day: Date" in event_code
+    assert "@DateOnly var endsOn: Date?" in event_code
+    # Nullable `anyOf` dates are generated as strings, so only plain `date` properties are wrapped
+    assert "let startsAt: String?" in event_code
+    # The model keeps plain dates, read through the wrapper
+    assert "var day: Date\n" in event_code
+
+    # Decoding tries the date-only formatter before the date-time ones, and encoding uses the date-only formatter
+    assert "guard let date = GeneratedCoding.dateOnly(from: string) else {" in coding_code
+    assert "dateFormatter.date(from: string) ?? date(from: string)" in coding_code
+    assert "try container.encode(GeneratedCoding.dateString(from: self))" in coding_code
+    assert "dateFormatter.string(from: date)" in coding_code
+    # Missing or nil optional dates are treated like other optional properties
+    assert "try decodeIfPresent(type, forKey: key) ?? DateOnly(wrappedValue: nil)" in coding_code
+    assert "if value.wrappedValue != nil {" in coding_code
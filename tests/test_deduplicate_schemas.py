@@ -0,0 +1,65 @@
+import logging
+from typing import Any
+
+import pytest
+
+from src.openapi.deduplicate_schemas import deduplicate_schemas
+from src.openapi.OpenAPISpec import OpenAPISpec
+from src.openapi.parse_openapi_to_swift import parse_openapi_to_swift
+
+
+def test_deduplicate_identical_enums() -> None:
+    """Test that identical enums collapse into the first one in spec order."""
+    openapi = OpenAPISpec(filepath="tests/test_data/test_response_generation.json")
+    deduplication = deduplicate_schemas(openapi)
+
+    assert deduplication.aliases == {"MealTypeEnum": "MealType"}
+    assert deduplication.summary() == "Deduplicated 1 of 35 schemas into 1 canonical schemas"
+
+
+def test_deduplication_summary_is_logged(capsys: pytest.CaptureFixture[str], caplog: pytest.LogCaptureFixture) -> None:
+    """Test that generating with deduplication logs its summary instead of printing it."""
+    with caplog.at_level(logging.INFO):
+        parse_openapi_to_swift(filepath="tests/test_data/test_response_generation.json", deduplicate=True)
+
+    assert capsys.readouterr().out == ""
+    assert "Deduplicated 1 of 35 schemas into 1 canonical schemas" in caplog.messages
+
+
+def test_deduplicate_through_references() -> None:
+    """Test that schemas which only differ in which duplicate they reference collapse too."""
+    spec_dict: dict[str, Any] = {
+        "openapi": "3.0.0",
+        "info": {"title": "Test API", "version": "1.0.0"},
+        "paths": {},
+        "components": {
+            "schemas": {
+                "FooResponse": {
+                    "type": "object",
+                    "title": "FooResponse",
+                    "properties": {"id": {"type": "string"}, "bar": {"$ref": "#/components/schemas/BarResponse"}},
+                    "required": ["id"],
+                },
+                "FooRead": {
+                    "type": "object",
+                    "title": "FooRead",
+                    "description": "A foo",
+                    "properties": {"id": {"type": "string"}, "bar": {"$ref": "#/components/schemas/BarRead"}},
+                    "required": ["id"],
+                },
+                "BarResponse": {"type": "object", "properties": {"title": {"type": "string", "title": "Title"}}},
+                "BarRead": {"type": "object", "properties": {"title": {"type": "string", "title": "Name"}}},
+                "Baz": {"type": "object", "properties": {"name": {"type": "string"}}},
+            }
+        },
+    }
+    openapi = OpenAPISpec(spec_dict=spec_dict)
+    assert deduplicate_schemas(openapi).aliases == {"FooRead": "FooResponse", "BarRead": "BarResponse"}
+
+    swift_models = parse_openapi_to_swift(spec_dict=spec_dict, deduplicate=True)
+    foo_read_code = swift_models["FooRead"]["code"]
+    assert "typealias FooRead = FooResponse\ntypealias FooReadDTO = FooResponseDTO" in foo_read_code
+    assert "typealias BarRead = BarResponse" in foo_read_code
+    assert "final class" not in foo_read_code
+    assert "FooResponse" in swift_models["FooRead"]["references"]
+    assert "final class FooResponse {" in swift_models["FooResponse"]["code"]
@@ -0,0 +1,92 @@
+import copy
+from typing import Any
+
+import pytest
+
+from src.openapi.GenerationCache import GenerationCache
+from src.openapi.parse_openapi_to_swift import parse_openapi_to_swift
+
+
+@pytest.fixture
+def pet_schema() -> dict[str, Any]:
+    """Create a sample OpenAPI schema with a discriminated oneOf."""
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Test API", "version": "1.0.0"},
+        "paths": {},
+        "components": {
+            "schemas": {
+                "Cat": {
+                    "type": "object",
+                    "properties": {"pet_type": {"type": "string", "const": "cat"}, "lives": {"type": "integer"}},
+                    "required": ["pet_type"],
+                },
+                "Dog": {"type": "object", "properties": {"pet_type": {"type": "string"}, "bark": {"type": "string"}}},
+                "Lizard": {"type": "object", "properties": {"pet_type": {"type": "string"}}},
+                "Pet": {
+                    "oneOf": [
+                        {"$ref": "#/components/schemas/Cat"},
+                        {"$ref": "#/components/schemas/Dog"},
+                        {"$ref": "#/components/schemas/Lizard"},
+                    ],
+                    "discriminator": {
+                        "propertyName": "pet_type",
+                        "mapping": {"dog": "#/components/schemas/Dog", "puppy": "Dog"},
+                    },
+                },
+                "Owner": {
+                    "type": "object",
+                    "properties": {"pets": {"type": "array", "items": {"$ref": "#/components/schemas/Pet"}}},
+                },
+            }
+        },
+    }
+
+
+def test_discriminated_one_of_generates_enum(pet_schema: dict[str, Any]) -> None:
+    """Test that a discriminated oneOf becomes an enum decoding through a table keyed by the discriminator."""
+    swift_models = parse_openapi_to_swift(spec_dict=pet_schema)
+    code = swift_models["Owner"]["code"]
+
+    assert "enum Pet: Codable, Hashable {" in code
+    assert "    case cat(CatDTO)" in code
+    assert "    case dog(DogDTO)" in code
+    assert "    case lizard(LizardDTO)" in code
+    assert 'case petType = "pet_type"' in code
+    # Values come from the mapping, the variant's const, or the variant's name
+    assert '"cat": { .cat(try CatDTO(from: $0)) },' in code
+    assert '"dog": { .dog(try DogDTO(from: $0)) },' in code
+    assert '"puppy": { .dog(try DogDTO(from: $0)) },' in code
+    assert '"Lizard": { .lizard(try LizardDTO(from: $0)) },' in code
+    # The discriminator is read once and dispatched through the table
+    assert code.count("container.decode(String.self, forKey: .petType)") == 1
+    assert "guard let decode = Pet.decoders[discriminator] else {" in code
+    assert "try?" not in code
+    assert "let pets: [Pet]?" in code
+
+
+def test_one_of_without_discriminator_is_unchanged(pet_schema: dict[str, Any]) -> None:
+    """Test that a oneOf without a discriminator isn't generated as an enum."""
+    del pet_schema["components"]["schemas"]["Pet"]["discriminator"]
+    code = parse_openapi_to_swift(spec_dict=pet_schema)["Owner"]["code"]
+
+    assert "enum Pet" not in code
+
+
+def test_cached_union_follows_its_variants(pet_schema: dict[str, Any]) -> None:
+    """Test that specs sharing a cache get a union generated for their own variants, not another spec's."""
+    cache = GenerationCache()
+    kitty_schema = copy.deepcopy(pet_schema)
+    kitty_schema["components"]["schemas"]["Cat"]["properties"]["pet_type"]["const"] = "kitty"
+    string_lizard_schema = copy.deepcopy(pet_schema)
+    string_lizard_schema["components"]["schemas"]["Lizard"] = {"type": "string"}
+
+    code = parse_openapi_to_swift(spec_dict=pet_schema, cache=cache)["Owner"]["code"]
+    kitty_code = parse_openapi_to_swift(spec_dict=kitty_schema, cache=cache)["Owner"]["code"]
+    string_lizard_code = parse_openapi_to_swift(spec_dict=string_lizard_schema, cache=cache)["Owner"]["code"]
+
+    assert '"cat": { .cat(try CatDTO(from: $0)) },' in code
+    assert '"kitty": { .cat(try CatDTO(from: $0)) },' in kitty_code and '"cat":' not in kitty_code
+    # A variant without a DTO can't be decoded by the union, so the oneOf isn't generated as one
+    assert "    case lizard(LizardDTO)" in code
+    assert "enum Pet" not in string_lizard_code and "case lizard" not in string_lizard_code
@@ -63,3 +63,25 @@ def test_direct_enum_generation(temp_enum_schema_file: str) -> None:
     assert 'case gal = "gal"' in swift_code
     assert 'case ml = "ml"' in swift_code
     assert 'case l = "l"' in swift_code
+
+
+def test_large_enum_generates_raw_representable_struct() -> None:
+    """Test that string enums above the threshold become RawRepresentable structs with static constants."""
+    spec_dict = {
+        "openapi": "3.0.0",
+        "info": {"title": "Test API", "version": "1.0.0"},
+        "paths": {},
+        "components": {"schemas": {"CountryCode": {"type": "string", "enum": ["US", "GB", "DE", "FR"]}}},
+    }
+    openapi = OpenAPISpec(spec_dict=spec_dict)
+
+    # Below the threshold a regular Swift enum is generated
+    swift_code = OpenAPISwiftModelGenerator(openapi).generate_model("CountryCode")
+    assert "enum CountryCode: String, Codable {" in swift_code
+
+    swift_code = OpenAPISwiftModelGenerator(openapi, enum_struct_threshold=3).generate_model("CountryCode")
+    assert "struct CountryCode: RawRepresentable, Codable, Hashable {" in swift_code
+    assert "    let rawValue: String" in swift_code
+    assert '    static let us = CountryCode(rawValue: "US")' in swift_code
+    assert '    static let fr = CountryCode(rawValue: "FR")' in swift_code
+    assert "case " not in swift_code
@@ -0,0 +1,40 @@
+import os
+from typing import Any
+
+from src.openapi.parse_openapi_to_swift import SINGLE_FILE_NAME, parse_openapi_to_swift, plan_swift_files, write_swift_files
+
+
+def test_bundling_respects_limits(many_enums_schema: dict[str, Any]) -> None:
+    """Test that every model is bundled exactly once and no shard exceeds the model limit."""
+    swift_models = parse_openapi_to_swift(spec_dict=many_enums_schema)
+    files = plan_swift_files(swift_models, max_models_per_file=8)
+
+    assert len(files) < len(swift_models)
+    declarations = [line for contents in files.values() for line in contents.splitlines() if line.startswith("enum ")]
+    assert sorted(declarations) == sorted(f"enum {name}: String, Codable {{" for name in swift_models)
+    assert all(contents.count("enum ") <= 8 for contents in files.values())
+    assert all(contents.count("// Generated code - do not modify") == 1 for contents in files.values())
+
+
+def test_bundling_is_stable(many_enums_schema: dict[str, Any]) -> None:
+    """Test that adding a model only changes the shard it lands in, not every shard after it."""
+    files = plan_swift_files(parse_openapi_to_swift(spec_dict=many_enums_schema), max_models_per_file=8)
+    assert files == plan_swift_files(parse_openapi_to_swift(spec_dict=many_enums_schema), max_models_per_file=8)
+
+    many_enums_schema["components"]["schemas"]["Status101"] = {"type": "string", "enum": ["active", "inactive"]}
+    new_files = plan_swift_files(parse_openapi_to_swift(spec_dict=many_enums_schema), max_models_per_file=8)
+
+    changed = {path for path in files.keys() | new_files.keys() if files.get(path) != new_files.get(path)}
+    assert 1 <= len(changed) <= 3
+
+
+def test_single_file_amalgamation(many_enums_schema: dict[str, Any], tmp_path: str) -> None:
+    """Test that all models can be written into a single file."""
+    swift_models = parse_openapi_to_swift(spec_dict=many_enums_schema)
+    output_dir = os.path.join(tmp_path, "Generated")
+    write_swift_files(swift_models, output_dir, single_file=True)
+
+    assert os.listdir(output_dir) == [SINGLE_FILE_NAME]
+    with open(os.path.join(output_dir, SINGLE_FILE_NAME), "r") as f:
+        content = f.read()
+    assert content.count("enum Status") == len(swift_models)
@@ -0,0 +1,132 @@
+import json
+import os
+import socket
+import stat
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from src.openapi.batch_generate import BatchEntry
+from src.openapi.generation_daemon import GenerationDaemon, default_socket_path, send_request, serve, write_with_daemon
+
+
+def test_generation_daemon(tmp_path: Path) -> None:
+    """Test that the daemon serves repeated requests from its cache and that the client works without it."""
+    socket_path = str(tmp_path / "daemon.sock")
+    entry = BatchEntry(openapi="tests/test_data/test_response_generation.json", output=str(tmp_path / "Generated"))
+
+    # Without a daemon the client generates in process
+    assert send_request({"command": "ping"}, socket_path) is None
+    result = write_with_daemon(entry, socket_path)
+    assert result.error is None and result.file_count == 16
+
+    server = threading.Thread(target=serve, args=(socket_path,))
+    server.start()
+    try:
+        deadline = time.monotonic() + 10
+        while send_request({"command": "ping"}, socket_path) is None:
+            assert time.monotonic() < deadline, "The daemon didn't start"
+            time.sleep(0.01)
+        # Only the user can connect
+        assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+
+        request = {"command": "generate", "entry": entry.model_dump()}
+        first = send_request(request, socket_path)
+        assert first is not None and first["ok"] and not first["cached"]
+        second = send_request(request, socket_path)
+        assert second is not None and second["cached"]
+        assert second["swift_models"] == first["swift_models"]
+
+        result = write_with_daemon(entry, socket_path)
+        assert result.error is None and result.file_count == 16
+        assert (tmp_path / "Generated" / "Root" / "AuthResponse.swift").exists()
+
+        missing = send_request({"command": "write", "entry": {"openapi": "missing.json", "output": "x"}}, socket_path)
+        assert missing is not None and not missing["ok"] and "missing.json" in missing["error"]
+    finally:
+        send_request({"command": "stop"}, socket_path)
+        server.join()
+    assert not Path(socket_path).exists()
+
+
+def test_generation_daemon_invalidates_on_referenced_files(tmp_path: Path) -> None:
+    """Test that a change to a file the spec references invalidates the daemon's output and parsed spec."""
+    statuses = ["active"]
+    common = {"components": {"schemas": {"Status": {"type": "string", "enum": statuses}}}}
+    spec = {
+        "openapi": "3.1.0",
+        "info": {"title": "Test API", "version": "1.0.0"},
+        "paths": {},
+        "components": {"schemas": {"Status": {"$ref": "common.json#/components/schemas/Status"}}},
+    }
+    (tmp_path / "common.json").write_text(json.dumps(common))
+    (tmp_path / "spec.json").write_text(json.dumps(spec))
+    daemon = GenerationDaemon()
+    entry = BatchEntry(openapi=str(tmp_path / "spec.json"), output=str(tmp_path / "Generated"))
+
+    swift_models, cached = daemon.generate(entry)
+    assert not cached and "archived" not in swift_models["Status"]["code"]
+    assert daemon.generate(entry)[1]
+
+    statuses.append("archived")
+    (tmp_path / "common.json").write_text(json.dumps(common))
+    os.utime(tmp_path / "common.json", ns=(time.time_ns(), time.time_ns() + 10**9))
+    swift_models, cached = daemon.generate(entry)
+    assert not cached and "archived" in swift_models["Status"]["code"]
+
+    # The outputs and parsed spec of the outdated version are evicted
+    assert len(daemon._outputs) == 1 and len(daemon.cache._specs) == 1
+    daemon.generate(entry.model_copy(update={"identity_equality": True}))
+    assert len(daemon._outputs) == 2
+    daemon.max_outputs = 1
+    daemon.generate(entry.model_copy(update={"deduplicate": True}))
+    assert len(daemon._outputs) == 1
+
+
+def test_send_request_without_reply(tmp_path: Path) -> None:
+    """Test that a daemon that times out or closes the connection without replying is treated as not running."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(tmp_path / "silent.sock"))
+        server.listen()
+        # Nobody accepts the connection, so the request times out
+        assert send_request({"command": "ping"}, str(tmp_path / "silent.sock"), timeout=0.1) is None
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(tmp_path / "closing.sock"))
+        server.listen()
+
+        def close_without_reply() -> None:
+            connection, _ = server.accept()
+            connection.close()
+
+        closer = threading.Thread(target=close_without_reply)
+        closer.start()
+        assert send_request({"command": "ping"}, str(tmp_path / "closing.sock"), timeout=5) is None
+        closer.join()
+
+
+def test_daemon_socket_is_private(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the default socket is in a private directory and sockets of other users are refused."""
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path / "runtime"))
+    assert default_socket_path() == str(tmp_path / "runtime" / "swift-generator.sock")
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    socket_dir = tmp_path / f"swift-generator-{os.getuid()}"
+    assert default_socket_path() == str(socket_dir / "swift-generator.sock")
+    # A directory others can access isn't used
+    socket_dir.mkdir(mode=0o755)
+    socket_dir.chmod(0o755)
+    with pytest.raises(RuntimeError, match="only its owner can access"):
+        serve()
+
+    socket_path = tmp_path / "daemon.sock"
+    socket_path.touch()
+    other_uid = os.getuid() + 1
+    monkeypatch.setattr(os, "getuid", lambda: other_uid)
+    with pytest.raises(RuntimeError, match="owned by another user"):
+        serve(str(socket_path))
+    with pytest.raises(RuntimeError, match="owned by another user"):
+        send_request({"command": "ping"}, str(socket_path))
@@ -0,0 +1,47 @@
+from src.openapi.OpenAPISpec import OpenAPISpec
+from src.openapi.OpenAPISwiftModelGenerator import OpenAPISwiftModelGenerator
+from src.openapi.parse_openapi_to_swift import parse_openapi_to_swift
+
+
+def test_importer_generation() -> None:
+    """Test that a root group gets a ModelActor importer that upserts every object model in batches."""
+    openapi = OpenAPISpec(filepath="tests/test_data/test_response_generation.json")
+    swift_code = OpenAPISwiftModelGenerator(openapi).generate_importer(
+        "AuthResponse", ["AuthResponse", "UserResponse", "SessionResponse"]
+    )
+    assert swift_code is not None
+
+    assert "@ModelActor\nactor AuthResponseImporter {" in swift_code
+    assert "func importAuthResponse(from data: Data, batchSize: Int = 500) throws {" in swift_code
+    assert "try GeneratedCoding.decoder.decode([AuthResponseDTO].self, from: data)" in swift_code
+
+    # Models with an id are matched against existing rows, models without one are always inserted
+    assert "FetchDescriptor<UserResponse>(predicate: #Predicate { $0.id == key })" in swift_code
+    assert "modelContext.insert(SessionResponse(item: dto))" in swift_code
+    assert "FetchDescriptor<SessionResponse>" not in swift_code
+
+    # Batches look up their existing models with one fetch instead of one fetch per DTO
+    assert "let keys = batch.map(\\.id)" in swift_code
+    assert "FetchDescriptor<UserResponse>(predicate: #Predicate { keys.contains($0.id) })" in swift_code
+    assert "if let model = existing[dto.id] {" in swift_code
+    assert "try upsert($0)" not in swift_code
+
+    # Every batch is saved inside its own autorelease pool
+    assert "try autoreleasepool {" in swift_code
+    assert "try modelContext.save()" in swift_code
+
+
+def test_importer_skipped_for_enum_groups() -> None:
+    """Test that groups without object models don't get an importer."""
+    openapi = OpenAPISpec(filepath="tests/test_data/test_response_generation.json")
+    assert OpenAPISwiftModelGenerator(openapi).generate_importer("MealType", ["MealType"]) is None
+
+
+def test_importers_are_opt_in() -> None:
+    """Test that importers are only appended to root groups when requested."""
+    swift_models = parse_openapi_to_swift(filepath="tests/test_data/test_response_generation.json")
+    assert "actor RecipeResponseImporter" not in swift_models["RecipeResponse"]["code"]
+
+    swift_models = parse_openapi_to_swift(filepath="tests/test_data/test_response_generation.json", include_importers=True)
+    assert "actor RecipeResponseImporter" in swift_models["RecipeResponse"]["code"]
+    assert "func upsert(_ dto: RecipeStepResponseDTO) throws {" in swift_models["RecipeResponse"]["code"]
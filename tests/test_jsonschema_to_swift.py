@@ -0,0 +1,69 @@
+import json
+from pathlib import Path
+from typing import Any
+
+from src.jsonschema.parse_jsonschema_to_swift import iter_jsonschema_swift_models, parse_jsonschema_to_swift
+from src.openapi.OpenAPISpec import OpenAPISpec
+from src.openapi.parse_openapi_to_swift import write_swift_files_streaming
+
+
+def _bundle() -> dict[str, Any]:
+    return {
+        "$schema": "https://json-schema.org/draft/2020-12/schema",
+        "$id": "https://example.com/events.json",
+        "title": "OrderPlaced",
+        "type": "object",
+        "properties": {"order": {"$ref": "#/$defs/Order"}, "placed_at": {"type": "string", "format": "date-time"}},
+        "required": ["order"],
+        "$defs": {
+            "Status": {"type": "string", "enum": ["open", "closed"]},
+            "Entity": {"type": "object", "properties": {"id": {"type": "string"}}, "required": ["id"]},
+            "Order": {
+                "allOf": [{"$ref": "#/$defs/Entity"}],
+                "properties": {
+                    "status": {"$ref": "#/$defs/Status"},
+                    "lines": {"type": "array", "items": {"$ref": "#/$defs/OrderLine"}},
+                },
+            },
+            "OrderLine": {"type": "object", "properties": {"sku": {"type": "string"}, "quantity": {"type": "integer"}}},
+        },
+    }
+
+
+def test_defs_are_named_schemas() -> None:
+    """Test that `$defs` and a titled root schema become named schemas, with `$defs` references followed."""
+    spec = OpenAPISpec.from_json_schema(schema_dict=_bundle())
+
+    assert set(spec.schemas) == {"Status", "Entity", "Order", "OrderLine", "OrderPlaced"}
+    assert list(spec.schemas["Order"].properties or {}) == ["id", "status", "lines"]
+    assert sorted(spec.schemas["OrderPlaced"].get_references()) == ["Order"]
+    # Order has Entity's properties, so it no longer references it
+    assert spec.get_reachable_schemas(["OrderPlaced"]) == {"OrderPlaced", "Order", "Status", "OrderLine"}
+
+    swift_models = parse_jsonschema_to_swift(schema_dict=_bundle())
+    assert set(swift_models["OrderPlaced"]["schemas"]) == {"OrderPlaced", "Order", "Status", "OrderLine"}
+    code = swift_models["OrderPlaced"]["code"]
+    assert "let order: Order" in code
+    assert "let placedAt: Date?" in code
+    assert "let lines: [OrderLine]?" in code
+    assert "enum Status: String, Codable" in code
+
+
+def test_bundle_files_are_streamed(tmp_path: Path) -> None:
+    """Test that a bundle referencing another file is loaded from disk and written one entry at a time."""
+    (tmp_path / "common.json").write_text(
+        json.dumps({"$defs": {"Money": {"type": "object", "properties": {"amount": {"type": "number"}}}}})
+    )
+    bundle = _bundle()
+    bundle["$defs"]["OrderLine"]["properties"]["price"] = {"$ref": "common.json#/$defs/Money"}
+    schema_path = tmp_path / "events.json"
+    schema_path.write_text(json.dumps(bundle))
+
+    output_dir = tmp_path / "Generated"
+    file_count = write_swift_files_streaming(iter_jsonschema_swift_models(filepath=str(schema_path)), str(output_dir))
+
+    # OrderPlaced's group, Entity's group and the shared coding support
+    assert file_count == 3
+    code = (output_dir / "Root" / "OrderPlaced.swift").read_text()
+    assert "let price: Money?" in code
+    assert "struct MoneyDTO" in code
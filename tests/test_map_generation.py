@@ -0,0 +1,74 @@
+from typing import Any
+
+import pytest
+
+from src.openapi.parse_openapi_to_swift import parse_openapi_to_swift
+
+
+@pytest.fixture
+def map_schema() -> dict[str, Any]:
+    """Create a sample OpenAPI schema with map-shaped and free-form object properties."""
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Test API", "version": "1.0.0"},
+        "paths": {},
+        "components": {
+            "schemas": {
+                "Owner": {"type": "object", "properties": {"name": {"type": "string"}}},
+                "Pet": {
+                    "type": "object",
+                    "properties": {
+                        "owners": {"type": "object", "additionalProperties": {"$ref": "#/components/schemas/Owner"}},
+                        "scores": {"type": "object", "additionalProperties": {"type": "integer"}},
+                        "nested": {
+                            "type": "object",
+                            "additionalProperties": {"type": "array", "items": {"type": "string"}},
+                        },
+                        "metadata": {"type": "object"},
+                    },
+                    "required": ["scores"],
+                },
+            }
+        },
+    }
+
+
+def test_additional_properties_generate_typed_maps(map_schema: dict[str, Any]) -> None:
+    """Test that additionalProperties schemas become typed dictionaries that reference their value schema."""
+    swift_models = parse_openapi_to_swift(spec_dict=map_schema)
+    code = swift_models["Pet"]["code"]
+
+    assert "let owners: [String: Owner]?" in code
+    assert "let scores: [String: Int]" in code
+    assert "let nested: [String: [String]]?" in code
+    assert "Dictionary<String, Any>" not in code
+    assert "Owner" in swift_models["Pet"]["schemas"]
+
+
+def test_free_form_objects_use_json_value(map_schema: dict[str, Any]) -> None:
+    """Test that free-form objects are generated as the shared Codable JSONValue type."""
+    swift_models = parse_openapi_to_swift(spec_dict=map_schema)
+
+    assert "let metadata: JSONValue?" in swift_models["Pet"]["code"]
+    assert "JSONValue" in swift_models["Pet"]["references"]
+    assert "enum JSONValue: Codable, Hashable {" in swift_models["JSONValue"]["code"]
+
+    del map_schema["components"]["schemas"]["Pet"]["properties"]["metadata"]
+    assert "JSONValue" not in parse_openapi_to_swift(spec_dict=map_schema)
+
+
+def test_untyped_maps_use_json_value(map_schema: dict[str, Any]) -> None:
+    """Test that maps whose values can be any JSON are generated as Codable JSONValue dictionaries."""
+    properties = map_schema["components"]["schemas"]["Pet"]["properties"]
+    del properties["metadata"]
+    properties["labels"] = {"type": "object", "additionalProperties": True}
+    properties["extras"] = {"type": "object", "additionalProperties": {}}
+    properties["notes"] = {"type": "object", "additionalProperties": {"description": "Anything"}}
+    swift_models = parse_openapi_to_swift(spec_dict=map_schema)
+    code = swift_models["Pet"]["code"]
+
+    assert "let labels: [String: JSONValue]?" in code
+    assert "let extras: [String: JSONValue]?" in code
+    assert "let notes: [String: JSONValue]?" in code
+    assert "Any" not in code
+    assert "enum JSONValue: Codable, Hashable {" in swift_models["JSONValue"]["code"]
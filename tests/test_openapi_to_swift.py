@@ -78,3 +78,17 @@ def test_unique_key_handling(temp_schema_file: str) -> None:
     # Check that the name property doesn't have the unique attribute
     assert "@Attribute(.unique) var name:" not in swift_code
     assert "var name: String" in swift_code
+
+
+def test_identity_equality(temp_schema_file: str) -> None:
+    """Test that DTOs hash and compare by their id only when identity equality is enabled."""
+    openapi = OpenAPISpec(temp_schema_file)
+
+    # Synthesized conformance by default
+    swift_code = OpenAPISwiftModelGenerator(openapi).generate_model("Pet")
+    assert "func hash(into hasher: inout Hasher)" not in swift_code
+
+    swift_code = OpenAPISwiftModelGenerator(openapi, identity_equality=True).generate_model("Pet")
+    assert "struct PetDTO: Codable, Hashable, Identifiable {" in swift_code
+    assert "static func == (lhs: PetDTO, rhs: PetDTO) -> Bool {\n        lhs.id == rhs.id\n    }" in swift_code
+    assert "func hash(into hasher: inout Hasher) {\n        hasher.combine(id)\n    }" in swift_code
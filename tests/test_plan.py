@@ -0,0 +1,38 @@
+import os
+from typing import Any
+
+from src.openapi.parse_openapi_to_swift import (
+    PlannedChange,
+    iter_entry_files,
+    iter_planned_changes,
+    iter_swift_models,
+    parse_openapi_to_swift,
+    plan_swift_files,
+    write_swift_files,
+)
+
+
+def test_plan_compares_without_writing(many_enums_schema: dict[str, Any], tmp_path: Any) -> None:
+    """Test that planning lists added, modified and removed files with line counts and leaves the output untouched."""
+    output_dir = str(tmp_path / "Generated")
+    write_swift_files(parse_openapi_to_swift(spec_dict=many_enums_schema), output_dir)
+    schemas = many_enums_schema["components"]["schemas"]
+    schemas["Status000"]["enum"].append("archived")
+    del schemas["Status002"]
+    schemas["Priority"] = {"type": "string", "enum": ["low", "high"]}
+    modification_times = {entry.path: entry.stat().st_mtime_ns for entry in os.scandir(os.path.join(output_dir, "Root"))}
+
+    planned_files = plan_swift_files(parse_openapi_to_swift(spec_dict=many_enums_schema))
+    changes = list(iter_planned_changes(planned_files.items(), output_dir))
+
+    assert changes == [
+        PlannedChange(path=os.path.join("Root", "Status000.swift"), status="modified", lines_added=1),
+        PlannedChange(path=os.path.join("Root", "Priority.swift"), status="added", lines_added=11),
+        PlannedChange(path=os.path.join("Root", "Status002.swift"), status="removed", lines_removed=11),
+    ]
+    # Streaming the entries plans the same changes
+    streamed_files = iter_entry_files(iter_swift_models(spec_dict=many_enums_schema))
+    assert list(iter_planned_changes(streamed_files, output_dir)) == changes
+    assert modification_times == {
+        entry.path: entry.stat().st_mtime_ns for entry in os.scandir(os.path.join(output_dir, "Root"))
+    }
@@ -0,0 +1,100 @@
+import importlib.util
+import textwrap
+from pathlib import Path
+
+from src.pydantic_source_to_swift import parse_pydantic_source_to_swift
+from src.pydantic_to_swift import parse_pydantic_to_swift
+
+MODELS_SOURCE = '''
+import enum
+from typing import Annotated, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class Role(str, enum.Enum):
+    ADMIN = "admin"
+    MEMBER = "member"
+
+
+class Team(BaseModel):
+    """A team of users."""
+
+    name: str
+
+
+class User(BaseModel):
+    id: int
+    name: str = Field(..., description="The full name")
+    email: str | None = None
+    age: int = 18
+    scores: list[float]
+    role: Optional[Role] = None
+    teams: dict[str, Team] = {}
+    kind: Literal["person", "bot"] = "person"
+    nickname: Annotated[str, Field(max_length=32)] = Field("", alias="nick_name")
+    manager: Optional["User"] = None
+'''
+
+
+def _write_package(root: Path) -> None:
+    package = root / "app"
+    (package / "api").mkdir(parents=True)
+    (package / "__init__.py").write_text("")
+    (package / "models.py").write_text(textwrap.dedent(MODELS_SOURCE))
+    (package / "api" / "__init__.py").write_text("")
+    # Importing this module would fail, so it can only be converted from its source
+    (package / "api" / "responses.py").write_text(
+        textwrap.dedent(
+            """
+            import app.models as models
+            import not_installed_package
+            from pydantic import RootModel
+
+            from ..models import Team, User
+
+            raise RuntimeError("imported")
+
+
+            class Page(models.Team):
+                users: list[User]
+                next_team: Team | None = None
+
+
+            class Teams(RootModel[list[Team]]):
+                pass
+
+
+            class Helper:
+                value: int
+            """
+        )
+    )
+
+
+def test_source_matches_runtime_conversion(tmp_path: Path) -> None:
+    """Test that converting models from their source gives the same Swift code as converting the imported models."""
+    _write_package(tmp_path)
+    models_path = tmp_path / "app" / "models.py"
+    spec = importlib.util.spec_from_file_location("static_models", models_path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    assert parse_pydantic_source_to_swift([str(models_path)]) == parse_pydantic_to_swift(module)
+
+
+def test_imports_are_resolved_without_importing(tmp_path: Path) -> None:
+    """Test that models using models from other modules are converted without running any of the sources."""
+    _write_package(tmp_path)
+    swift_models = parse_pydantic_source_to_swift([str(tmp_path / "app" / "api")], source_roots=[str(tmp_path)])
+
+    # Team and User are shared by both modules' models, so they are generated on their own
+    assert set(swift_models) == {"Page", "Teams", "Team", "User", "Role"}
+    page_code = swift_models["Page"]["code"]
+    # Inherited fields come first
+    assert page_code.index("let name: String") < page_code.index("let users: [User]")
+    assert "let nextTeam: Team?" in page_code
+    assert "var items: [Team]" in swift_models["Teams"]["code"]
+    assert "let manager: User?" in swift_models["User"]["code"]
+    assert "Helper" not in "".join(model["code"] for model in swift_models.values())
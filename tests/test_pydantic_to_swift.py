@@ -1,5 +1,20 @@
-from pydantic import BaseModel
-from src.pydantic_to_swift import generate_swiftdata_model
+import enum
+import sys
+from typing import Annotated, Literal, Optional
+
+import pytest
+from pydantic import BaseModel, Field
+
+from src import generate_swiftdata_model, parse_pydantic_to_swift
+
+
+class Role(str, enum.Enum):
+    ADMIN = "admin"
+    MEMBER = "member"
+
+
+class Team(BaseModel):
+    name: str
 
 
 class User(BaseModel):
@@ -8,11 +23,49 @@ class User(BaseModel):
     email: str | None = None
     age: int = 18
     scores: list[float]
+    role: Optional[Role] = None
+    teams: dict[str, Team] = {}
+    kind: Literal["person", "bot"] = "person"
+    nickname: Annotated[str, Field(max_length=32)] = Field("", alias="nick_name")
 
 
 def test_generate_swiftdata_model() -> None:
     swift_model = generate_swiftdata_model(User)
-    # assert "class User" in swift_model
-    # assert "@Model" in swift_model
-    # assert "var id: Int" in swift_model
-    # assert "var email: String?" in swift_model
+    assert "final class User" in swift_model
+    assert "@Model" in swift_model
+    assert "var id: Int" in swift_model
+    assert "var email: String?" in swift_model
+    assert "var scores: [Double]" in swift_model
+    assert "var role: Role?" in swift_model
+    assert "var teams: [String: Team]?" in swift_model
+    assert "var nickName: String?" in swift_model
+
+
+def test_self_referencing_model() -> None:
+    """Test that a model referencing itself is converted once."""
+
+    class Category(BaseModel):
+        name: str
+        parent: Optional["Category"] = None
+        children: list["Category"] = []
+
+    swift_model = generate_swiftdata_model(Category)
+    assert "var parent: Category?" in swift_model
+    assert "var children: [Category]?" in swift_model
+
+
+def test_parse_pydantic_to_swift_groups_by_dependency() -> None:
+    """Test that a module's models are converted with the models and enums they use, grouped like OpenAPI output."""
+    swift_models = parse_pydantic_to_swift(sys.modules[__name__])
+
+    assert swift_models.keys() == {"User"}
+    assert set(swift_models["User"]["schemas"]) == {"User", "Role", "Team"}
+    assert "enum Role: String, Codable {" in swift_models["User"]["code"]
+    assert parse_pydantic_to_swift([Team, Role]).keys() == {"Team", "Role"}
+
+
+def test_conflicting_names_are_rejected() -> None:
+    """Test that two different models with the same name raise an error instead of overwriting each other."""
+    OtherTeam = type("Team", (BaseModel,), {"__annotations__": {"size": int}})
+    with pytest.raises(ValueError, match="Two types are named Team"):
+        parse_pydantic_to_swift([Team, OtherTeam])
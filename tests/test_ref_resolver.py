@@ -0,0 +1,98 @@
+from pathlib import Path
+
+import pytest
+import yaml
+
+from src.openapi.OpenAPISpec import OpenAPISpec
+from src.openapi.parse_openapi_to_swift import parse_openapi_to_swift
+from src.openapi.RefResolver import RefResolver, schema_name_from_ref
+from src.openapi.schemas.Response import Response
+
+
+def test_resolve_json_pointers() -> None:
+    """Test that pointers are unescaped, chains of references are followed and cycles are detected."""
+    document = {
+        "paths": {"/pets/{id}": {"get": {"responses": {"404": {"$ref": "#/components/responses/Missing"}}}}},
+        "components": {
+            "responses": {
+                "NotFound": {"description": "Not found"},
+                "Missing": {"$ref": "#/components/responses/NotFound"},
+                "Loop": {"$ref": "#/components/responses/Loop"},
+            }
+        },
+    }
+    resolver = RefResolver(document)
+
+    assert resolver.resolve("#/paths/~1pets~1{id}/get/responses/404") == {"description": "Not found"}
+    assert resolver.resolve("#/components/responses/Missing") == {"description": "Not found"}
+    with pytest.raises(ValueError, match="Circular \\$ref"):
+        resolver.resolve("#/components/responses/Loop")
+    with pytest.raises(ValueError, match="Could not resolve \\$ref"):
+        resolver.resolve("#/components/responses/Gone")
+
+    assert schema_name_from_ref("#/components/schemas/Pet") == "Pet"
+    assert schema_name_from_ref("#/$defs/Pet") == "Pet"
+    assert schema_name_from_ref("#/components/responses/Pet") is None
+
+
+def test_multi_file_spec(tmp_path: Path) -> None:
+    """Test that references to other files are bundled into the spec."""
+    (tmp_path / "schemas").mkdir()
+    (tmp_path / "schemas" / "pet.yaml").write_text(
+        yaml.safe_dump(
+            {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string"},
+                    "owner": {"$ref": "common.yaml#/Owner"},
+                    "parent": {"$ref": "pet.yaml"},
+                },
+                "required": ["id"],
+            }
+        )
+    )
+    (tmp_path / "schemas" / "common.yaml").write_text(
+        yaml.safe_dump(
+            {
+                "Owner": {"type": "object", "properties": {"name": {"type": "string"}}},
+                "NotFound": {"description": "Not found"},
+            }
+        )
+    )
+    (tmp_path / "openapi.yaml").write_text(
+        yaml.safe_dump(
+            {
+                "openapi": "3.0.0",
+                "info": {"title": "Pets", "version": "1.0.0"},
+                "paths": {
+                    "/pets/{id}": {
+                        "get": {
+                            "responses": {
+                                "200": {
+                                    "description": "A pet",
+                                    "content": {"application/json": {"schema": {"$ref": "schemas/pet.yaml"}}},
+                                },
+                                "404": {"$ref": "#/components/responses/NotFound"},
+                            }
+                        }
+                    }
+                },
+                "components": {
+                    "schemas": {"Pet": {"$ref": "schemas/pet.yaml"}},
+                    "responses": {"NotFound": {"$ref": "schemas/common.yaml#/NotFound"}},
+                },
+            }
+        )
+    )
+
+    openapi = OpenAPISpec(filepath=str(tmp_path / "openapi.yaml"))
+    assert sorted(openapi.schemas) == ["Owner", "Pet"]
+    assert sorted(openapi.schemas["Pet"].get_references()) == ["Owner", "Pet"]
+    assert openapi.get_operation_schemas() == {"Pet"}
+
+    not_found = openapi.resolve("#/components/responses/NotFound")
+    assert isinstance(not_found, Response)
+    assert not_found.description == "Not found"
+
+    swift_models = parse_openapi_to_swift(filepath=str(tmp_path / "openapi.yaml"))
+    assert "var owner: Owner?" in swift_models["Pet"]["code"]
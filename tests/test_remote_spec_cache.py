@@ -0,0 +1,113 @@
+import hashlib
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from src.openapi.OpenAPISpec import OpenAPISpec
+from src.openapi.RemoteSpecCache import RemoteSpecCache
+
+SPEC_PATH = Path("tests/test_data/test_response_generation.json")
+
+
+class _SpecServer(ThreadingHTTPServer):
+    body = SPEC_PATH.read_bytes()
+    # (path, If-None-Match, If-Modified-Since, status) of every request
+    requests: list[tuple[str, str | None, str | None, int]]
+
+
+class _SpecHandler(BaseHTTPRequestHandler):
+    server: _SpecServer
+
+    def do_GET(self) -> None:
+        etag = '"' + hashlib.sha256(self.server.body).hexdigest()[:16] + '"'
+        last_modified = "Mon, 19 Oct 2026 00:00:00 GMT"
+        status = 304 if self.headers.get("If-None-Match") == etag else 200
+        self.server.requests.append(
+            (self.path, self.headers.get("If-None-Match"), self.headers.get("If-Modified-Since"), status)
+        )
+        self.send_response(status)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        if status == 200:
+            self.send_header("Content-Length", str(len(self.server.body)))
+        self.end_headers()
+        if status == 200:
+            self.wfile.write(self.server.body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def spec_server() -> Iterator[_SpecServer]:
+    server = _SpecServer(("127.0.0.1", 0), _SpecHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        thread.join()
+        server.server_close()
+
+
+def test_unchanged_specs_are_not_downloaded_again(spec_server: _SpecServer, tmp_path: Path) -> None:
+    """Test that a remote spec is cached with its validators and refreshed with conditional requests."""
+    url = f"http://127.0.0.1:{spec_server.server_address[1]}/openapi.json"
+    cache = RemoteSpecCache(str(tmp_path / "cache"))
+
+    first = cache.fetch(url)
+    assert first.modified
+    assert Path(first.path).read_bytes() == SPEC_PATH.read_bytes()
+    options = {"output": "Generated", "deduplicate": False}
+    assert not cache.is_generated(first, options)
+    cache.record_generation(first, options)
+
+    second = cache.fetch(url)
+    assert not second.modified and second.path == first.path
+    assert cache.is_generated(second, options)
+    assert not cache.is_generated(second, {**options, "deduplicate": True})
+    first_request, second_request = spec_server.requests
+    assert first_request[1:] == (None, None, 200)
+    assert second_request[1] is not None and second_request[2:] == ("Mon, 19 Oct 2026 00:00:00 GMT", 304)
+
+    spec_server.body = spec_server.body.replace(b"AuthResponse", b"LoginResponse")
+    third = cache.fetch(url)
+    assert third.modified and spec_server.requests[2][3] == 200
+    assert not cache.is_generated(third, options)
+    assert "LoginResponse" in OpenAPISpec(filepath=url, remote_cache=cache).schemas
+
+
+def test_fetch_errors_are_reported(spec_server: _SpecServer, tmp_path: Path) -> None:
+    """Test that an unreachable spec raises an error naming the URL."""
+    url = f"http://127.0.0.1:{spec_server.server_address[1]}/openapi.json"
+    spec_server.shutdown()
+    spec_server.server_close()
+    with pytest.raises(RuntimeError, match="Failed to fetch OpenAPI spec"):
+        RemoteSpecCache(str(tmp_path), timeout=1).fetch(url)
+
+
+def test_command_line_skips_on_output_options_only(spec_server: _SpecServer, tmp_path: Path) -> None:
+    """Test that the command line skips an unchanged remote spec unless it plans or an output option differs."""
+    url = f"http://127.0.0.1:{spec_server.server_address[1]}/openapi.json"
+    command = [sys.executable, "-m", "src.openapi.parse_openapi_to_swift", "--openapi", url]
+    command += ["--output", str(tmp_path / "Generated"), "--spec-cache-dir", str(tmp_path / "cache")]
+
+    def _run(*options: str) -> str:
+        return subprocess.run(command + list(options), capture_output=True, text=True, check=True).stdout
+
+    assert "skipping generation" not in _run()
+    # Writing with other threads doesn't change the output
+    assert "skipping generation" in _run("--write-workers", "2", "--fsync")
+    # Plans are computed even for an unchanged spec, and match the generated output
+    plan = _run("--plan")
+    assert "skipping generation" not in plan and "0 added, 0 modified, 0 removed" in plan
+    # Planning doesn't record a generation, so it doesn't affect the next run
+    assert "skipping generation" in _run()
+    assert "skipping generation" not in _run("--deduplicate")
@@ -0,0 +1,45 @@
+from typing import Any
+
+from src.openapi.enums.HttpMethod import EnumHttpMethod
+from src.openapi.OpenAPISpec import OpenAPISpec
+
+
+def test_spec_index() -> None:
+    """Test that operations and responses can be looked up without scanning the spec."""
+    schema_ref = {"content": {"application/json": {"schema": {"$ref": "#/components/schemas/Pet"}}}}
+    spec_dict: dict[str, Any] = {
+        "openapi": "3.0.0",
+        "info": {"title": "Test API", "version": "1.0.0"},
+        "paths": {
+            "/pets": {
+                "get": {
+                    "operationId": "listPets",
+                    "tags": ["pets"],
+                    "responses": {"200": {"description": "Pets", **schema_ref}, "default": {"description": "Error"}},
+                },
+                "post": {
+                    "operationId": "createPet",
+                    "tags": ["pets", "admin"],
+                    "requestBody": schema_ref,
+                    "responses": {"201": {"description": "Created"}, "409": {"description": "Conflict"}},
+                },
+            },
+            "/owners": {"get": {"operationId": "listOwners", "responses": {"4XX": {"description": "Bad request"}}}},
+        },
+        "components": {"schemas": {"Pet": {"type": "object", "properties": {"id": {"type": "string"}}}}},
+    }
+    index = OpenAPISpec(spec_dict=spec_dict).index
+
+    create_pet = index.get_operation("createPet")
+    assert create_pet is not None
+    assert (create_pet.path, create_pet.method) == ("/pets", EnumHttpMethod.post)
+    assert index.by_path_method[("/owners", EnumHttpMethod.get)].operation.operationId == "listOwners"
+    assert [record.operation.operationId for record in index.get_operations_by_tag("pets")] == ["listPets", "createPet"]
+    assert [record.operation.operationId for record in index.get_operations_by_schema("Pet")] == ["listPets", "createPet"]
+
+    assert [record.status_code for record in index.get_responses_by_status_class(404)] == ["409", "4XX"]
+    assert [record.status_code for record in index.get_responses_by_status_class("2XX")] == ["200", "201"]
+    assert [record.path for record in index.get_responses_by_status_class("default")] == ["/pets"]
+
+    # Indexes are built once
+    assert index.operations is index.operations
@@ -0,0 +1,71 @@
+import copy
+from typing import Any
+
+from conftest import spec_with_schemas
+
+from src.openapi.OpenAPISpec import OpenAPISpec
+from src.openapi.parse_openapi_to_swift import parse_openapi_to_swift
+
+
+def _spec_dict() -> dict[str, Any]:
+    nullable_owner = {"anyOf": [{"$ref": "#/components/schemas/Owner"}, {"type": "null"}]}
+    return spec_with_schemas(
+        {
+            "Owner": {"type": "object", "properties": {"name": {"type": "string"}}},
+            "Cat": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string", "description": "The name"},
+                    "owner": nullable_owner,
+                    "lives": {"type": "integer", "default": 1},
+                },
+                "required": ["name"],
+            },
+            "Dog": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string", "description": "The name"},
+                    "owner": nullable_owner,
+                    "lives": {"type": "integer", "default": 1.0},
+                },
+                "required": ["name"],
+            },
+            # Identical to Owner, but still a model of its own
+            "Breeder": {"type": "object", "properties": {"name": {"type": "string"}}},
+        }
+    )
+
+
+def test_identical_schemas_are_shared() -> None:
+    """Test that identical inline schemas and strings share one instance, without changing the generated code."""
+    spec = OpenAPISpec(spec_dict=_spec_dict(), intern=True)
+    cat_properties = spec.schemas["Cat"].properties or {}
+    dog_properties = spec.schemas["Dog"].properties or {}
+
+    assert cat_properties["name"] is dog_properties["name"]
+    assert cat_properties["owner"] is dog_properties["owner"]
+    assert cat_properties["name"].description is dog_properties["name"].description
+    # 1 and 1.0 are equal in Python but not in a schema
+    assert cat_properties["lives"] is not dog_properties["lives"]
+    assert spec.schemas["Owner"] is not spec.schemas["Breeder"]
+
+    assert parse_openapi_to_swift(openapi=spec) == parse_openapi_to_swift(spec_dict=_spec_dict())
+
+
+def test_interning_is_opt_in_and_leaves_the_document_unchanged() -> None:
+    """Test that specs are only interned on request, without modifying the document they are loaded from."""
+    spec_dict = _spec_dict()
+    cat_properties = spec_dict["components"]["schemas"]["Cat"]["properties"]
+    dog_properties = spec_dict["components"]["schemas"]["Dog"]["properties"]
+    # Strings built at runtime aren't interned by Python
+    cat_properties["name"]["description"] = "".join(["The ", "name"])
+    description = cat_properties["name"]["description"]
+    original = copy.deepcopy(spec_dict)
+
+    spec = OpenAPISpec(spec_dict=spec_dict)
+    assert (spec.schemas["Cat"].properties or {})["name"] is not (spec.schemas["Dog"].properties or {})["name"]
+
+    OpenAPISpec(spec_dict=spec_dict, intern=True)
+    assert spec_dict == original
+    assert cat_properties["name"]["description"] is description
+    assert dog_properties["name"]["description"] is not description
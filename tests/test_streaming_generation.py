@@ -0,0 +1,23 @@
+from pathlib import Path
+from typing import Any
+
+from src.openapi.parse_openapi_to_swift import (
+    iter_swift_models,
+    parse_openapi_to_swift,
+    write_swift_files,
+    write_swift_files_streaming,
+)
+
+
+def _read_tree(root: Path) -> dict[str, str]:
+    return {str(path.relative_to(root)): path.read_text(encoding="utf-8") for path in root.rglob("*") if path.is_file()}
+
+
+def test_streaming_writes_default_layout(many_enums_schema: dict[str, Any], tmp_path: Path) -> None:
+    """Test that writing entries as they are generated produces the same files as `write_swift_files`."""
+    write_swift_files(parse_openapi_to_swift(spec_dict=many_enums_schema), str(tmp_path / "default"))
+    file_count = write_swift_files_streaming(iter_swift_models(spec_dict=many_enums_schema), str(tmp_path / "streaming"))
+
+    default_files = _read_tree(tmp_path / "default")
+    assert file_count == len(default_files)
+    assert _read_tree(tmp_path / "streaming") == default_files
@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+from src.openapi.parse_openapi_to_swift import parse_openapi_to_swift, write_swift_package
+
+
+def test_swift_package_generation(tmp_path: str) -> None:
+    """Test that large root groups get their own targets which depend on the shared target."""
+    swift_models = parse_openapi_to_swift(
+        filepath="tests/test_data/test_response_generation.json", access_modifier="public"
+    )
+    output_dir = os.path.join(tmp_path, "Generated")
+    write_swift_package(swift_models, output_dir, package_name="Recipes", min_target_schemas=3)
+
+    with open(os.path.join(output_dir, "Package.swift"), "r") as f:
+        manifest = f.read()
+
+    assert "// swift-tools-version:5.9" in manifest
+    assert '.target(name: "RecipesShared", dependencies: [], path: "Sources/RecipesShared"),' in manifest
+    assert (
+        '.target(name: "RecipeResponseModels", dependencies: ["RecipesShared"], path: "Sources/RecipeResponseModels"),'
+        in manifest
+    )
+    assert '.target(name: "Recipes", dependencies: ["RecipesShared"], path: "Sources/Recipes"),' in manifest
+
+    # Small root groups share the package target, shared schemas live in the shared target
+    assert os.path.exists(os.path.join(output_dir, "Sources", "Recipes", "SignupRequest.swift"))
+    assert os.path.exists(os.path.join(output_dir, "Sources", "RecipesShared", "RecipeSourceType.swift"))
+
+    with open(os.path.join(output_dir, "Sources", "RecipeResponseModels", "RecipeResponse.swift"), "r") as f:
+        content = f.read()
+    assert "import SwiftData\nimport RecipesShared\n" in content
+    assert "public struct RecipeResponseDTO: Codable, Hashable, Identifiable {" in content
+    assert "public final class RecipeResponse {" in content
+
+    with open(os.path.join(output_dir, "Sources", "RecipesShared", "RecipeSourceType.swift"), "r") as f:
+        content = f.read()
+    assert "import RecipesShared" not in content
+    assert "public enum RecipeSourceType: String, Codable {" in content
+
+
+def test_swift_package_rejects_unknown_references(tmp_path: str) -> None:
+    """Test that references to schemas that are not generated are reported."""
+    swift_models = {"Pet": {"type": "root", "code": "", "schemas": ["Pet"], "references": ["Owner"]}}
+    with pytest.raises(ValueError, match="Could not find schema: Owner"):
+        write_swift_package(swift_models, os.path.join(tmp_path, "Generated"))
@@ -0,0 +1,38 @@
+from src.openapi.OpenAPISpec import OpenAPISpec
+from src.openapi.parse_openapi_to_swift import parse_openapi_to_swift
+
+
+def test_operation_schemas() -> None:
+    """Test that the schemas referenced by request bodies and responses of selected operations are collected."""
+    openapi = OpenAPISpec(filepath="tests/test_data/test_response_generation.json")
+
+    assert openapi.get_operation_schemas(operation_ids=["signup_auth_signup_post"]) == {
+        "SignupRequest",
+        "AuthResponse",
+        "HTTPValidationError",
+    }
+    assert openapi.get_reachable_schemas(openapi.get_operation_schemas(operation_ids=["signup_auth_signup_post"])) == {
+        "SignupRequest",
+        "AuthResponse",
+        "UserResponse",
+        "SessionResponse",
+        "HTTPValidationError",
+        "ValidationError",
+    }
+
+    # Filters of different kinds must all match
+    assert openapi.get_operation_schemas(path_prefixes=["/auth"], tags=["recipes"]) == set()
+
+
+def test_tree_shaking_generation() -> None:
+    """Test that only schemas reachable from the selected operations are generated."""
+    all_models = parse_openapi_to_swift(filepath="tests/test_data/test_response_generation.json")
+    swift_models = parse_openapi_to_swift(filepath="tests/test_data/test_response_generation.json", tags=["groceries"])
+
+    assert "RecipeResponse" in all_models
+    assert "RecipeResponse" not in swift_models
+    assert "GroceryListResponse" in swift_models
+    assert "InviteUserRequest" in swift_models
+    assert "GroceryListInviteStatus" in swift_models
+    assert "final class GroceryItemResponse {" in swift_models["GroceryListResponse"]["code"]
+    assert len(swift_models) < len(all_models)